@@ -0,0 +1,31 @@
+"""Allow poller-recorded trades without a user
+
+Revision ID: 3f1c2b7a9e10
+Revises: d9a4a7469274
+Create Date: 2026-10-18 09:12:41.522310
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "3f1c2b7a9e10"
+down_revision: Union[str, Sequence[str], None] = "d9a4a7469274"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("trades") as batch_op:
+        batch_op.alter_column("user_id", existing_type=sa.String(36), nullable=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DELETE FROM trades WHERE user_id IS NULL")
+    with op.batch_alter_table("trades") as batch_op:
+        batch_op.alter_column("user_id", existing_type=sa.String(36), nullable=False)
@@ -0,0 +1,57 @@
+"""Add composite indexes for keyset pagination of NFT and booth listings
+
+Revision ID: 5b7e0c9d2f14
+Revises: 8c2e5d41b7a3
+Create Date: 2026-10-19 14:21:06.904117
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "5b7e0c9d2f14"
+down_revision: Union[str, Sequence[str], None] = "8c2e5d41b7a3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Cursors compare popularity, which cannot be NULL
+    op.execute("UPDATE market_booths SET popularity = 0 WHERE popularity IS NULL")
+    with op.batch_alter_table("market_booths") as batch_op:
+        batch_op.alter_column(
+            "popularity",
+            existing_type=sa.Integer(),
+            nullable=False,
+        )
+        batch_op.create_index(
+            "ix_market_booths_popularity_id", ["popularity", "id"], unique=False
+        )
+
+    op.create_index(
+        "ix_nft_items_created_at_id", "nft_items", ["created_at", "id"], unique=False
+    )
+    op.create_index(
+        "ix_nft_items_booth_id_created_at_id",
+        "nft_items",
+        ["booth_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_nft_items_booth_id_created_at_id", table_name="nft_items")
+    op.drop_index("ix_nft_items_created_at_id", table_name="nft_items")
+
+    with op.batch_alter_table("market_booths") as batch_op:
+        batch_op.drop_index("ix_market_booths_popularity_id")
+        batch_op.alter_column(
+            "popularity",
+            existing_type=sa.Integer(),
+            nullable=True,
+        )
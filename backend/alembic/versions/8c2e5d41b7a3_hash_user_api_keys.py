@@ -0,0 +1,68 @@
+"""Store SHA-256 hashes of user API keys instead of the keys
+
+Revision ID: 8c2e5d41b7a3
+Revises: 3f1c2b7a9e10
+Create Date: 2026-10-19 10:04:17.318842
+
+"""
+
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "8c2e5d41b7a3"
+down_revision: Union[str, Sequence[str], None] = "3f1c2b7a9e10"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+users = sa.table(
+    "users",
+    sa.column("id", sa.String(36)),
+    sa.column("api_key", sa.String(255)),
+    sa.column("api_key_hash", sa.String(64)),
+    sa.column("api_key_prefix", sa.String(16)),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.add_column(sa.Column("api_key_hash", sa.String(64), nullable=True))
+        batch_op.add_column(sa.Column("api_key_prefix", sa.String(16), nullable=True))
+
+    # Existing keys keep working: hash them before the plain text is dropped
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.select(users.c.id, users.c.api_key).where(users.c.api_key.isnot(None))
+    ).fetchall()
+    for user_id, api_key in rows:
+        connection.execute(
+            users.update()
+            .where(users.c.id == user_id)
+            .values(
+                api_key_hash=hashlib.sha256(api_key.encode("utf-8")).hexdigest(),
+                api_key_prefix=api_key[:8],
+            )
+        )
+
+    op.drop_index("ix_users_api_key", "users")
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("api_key")
+        batch_op.create_index("ix_users_api_key_hash", ["api_key_hash"], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema.
+
+    Keys cannot be recovered from their hashes, so users must rotate their
+    API key after a downgrade.
+    """
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_index("ix_users_api_key_hash")
+        batch_op.drop_column("api_key_prefix")
+        batch_op.drop_column("api_key_hash")
+        batch_op.add_column(sa.Column("api_key", sa.String(255), nullable=True))
+    op.create_index("ix_users_api_key", "users", ["api_key"], unique=True)
@@ -0,0 +1,146 @@
+"""Move NFT transaction history from a JSON column into nft_transactions
+
+Revision ID: a4d19e6c3b58
+Revises: 5b7e0c9d2f14
+Create Date: 2026-10-19 16:38:52.117405
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "a4d19e6c3b58"
+down_revision: Union[str, Sequence[str], None] = "5b7e0c9d2f14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rows copied per INSERT
+BATCH_SIZE = 1000
+
+nft_items = sa.table(
+    "nft_items",
+    sa.column("id", sa.String(50)),
+    sa.column("transaction_history", sa.JSON),
+    sa.column("created_at", sa.BigInteger),
+)
+
+
+def _transactions_table() -> sa.Table:
+    return sa.table(
+        "nft_transactions",
+        sa.column("id", sa.String(100)),
+        sa.column("nft_id", sa.String(50)),
+        sa.column("type", sa.String(20)),
+        sa.column("from_address", sa.String(100)),
+        sa.column("to_address", sa.String(100)),
+        sa.column("price", sa.Float),
+        sa.column("timestamp", sa.BigInteger),
+    )
+
+
+def _history_rows(nft_id, history, created_at):
+    """Convert one NFT's JSON history entries to nft_transactions rows."""
+    seen = set()
+    for i, entry in enumerate(history or []):
+        tx_id = str(entry.get("id") or f"tx_{nft_id}_{i}")
+        # Entry ids were never enforced unique
+        if tx_id in seen:
+            tx_id = f"{tx_id}_{i}"
+        seen.add(tx_id)
+        yield {
+            "id": tx_id,
+            "nft_id": nft_id,
+            "type": str(entry.get("type") or "transfer"),
+            "from_address": str(entry.get("from") or ""),
+            "to_address": str(entry.get("to") or ""),
+            "price": entry.get("price"),
+            "timestamp": int(entry.get("timestamp") or created_at or 0),
+        }
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "nft_transactions",
+        sa.Column("id", sa.String(100), nullable=False),
+        sa.Column("nft_id", sa.String(50), nullable=False),
+        sa.Column("type", sa.String(20), nullable=False),
+        sa.Column("from_address", sa.String(100), nullable=False),
+        sa.Column("to_address", sa.String(100), nullable=False),
+        sa.Column("price", sa.Float(), nullable=True),
+        sa.Column("timestamp", sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(["nft_id"], ["nft_items.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_nft_transactions_nft_id_timestamp",
+        "nft_transactions",
+        ["nft_id", "timestamp", "id"],
+        unique=False,
+    )
+
+    # Copy every history entry before the JSON column is dropped
+    transactions = _transactions_table()
+    connection = op.get_bind()
+    result = connection.execute(
+        sa.select(
+            nft_items.c.id, nft_items.c.transaction_history, nft_items.c.created_at
+        )
+    )
+    batch = []
+    for nft_id, history, created_at in result:
+        batch.extend(_history_rows(nft_id, history, created_at))
+        if len(batch) >= BATCH_SIZE:
+            op.bulk_insert(transactions, batch)
+            batch = []
+    if batch:
+        op.bulk_insert(transactions, batch)
+
+    with op.batch_alter_table("nft_items") as batch_op:
+        batch_op.drop_column("transaction_history")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("nft_items") as batch_op:
+        batch_op.add_column(sa.Column("transaction_history", sa.JSON(), nullable=True))
+
+    transactions = _transactions_table()
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.select(transactions).order_by(
+            transactions.c.nft_id, transactions.c.timestamp, transactions.c.id
+        )
+    ).mappings()
+
+    histories = {}
+    for row in rows:
+        entry = {
+            "id": row["id"],
+            "nftId": row["nft_id"],
+            "type": row["type"],
+            "from": row["from_address"],
+            "to": row["to_address"],
+            "timestamp": row["timestamp"],
+        }
+        if row["price"] is not None:
+            entry["price"] = row["price"]
+        histories.setdefault(row["nft_id"], []).append(entry)
+
+    for nft_id, history in histories.items():
+        connection.execute(
+            nft_items.update()
+            .where(nft_items.c.id == nft_id)
+            .values(transaction_history=history)
+        )
+    connection.execute(
+        nft_items.update()
+        .where(nft_items.c.transaction_history.is_(None))
+        .values(transaction_history=[])
+    )
+
+    op.drop_index("ix_nft_transactions_nft_id_timestamp", table_name="nft_transactions")
+    op.drop_table("nft_transactions")
@@ -3,8 +3,10 @@ Authentication and authorization utilities.
 """
 
 from fastapi import HTTPException, Header, Depends
-from typing import Optional
-from sqlalchemy.orm import Session
+from typing import Any, Dict, Optional, Tuple
+from sqlalchemy import event, inspect as sa_inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
 import sys
 import os
 import logging
@@ -12,14 +14,163 @@ import logging
 # Add backend to path for database module
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from database import get_db, User, Subscription
-from .utils.auth_utils import decode_access_token
+from database import get_async_db, User, Subscription
+from .utils.auth_utils import decode_access_token, hash_api_key
+from .utils.cache import TTLCache, get_invalidator
 
 logger = logging.getLogger(__name__)
 
+# User records cached by id for token authentication
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+
+# API key verifications cached by key hash; unknown keys are cached briefly so
+# floods of invalid keys do not each reach the database
+API_KEY_CACHE_TTL_SECONDS = float(os.getenv("API_KEY_CACHE_TTL_SECONDS", "60"))
+API_KEY_NEGATIVE_TTL_SECONDS = float(os.getenv("API_KEY_NEGATIVE_TTL_SECONDS", "5"))
+API_KEY_CACHE_SIZE = int(os.getenv("API_KEY_CACHE_SIZE", "10000"))
+
+# Cached verification of a key no user holds
+_INVALID_KEY = (None, False)
+
+# Global cache instances
+_user_cache: Optional[TTLCache] = None
+_api_key_cache: Optional[TTLCache] = None
+
+
+def get_user_cache() -> TTLCache:
+    """Get or create the user cache instance.
+
+    The first call also subscribes the cache to evictions published by other
+    API processes.
+    """
+    global _user_cache
+    if _user_cache is None:
+        _user_cache = TTLCache(max_size=USER_CACHE_SIZE, ttl=USER_CACHE_TTL_SECONDS)
+        get_invalidator().register("user", _evict_user)
+    return _user_cache
+
+
+def get_api_key_cache() -> TTLCache:
+    """Get or create the API key verification cache instance.
+
+    Entries map a key hash to (user id, is active).
+    """
+    global _api_key_cache
+    if _api_key_cache is None:
+        _api_key_cache = TTLCache(
+            max_size=API_KEY_CACHE_SIZE, ttl=API_KEY_CACHE_TTL_SECONDS
+        )
+        get_invalidator().register("user", _evict_user)
+        get_invalidator().register("api_key", _api_key_cache.delete)
+    return _api_key_cache
+
+
+def _evict_user(user_id: str):
+    get_user_cache().delete(user_id)
+    get_api_key_cache().evict_matching(lambda entry: entry[0] == user_id)
+
+
+def invalidate_user(user_id: str):
+    """Evict a user and its API key from this process's caches and all others."""
+    _evict_user(user_id)
+    get_invalidator().publish("user", user_id)
+
+
+def invalidate_api_key(key_hash: str):
+    """Evict a key hash, e.g. a newly issued key that was cached as invalid."""
+    get_api_key_cache().delete(key_hash)
+    get_invalidator().publish("api_key", key_hash)
+
+
+def _user_columns(user: User) -> Dict[str, Any]:
+    return {attr.key: getattr(user, attr.key) for attr in sa_inspect(User).column_attrs}
+
+
+async def load_user(db: AsyncSession, user_id: str) -> Optional[User]:
+    """Load a user by id, serving repeat lookups from the user cache.
+
+    Cached users are attached to the session without a query, so routes can
+    use and modify them as they would a queried user.
+
+    Args:
+        db: Database session
+        user_id: User ID
+
+    Returns:
+        User object, or None if it does not exist
+    """
+    cache = get_user_cache()
+    columns = cache.get(user_id)
+    if columns is not None:
+        user = User(**columns)
+        make_transient_to_detached(user)
+        return await db.merge(user, load=False)
+
+    user = await db.scalar(select(User).where(User.id == user_id))
+    if user is not None:
+        cache.set(user_id, _user_columns(user))
+    return user
+
+
+async def lookup_api_key(db: AsyncSession, api_key: str) -> Optional[Tuple[str, bool]]:
+    """Resolve an API key to its user, serving repeat lookups from the cache.
+
+    Args:
+        db: Database session
+        api_key: Plain text API key
+
+    Returns:
+        Tuple of (user id, is active), or None if no user holds the key
+    """
+    key_hash = hash_api_key(api_key)
+    cache = get_api_key_cache()
+    entry = cache.get(key_hash)
+    if entry is None:
+        result = await db.execute(
+            select(User.id, User.is_active).where(User.api_key_hash == key_hash)
+        )
+        row = result.first()
+        if row is None:
+            cache.set(key_hash, _INVALID_KEY, ttl=API_KEY_NEGATIVE_TTL_SECONDS)
+            return None
+        entry = (row.id, bool(row.is_active))
+        cache.set(key_hash, entry)
+    return entry if entry[0] is not None else None
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_user_changes(session: Session, flush_context):
+    # Pre-flush state is still visible here; evict once the commit lands
+    changed = session.info.setdefault("changed_users", set())
+    issued = session.info.setdefault("issued_api_keys", set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if not isinstance(obj, User):
+            continue
+        if obj not in session.new:
+            changed.add(obj.id)
+        # New keys may have been cached as invalid before being issued
+        issued.update(sa_inspect(obj).attrs.api_key_hash.history.added or ())
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_changed_users(session: Session):
+    for user_id in session.info.pop("changed_users", ()):
+        invalidate_user(user_id)
+    for key_hash in session.info.pop("issued_api_keys", ()):
+        if key_hash:
+            invalidate_api_key(key_hash)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_user_changes(session: Session):
+    session.info.pop("changed_users", None)
+    session.info.pop("issued_api_keys", None)
+
 
 async def get_current_user_from_token(
-    authorization: Optional[str] = Header(None), db: Session = Depends(get_db)
+    authorization: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Optional[User]:
     """Get current user from JWT token.
 
@@ -42,14 +193,13 @@ async def get_current_user_from_token(
         if not user_id:
             return None
 
-        user = db.query(User).filter(User.id == user_id).first()
-        return user
+        return await load_user(db, user_id)
     except HTTPException:
         return None
 
 
 async def verify_api_key(
-    x_api_key: Optional[str] = Header(None), db: Session = Depends(get_db)
+    x_api_key: Optional[str] = Header(None), db: AsyncSession = Depends(get_async_db)
 ) -> str:
     """Verify API key from request header.
 
@@ -73,16 +223,15 @@ async def verify_api_key(
     if os.getenv("DEMO_MODE", "false").lower() == "true":
         return x_api_key
 
-    # Check database for API key
-    user = db.query(User).filter(User.api_key == x_api_key).first()
+    entry = await lookup_api_key(db, x_api_key)
 
-    if not user:
+    if not entry:
         raise HTTPException(
             status_code=403,
             detail="Invalid API key",
         )
 
-    if not user.is_active:
+    if not entry[1]:
         raise HTTPException(
             status_code=403,
             detail="User account is inactive",
@@ -92,7 +241,7 @@ async def verify_api_key(
 
 
 async def optional_api_key(
-    x_api_key: Optional[str] = Header(None), db: Session = Depends(get_db)
+    x_api_key: Optional[str] = Header(None), db: AsyncSession = Depends(get_async_db)
 ) -> Optional[str]:
     """Optionally verify API key.
 
@@ -112,7 +261,7 @@ async def optional_api_key(
         return None
 
 
-def check_membership(user: User, db: Session) -> bool:
+async def check_membership(user: User, db: AsyncSession) -> bool:
     """Check if user has active membership.
 
     Args:
@@ -123,10 +272,10 @@ def check_membership(user: User, db: Session) -> bool:
         True if membership is active, False otherwise
     """
     # Check for active subscription
-    subscription = (
-        db.query(Subscription)
-        .filter(Subscription.user_id == user.id, Subscription.status == "active")
-        .first()
+    subscription = await db.scalar(
+        select(Subscription).where(
+            Subscription.user_id == user.id, Subscription.status == "active"
+        )
     )
 
     return subscription is not None
@@ -139,7 +288,7 @@ class MembershipRequired:
         self,
         x_api_key: Optional[str] = Header(None),
         authorization: Optional[str] = Header(None),
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
     ) -> User:
         """Verify membership is active.
 
@@ -162,7 +311,9 @@ class MembershipRequired:
 
         # Try to get user from API key
         if not user and x_api_key:
-            user = db.query(User).filter(User.api_key == x_api_key).first()
+            entry = await lookup_api_key(db, x_api_key)
+            if entry:
+                user = await load_user(db, entry[0])
 
         if not user:
             raise HTTPException(
@@ -170,7 +321,7 @@ class MembershipRequired:
                 detail="Authentication required",
             )
 
-        if not check_membership(user, db):
+        if not await check_membership(user, db):
             raise HTTPException(
                 status_code=402,
                 detail="Active membership required. Visit /membership to subscribe.",
@@ -4,7 +4,7 @@ Main API Gateway for AlphaNest Arbitrage Platform.
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 import logging
 import os
 import sys
@@ -33,6 +33,7 @@ app = FastAPI(
     title="AlphaNest Arbitrage API",
     description="Cryptocurrency arbitrage analysis platform",
     version="0.1.0",
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
@@ -58,6 +59,14 @@ if CHAT_ENABLED:
     logger.info("Chat endpoints enabled")
 
 
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop the password hashing worker processes."""
+    from .utils.password_hasher import get_password_hasher
+
+    get_password_hasher().shutdown()
+
+
 @app.get("/")
 async def root():
     """Root endpoint."""
@@ -77,6 +86,14 @@ async def health_check():
     }
 
 
+@app.get("/health/db")
+async def database_health():
+    """Database connection pool statistics."""
+    from database import get_database_pool_statistics
+
+    return get_database_pool_statistics()
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Global exception handler."""
@@ -12,6 +12,7 @@ import logging
 import random
 
 from ..auth import optional_api_key
+from ..utils.response_cache import get_response_cache, json_response
 
 logger = logging.getLogger(__name__)
 
@@ -284,14 +285,23 @@ async def get_analysis_categories(
     Returns:
         Dictionary of analysis categories and their metadata
     """
-    return {
-        "categories": [
+    cache = get_response_cache()
+    key = cache.make_key("analysis:categories")
+    body = cache.get(key)
+    if body is None:
+        body = cache.store(
+            key,
             {
-                "id": category,
-                "name": category.replace("-", " ").title(),
-                "severity": SEVERITIES[category],
-                "tags": TAG_OPTIONS[category],
-            }
-            for category in ANALYSIS_TEMPLATES.keys()
-        ]
-    }
+                "categories": [
+                    {
+                        "id": category,
+                        "name": category.replace("-", " ").title(),
+                        "severity": SEVERITIES[category],
+                        "tags": TAG_OPTIONS[category],
+                    }
+                    for category in ANALYSIS_TEMPLATES.keys()
+                ]
+            },
+        )
+
+    return json_response(body)
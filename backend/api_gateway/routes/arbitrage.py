@@ -2,8 +2,10 @@
 Arbitrage API routes.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List, Dict
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import List, Dict, Optional
+import asyncio
 import logging
 import sys
 import os
@@ -13,15 +15,43 @@ sys.path.insert(
     0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 )
 
-from arbitrage_engine.engine import ArbitrageEngine
+from arbitrage_engine.engine import ArbitrageEngine, ArbitrageOpportunity
+from arbitrage_engine.history import HistoryStore
+from arbitrage_engine.index import MAX_PAGE_SIZE, InvalidCursor, query_opportunities
+from arbitrage_engine.runner import CoalescingEngineRunner
+from arbitrage_engine.snapshot import SnapshotStore, get_snapshot_store
+from arbitrage_engine.stream import OpportunityBroadcaster, format_sse
 from ..auth import MembershipRequired, optional_api_key
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/arbitrage", tags=["arbitrage"])
 
+# Seconds between keep-alive comments on idle streams
+STREAM_HEARTBEAT_SECONDS = 15
+
 # Engine instance
 _engine: ArbitrageEngine = None
+_runner: CoalescingEngineRunner = None
+_demo_runner: CoalescingEngineRunner = None
+_broadcaster: OpportunityBroadcaster = None
+_history: HistoryStore = None
+
+
+def opportunity_to_dict(opp: ArbitrageOpportunity) -> Dict:
+    """Convert an opportunity to its API representation."""
+    return {
+        "symbol": opp.symbol,
+        "buy_exchange": opp.buy_exchange,
+        "sell_exchange": opp.sell_exchange,
+        "buy_price": opp.buy_price,
+        "sell_price": opp.sell_price,
+        "spread_pct": round(opp.spread_pct, 2),
+        "net_profit_pct": round(opp.net_profit_pct, 2),
+        "estimated_profit_usd": round(opp.estimated_profit_usd, 2),
+        "volume_24h": opp.volume_24h,
+        "timestamp": opp.timestamp,
+    }
 
 
 def get_engine() -> ArbitrageEngine:
@@ -33,68 +63,234 @@ def get_engine() -> ArbitrageEngine:
     return _engine
 
 
+def get_runner() -> CoalescingEngineRunner:
+    """Get or create the runner that executes engine scans off the event loop."""
+    global _runner
+    if _runner is None:
+        _runner = CoalescingEngineRunner(get_engine())
+    return _runner
+
+
+def get_demo_runner() -> CoalescingEngineRunner:
+    """Get or create the runner for the shared simulated demo market."""
+    global _demo_runner
+    if _demo_runner is None:
+        _demo_runner = CoalescingEngineRunner(ArbitrageEngine(demo_mode=True))
+    return _demo_runner
+
+
+def get_broadcaster() -> OpportunityBroadcaster:
+    """Get or create the broadcaster shared by all stream clients."""
+    global _broadcaster
+    if _broadcaster is None:
+        _broadcaster = OpportunityBroadcaster(
+            get_snapshot_store(), get_runner(), serializer=opportunity_to_dict
+        )
+    return _broadcaster
+
+
+def get_history_store() -> HistoryStore:
+    """Get the opportunity history store configured by HISTORY_DIR."""
+    global _history
+    if _history is None:
+        _history = HistoryStore.from_env()
+        if _history is None:
+            raise HTTPException(
+                status_code=503, detail="Opportunity history is not configured"
+            )
+    return _history
+
+
 @router.get("/demo")
-async def get_demo_data() -> List[Dict]:
+async def get_demo_data(
+    runner: CoalescingEngineRunner = Depends(get_demo_runner),
+) -> List[Dict]:
     """Get demo arbitrage data (no authentication required).
 
+    Opportunities are detected by the engine against a simulated market
+    that keeps evolving between requests.
+
     Returns:
         List of demo arbitrage opportunities
     """
-    demo_engine = ArbitrageEngine(demo_mode=True)
-    opportunities = demo_engine.get_demo_data()
-
-    return [
-        {
-            "symbol": opp.symbol,
-            "buy_exchange": opp.buy_exchange,
-            "sell_exchange": opp.sell_exchange,
-            "buy_price": opp.buy_price,
-            "sell_price": opp.sell_price,
-            "spread_pct": round(opp.spread_pct, 2),
-            "net_profit_pct": round(opp.net_profit_pct, 2),
-            "estimated_profit_usd": round(opp.estimated_profit_usd, 2),
-            "volume_24h": opp.volume_24h,
-            "timestamp": opp.timestamp,
-        }
-        for opp in opportunities
-    ]
+    opportunities = await runner.find_opportunities()
+
+    return [opportunity_to_dict(opp) for opp in opportunities]
 
 
 @router.get("/opportunities")
 async def get_opportunities(
+    response: Response,
+    symbol: Optional[str] = None,
+    exchange: Optional[str] = None,
+    min_net_profit: Optional[float] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     api_key: str = Depends(MembershipRequired()),
-    engine: ArbitrageEngine = Depends(get_engine),
+    runner: CoalescingEngineRunner = Depends(get_runner),
+    store: SnapshotStore = Depends(get_snapshot_store),
 ) -> List[Dict]:
     """Get real-time arbitrage opportunities (requires membership).
 
+    Serves the snapshot published by the poller, and only runs the engine
+    locally when that snapshot is missing or stale. Results are ordered by
+    net profit. When more results remain, the cursor for the next page is
+    returned in the ``X-Next-Cursor`` header.
+
     Args:
+        response: Outgoing response, used for snapshot and paging headers
+        symbol: Only opportunities for this trading pair
+        exchange: Only opportunities buying or selling on this exchange
+        min_net_profit: Minimum net profit percentage
+        limit: Maximum number of opportunities to return
+        cursor: Cursor from a previous page's X-Next-Cursor header
         api_key: Verified API key with active membership
-        engine: Arbitrage engine instance
+        runner: Runner for local engine scans
+        store: Opportunity snapshot store
 
     Returns:
         List of arbitrage opportunities
     """
     try:
-        opportunities = engine.find_opportunities()
-        return [
-            {
-                "symbol": opp.symbol,
-                "buy_exchange": opp.buy_exchange,
-                "sell_exchange": opp.sell_exchange,
-                "buy_price": opp.buy_price,
-                "sell_price": opp.sell_price,
-                "spread_pct": round(opp.spread_pct, 2),
-                "net_profit_pct": round(opp.net_profit_pct, 2),
-                "estimated_profit_usd": round(opp.estimated_profit_usd, 2),
-                "volume_24h": opp.volume_24h,
-                "timestamp": opp.timestamp,
-            }
-            for opp in opportunities
-        ]
+        page = await query_opportunities(
+            store,
+            runner,
+            symbol=symbol,
+            exchange=exchange,
+            min_net_profit=min_net_profit,
+            limit=limit,
+            cursor=cursor,
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error finding opportunities: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+    if page.snapshot_version is not None:
+        response.headers["X-Snapshot-Version"] = str(page.snapshot_version)
+    if page.next_cursor is not None:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+
+    return [opportunity_to_dict(opp) for opp in page.opportunities]
+
+
+@router.get("/stream")
+async def stream_opportunities(
+    request: Request,
+    api_key: str = Depends(MembershipRequired()),
+    broadcaster: OpportunityBroadcaster = Depends(get_broadcaster),
+) -> StreamingResponse:
+    """Stream opportunity changes as server-sent events (requires membership).
+
+    The first ``snapshot`` event carries every open opportunity. Each
+    following ``delta`` event lists only the opportunities that opened,
+    changed or closed. Clients that fall too far behind receive a
+    ``dropped`` event and should reconnect.
+
+    Args:
+        request: Incoming request, used to detect disconnects
+        api_key: Verified API key with active membership
+        broadcaster: Shared opportunity broadcaster
+
+    Returns:
+        Event stream response
+    """
+    if not broadcaster.subscribers:
+        # Nothing has kept the broadcaster current while it was idle
+        await broadcaster.refresh()
+    subscription = broadcaster.subscribe()
+
+    async def events():
+        try:
+            yield format_sse(
+                "snapshot",
+                {
+                    "version": subscription.version,
+                    "opportunities": subscription.snapshot,
+                },
+            )
+            while True:
+                if subscription.dropped:
+                    yield format_sse("dropped", {"reason": "slow consumer"})
+                    return
+                try:
+                    batch = await asyncio.wait_for(
+                        subscription.queue.get(), timeout=STREAM_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_sse("delta", batch)
+        finally:
+            broadcaster.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/history")
+async def get_history(
+    table: str = Query("opportunities", pattern="^(opportunities|quotes)$"),
+    group_by: Optional[str] = None,
+    value: Optional[str] = None,
+    bucket_ms: Optional[int] = Query(None, ge=1),
+    symbol: Optional[str] = None,
+    exchange: Optional[str] = None,
+    buy_exchange: Optional[str] = None,
+    sell_exchange: Optional[str] = None,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    api_key: str = Depends(MembershipRequired()),
+    history: HistoryStore = Depends(get_history_store),
+) -> List[Dict]:
+    """Summarize recorded opportunities or quotes (requires membership).
+
+    Args:
+        table: "opportunities" or "quotes"
+        group_by: Comma-separated columns to group on (defaults depend on
+            the table; pass an empty value for no grouping)
+        value: Numeric column to summarize
+        bucket_ms: Also group by time buckets of this many milliseconds
+        symbol: Only rows for this trading pair
+        exchange: Only rows on this exchange
+        buy_exchange: Only opportunities buying on this exchange
+        sell_exchange: Only opportunities selling on this exchange
+        start: Inclusive start time in milliseconds
+        end: Exclusive end time in milliseconds
+        api_key: Verified API key with active membership
+        history: Opportunity history store
+
+    Returns:
+        List of groups with count, mean, min, max, first_seen and last_seen
+    """
+    try:
+        # Segment scans touch disk, so keep them off the event loop
+        return await asyncio.to_thread(
+            history.aggregate,
+            table,
+            group_by=(
+                None
+                if group_by is None
+                else [column for column in group_by.split(",") if column]
+            ),
+            value=value,
+            bucket_ms=bucket_ms,
+            symbol=symbol,
+            exchange=exchange,
+            buy_exchange=buy_exchange,
+            sell_exchange=sell_exchange,
+            start=start,
+            end=end,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 
 @router.get("/statistics")
 async def get_statistics(
@@ -2,8 +2,10 @@
 Authentication routes for user registration and login.
 """
 
-from fastapi import APIRouter, HTTPException, Depends, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Header, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from typing import Optional
 import uuid
 import logging
 import sys
@@ -12,14 +14,19 @@ import os
 # Add backend to path for database module
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-from database import get_db, User, Subscription, MarketBooth
-from ..schemas.auth import UserCreate, UserLogin, Token, UserResponse
+from database import get_async_db, User, Subscription, MarketBooth
+from ..schemas.auth import UserCreate, UserLogin, Token, UserResponse, ApiKeyResponse
 from ..utils.auth_utils import (
-    hash_password,
-    verify_password,
     create_access_token,
+    get_token_cache,
+    revoke_access_token,
     generate_api_key,
+    hash_api_key,
+    api_key_prefix,
 )
+from ..utils.password_hasher import PasswordHasher, get_password_hasher
+from ..utils.response_cache import get_response_cache
+from .market import BOOTHS_TAG
 
 logger = logging.getLogger(__name__)
 
@@ -27,40 +34,48 @@ router = APIRouter(prefix="/api/auth", tags=["authentication"])
 
 
 @router.post("/register", response_model=Token, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(
+    user_data: UserCreate,
+    db: AsyncSession = Depends(get_async_db),
+    hasher: PasswordHasher = Depends(get_password_hasher),
+):
     """Register a new user.
 
     Args:
         user_data: User registration data
         db: Database session
+        hasher: Password hashing pool
 
     Returns:
         Authentication token and user info
 
     Raises:
-        HTTPException: If username or email already exists
+        HTTPException: If username or email already exists, or the hashing
+            pool is saturated
     """
     # Check if username exists
-    if db.query(User).filter(User.username == user_data.username).first():
+    if await db.scalar(select(User).where(User.username == user_data.username)):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already registered",
         )
 
     # Check if email exists
-    if db.query(User).filter(User.email == user_data.email).first():
+    if await db.scalar(select(User).where(User.email == user_data.email)):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered"
         )
 
-    # Create new user
+    # Create new user; the API key is returned once and only its hash stored
+    api_key = generate_api_key()
     user = User(
         id=str(uuid.uuid4()),
         username=user_data.username,
         email=user_data.email,
-        hashed_password=hash_password(user_data.password),
+        hashed_password=await hasher.hash(user_data.password),
         avatar=user_data.avatar or "👤",
-        api_key=generate_api_key(),
+        api_key_hash=hash_api_key(api_key),
+        api_key_prefix=api_key_prefix(api_key),
         is_active=True,
     )
     db.add(user)
@@ -84,33 +99,49 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     )
     db.add(booth)
 
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    # The new booth appears in booth listings
+    get_response_cache().invalidate(BOOTHS_TAG)
 
     logger.info(f"New user registered: {user.username}")
 
     # Create access token
     access_token = create_access_token(data={"sub": user.id})
 
-    return Token(access_token=access_token, user=UserResponse.model_validate(user))
+    user_response = UserResponse.model_validate(user).model_copy(
+        update={"api_key": api_key}
+    )
+    return Token(access_token=access_token, user=user_response)
 
 
 @router.post("/login", response_model=Token)
-async def login(credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(
+    credentials: UserLogin,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    hasher: PasswordHasher = Depends(get_password_hasher),
+):
     """Login with username and password.
 
+    Outdated password hashes are upgraded to the current cost after the
+    response is sent.
+
     Args:
         credentials: Login credentials
+        background_tasks: Tasks run after the response
         db: Database session
+        hasher: Password hashing pool
 
     Returns:
         Authentication token and user info
 
     Raises:
-        HTTPException: If credentials are invalid
+        HTTPException: If credentials are invalid or the hashing pool is
+            saturated
     """
     # Find user by username
-    user = db.query(User).filter(User.username == credentials.username).first()
+    user = await db.scalar(select(User).where(User.username == credentials.username))
 
     if not user:
         raise HTTPException(
@@ -119,7 +150,7 @@ async def login(credentials: UserLogin, db: Session = Depends(get_db)):
         )
 
     # Verify password
-    if not verify_password(credentials.password, user.hashed_password):
+    if not await hasher.verify(credentials.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid username or password",
@@ -130,6 +161,15 @@ async def login(credentials: UserLogin, db: Session = Depends(get_db)):
             status_code=status.HTTP_403_FORBIDDEN, detail="Account is inactive"
         )
 
+    background_tasks.add_task(
+        upgrade_password_hash,
+        hasher,
+        async_sessionmaker(bind=db.bind, expire_on_commit=False),
+        user.id,
+        credentials.password,
+        user.hashed_password,
+    )
+
     # Create access token
     access_token = create_access_token(data={"sub": user.id})
 
@@ -138,9 +178,89 @@ async def login(credentials: UserLogin, db: Session = Depends(get_db)):
     return Token(access_token=access_token, user=UserResponse.model_validate(user))
 
 
+async def upgrade_password_hash(
+    hasher: PasswordHasher,
+    session_factory: async_sessionmaker,
+    user_id: str,
+    password: str,
+    hashed_password: str,
+):
+    """Replace an outdated password hash after a successful login.
+
+    The update only applies if the hash is unchanged, so a password change
+    made in the meantime is never overwritten.
+
+    Args:
+        hasher: Password hashing pool
+        session_factory: Creates a session outside the finished request
+        user_id: User ID
+        password: Verified plain text password
+        hashed_password: Hash the password was verified against
+    """
+    try:
+        new_hash = await hasher.upgrade(password, hashed_password)
+    except HTTPException:
+        return
+    if new_hash is None:
+        return
+
+    async with session_factory() as db:
+        user = await db.scalar(
+            select(User).where(
+                User.id == user_id, User.hashed_password == hashed_password
+            )
+        )
+        if user:
+            user.hashed_password = new_hash
+            await db.commit()
+            logger.info(f"Upgraded password hash for user: {user.username}")
+
+
+@router.get("/statistics")
+async def get_auth_statistics(
+    hasher: PasswordHasher = Depends(get_password_hasher),
+) -> dict:
+    """Get password hashing and authentication cache statistics.
+
+    Args:
+        hasher: Password hashing pool
+
+    Returns:
+        Dictionary with statistics
+    """
+    from ..auth import get_api_key_cache, get_user_cache
+
+    return {
+        "password_hasher": hasher.get_statistics(),
+        "user_cache": get_user_cache().get_statistics(),
+        "api_key_cache": get_api_key_cache().get_statistics(),
+        "token_cache": get_token_cache().get_statistics(),
+    }
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(authorization: Optional[str] = Header(None)):
+    """Revoke the access token used for this request.
+
+    Args:
+        authorization: Authorization header
+
+    Raises:
+        HTTPException: If not authenticated
+    """
+    if not authorization or not authorization.startswith("Bearer "):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated"
+        )
+
+    payload = revoke_access_token(authorization.split(" ")[1])
+
+    logger.info(f"Access token revoked for user_id: {payload.get('sub')}")
+
+
 @router.get("/me", response_model=UserResponse)
 async def get_current_user(
-    authorization: str = Depends(lambda: None), db: Session = Depends(get_db)
+    authorization: str = Depends(lambda: None), db: AsyncSession = Depends(get_async_db)
 ):
     """Get current authenticated user.
 
@@ -164,3 +284,42 @@ async def get_current_user(
         )
 
     return UserResponse.model_validate(user)
+
+
+@router.post("/api-key", response_model=ApiKeyResponse)
+async def rotate_api_key(
+    authorization: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Issue a new API key for the authenticated user.
+
+    The previous key stops working immediately. The new key is only
+    returned by this response.
+
+    Args:
+        authorization: Authorization header
+        db: Database session
+
+    Returns:
+        The new API key
+
+    Raises:
+        HTTPException: If not authenticated
+    """
+    from ..auth import get_current_user_from_token
+
+    user = await get_current_user_from_token(authorization, db)
+
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated"
+        )
+
+    api_key = generate_api_key()
+    user.api_key_hash = hash_api_key(api_key)
+    user.api_key_prefix = api_key_prefix(api_key)
+    await db.commit()
+
+    logger.info(f"API key rotated for user: {user.username}")
+
+    return ApiKeyResponse(api_key=api_key, api_key_prefix=user.api_key_prefix)
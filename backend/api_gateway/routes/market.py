@@ -3,8 +3,10 @@ Market and NFT routes.
 """
 
 from fastapi import APIRouter, HTTPException, Depends, status
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import Column, delete, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from typing import List, Optional, Tuple
 import uuid
 import logging
 import sys
@@ -14,58 +16,147 @@ from datetime import datetime
 # Add backend to path for database module
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-from database import get_db, User, MarketBooth, NFTItem
+from database import (
+    get_async_db,
+    User,
+    MarketBooth,
+    NFTItem,
+    NFTTransaction,
+)
 from ..schemas.market import (
     NFTItemCreate,
     NFTItemResponse,
+    NFTItemPage,
+    NFTTransactionResponse,
+    NFTTransactionPage,
     MarketBoothCreate,
     MarketBoothUpdate,
     MarketBoothResponse,
+    MarketBoothPage,
 )
 from ..auth import get_current_user_from_token
+from ..utils.pagination import (
+    MAX_PAGE_SIZE,
+    clamp_page_size,
+    decode_cursor,
+    encode_cursor,
+)
+from ..utils.response_cache import get_response_cache, json_response
+from ..utils.serialization import (
+    encode_json,
+    parse_fields,
+    response_columns,
+    rows_to_dicts,
+)
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/market", tags=["marketplace"])
 
+# Response cache tags; writes invalidate the responses built from the rows
+# they change
+BOOTHS_TAG = "market:booths"
+NFTS_TAG = "market:nfts"
+
+
+def _nft_tag(nft_id: str) -> str:
+    return f"market:nft:{nft_id}"
+
+
+def _nft_columns(fields: Optional[Tuple[str, ...]], *required: Column) -> List:
+    """Get the NFT columns to read for a sparse fieldset.
+
+    Columns outside the fieldset, such as the transaction_history and
+    nft_attributes JSON, are never read from the database.
+    """
+    if fields is None:
+        return NFT_COLUMNS
+    columns = [NFTItem.__table__.c[name] for name in fields]
+    return columns + [column for column in required if column.key not in fields]
+
+
+# Columns read by the cached GET routes, which encode rows straight to JSON
+# instead of building an ORM object and a response model per row
+NFT_COLUMNS = response_columns(NFTItem.__table__, NFTItemResponse)
+NFT_SORT_COLUMNS = [NFTItem.created_at, NFTItem.id]
+TRANSACTION_COLUMNS = response_columns(NFTTransaction.__table__, NFTTransactionResponse)
+BOOTH_COLUMNS = response_columns(MarketBooth.__table__, MarketBoothResponse) + [
+    User.username,
+    User.avatar,
+]
+
 
 def _booth_to_response(booth: MarketBooth, user: User) -> MarketBoothResponse:
     """Convert booth model to response with user info."""
     response_data = {
-        **{k: v for k, v in booth.__dict__.items() if not k.startswith("_")},
+        **{
+            k: v
+            for k, v in booth.__dict__.items()
+            if not k.startswith("_") and k != "user"
+        },
         "username": user.username,
         "avatar": user.avatar,
     }
     return MarketBoothResponse(**response_data)
 
 
-@router.get("/booths", response_model=List[MarketBoothResponse])
+@router.get("/booths", response_model=MarketBoothPage)
 async def get_all_booths(
-    skip: int = 0, limit: int = 100, db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    limit: int = MAX_PAGE_SIZE,
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """Get all market booths.
+    """Get market booths, most popular first.
+
+    Pages are read with keyset pagination on (popularity, id); pass the
+    returned next_cursor to get the following page. Cache misses read the
+    primary: a lagging replica could otherwise cache a page from before the
+    write that invalidated it.
 
     Args:
-        skip: Number of booths to skip
-        limit: Maximum number of booths to return
+        cursor: Cursor from the previous page
+        limit: Maximum number of booths to return (max: 100)
         db: Database session
 
     Returns:
-        List of market booths
+        Page of market booths
     """
-    booths = db.query(MarketBooth).offset(skip).limit(limit).all()
+    after = decode_cursor(cursor, (int, str))
+    limit = clamp_page_size(limit)
 
-    response = []
-    for booth in booths:
-        user = db.query(User).filter(User.id == booth.user_id).first()
-        if user:
-            response.append(_booth_to_response(booth, user))
+    cache = get_response_cache()
+    key = cache.make_key(
+        "market:booths", {"cursor": cursor, "limit": limit}, tags=(BOOTHS_TAG,)
+    )
+    body = cache.get(key)
+    if body is None:
+        # Read each booth's user in the same query; the inner join also drops
+        # booths whose user no longer exists
+        query = (
+            select(*BOOTH_COLUMNS)
+            .join(User, MarketBooth.user_id == User.id)
+            .order_by(MarketBooth.popularity.desc(), MarketBooth.id.desc())
+        )
+        if after:
+            query = query.where(tuple_(MarketBooth.popularity, MarketBooth.id) < after)
+
+        # One extra row tells whether another page follows
+        rows = (await db.execute(query.limit(limit + 1))).mappings().all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor((rows[-1]["popularity"], rows[-1]["id"]))
+
+        body = cache.store(
+            key,
+            {"items": rows_to_dicts(rows, listings=[]), "next_cursor": next_cursor},
+        )
 
-    return response
+    return json_response(body)
 
 
 @router.get("/booths/{booth_id}", response_model=MarketBoothResponse)
-async def get_booth(booth_id: str, db: Session = Depends(get_db)):
+async def get_booth(booth_id: str, db: AsyncSession = Depends(get_async_db)):
     """Get a specific market booth by ID.
 
     Args:
@@ -78,19 +169,24 @@ async def get_booth(booth_id: str, db: Session = Depends(get_db)):
     Raises:
         HTTPException: If booth not found
     """
-    booth = db.query(MarketBooth).filter(MarketBooth.id == booth_id).first()
+    booth = await db.scalar(
+        select(MarketBooth)
+        .options(joinedload(MarketBooth.user))
+        .where(MarketBooth.id == booth_id)
+    )
 
     if not booth:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Booth not found"
         )
 
-    user = db.query(User).filter(User.id == booth.user_id).first()
-    return _booth_to_response(booth, user)
+    return _booth_to_response(booth, booth.user)
 
 
 @router.get("/booths/username/{username}", response_model=MarketBoothResponse)
-async def get_booth_by_username(username: str, db: Session = Depends(get_db)):
+async def get_booth_by_username(
+    username: str, db: AsyncSession = Depends(get_async_db)
+):
     """Get a market booth by username.
 
     Args:
@@ -103,14 +199,14 @@ async def get_booth_by_username(username: str, db: Session = Depends(get_db)):
     Raises:
         HTTPException: If booth not found
     """
-    user = db.query(User).filter(User.username == username).first()
+    user = await db.scalar(select(User).where(User.username == username))
 
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
         )
 
-    booth = db.query(MarketBooth).filter(MarketBooth.user_id == user.id).first()
+    booth = await db.scalar(select(MarketBooth).where(MarketBooth.user_id == user.id))
 
     if not booth:
         raise HTTPException(
@@ -126,7 +222,7 @@ async def get_booth_by_username(username: str, db: Session = Depends(get_db)):
 async def create_booth(
     booth_data: MarketBoothCreate,
     authorization: str = Depends(lambda: None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Create a new market booth for authenticated user.
 
@@ -149,8 +245,8 @@ async def create_booth(
         )
 
     # Check if booth already exists
-    existing_booth = (
-        db.query(MarketBooth).filter(MarketBooth.user_id == user.id).first()
+    existing_booth = await db.scalar(
+        select(MarketBooth).where(MarketBooth.user_id == user.id)
     )
     if existing_booth:
         raise HTTPException(
@@ -166,8 +262,9 @@ async def create_booth(
         layout=booth_data.layout,
     )
     db.add(booth)
-    db.commit()
-    db.refresh(booth)
+    await db.commit()
+    await db.refresh(booth)
+    get_response_cache().invalidate(BOOTHS_TAG)
 
     logger.info(f"Booth created for user: {user.username}")
 
@@ -179,7 +276,7 @@ async def update_booth(
     booth_id: str,
     booth_data: MarketBoothUpdate,
     authorization: str = Depends(lambda: None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Update a market booth.
 
@@ -202,7 +299,7 @@ async def update_booth(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication required"
         )
 
-    booth = db.query(MarketBooth).filter(MarketBooth.id == booth_id).first()
+    booth = await db.scalar(select(MarketBooth).where(MarketBooth.id == booth_id))
 
     if not booth:
         raise HTTPException(
@@ -223,8 +320,9 @@ async def update_booth(
     if booth_data.layout is not None:
         booth.layout = booth_data.layout
 
-    db.commit()
-    db.refresh(booth)
+    await db.commit()
+    await db.refresh(booth)
+    get_response_cache().invalidate(BOOTHS_TAG)
 
     return _booth_to_response(booth, user)
 
@@ -235,7 +333,7 @@ async def update_booth(
 async def create_nft(
     nft_data: NFTItemCreate,
     authorization: str = Depends(lambda: None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Create a new NFT item.
 
@@ -258,7 +356,7 @@ async def create_nft(
         )
 
     # Get user's booth
-    booth = db.query(MarketBooth).filter(MarketBooth.user_id == user.id).first()
+    booth = await db.scalar(select(MarketBooth).where(MarketBooth.user_id == user.id))
 
     if not booth:
         raise HTTPException(
@@ -282,65 +380,110 @@ async def create_nft(
         booth_id=booth.id,
         featured=nft_data.featured,
         nft_attributes=nft_data.nft_attributes,
-        transaction_history=[
-            {
-                "id": f"tx_{nft_id}",
-                "nftId": nft_id,
-                "type": "mint",
-                "from": "0x0",
-                "to": user.id,
-                "timestamp": timestamp,
-            }
-        ],
         created_at=timestamp,
     )
     db.add(nft)
+    nft.transactions.add(
+        NFTTransaction(
+            id=f"tx_{nft_id}",
+            type="mint",
+            from_address="0x0",
+            to_address=user.id,
+            timestamp=timestamp,
+        )
+    )
 
     # Update booth stats
     booth.active_listings += 1
 
-    db.commit()
-    db.refresh(nft)
+    await db.commit()
+    await db.refresh(nft)
+    # The booth's active listings changed too
+    get_response_cache().invalidate(NFTS_TAG, BOOTHS_TAG)
 
     logger.info(f"NFT created: {nft.name} by {user.username}")
 
     return NFTItemResponse.model_validate(nft)
 
 
-@router.get("/nft", response_model=List[NFTItemResponse])
+@router.get("/nft", response_model=NFTItemPage)
 async def get_nfts(
     booth_id: Optional[str] = None,
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    limit: int = MAX_PAGE_SIZE,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """Get NFT items, optionally filtered by booth.
+    """Get NFT items, newest first, optionally filtered by booth.
+
+    Pages are read with keyset pagination on (created_at, id); pass the
+    returned next_cursor to get the following page. Cache misses read the
+    primary, as in get_all_booths.
 
     Args:
         booth_id: Optional booth ID to filter by
-        skip: Number of items to skip
-        limit: Maximum number of items to return
+        cursor: Cursor from the previous page
+        limit: Maximum number of items to return (max: 100)
+        fields: Comma-separated fields to return per item, e.g.
+            "id,name,price,rarity" (default: all)
         db: Database session
 
     Returns:
-        List of NFT items
+        Page of NFT items
     """
-    query = db.query(NFTItem)
+    after = decode_cursor(cursor, (int, str))
+    limit = clamp_page_size(limit)
+    selected = parse_fields(fields, NFTItemResponse)
+
+    cache = get_response_cache()
+    key = cache.make_key(
+        "market:nfts",
+        {
+            "booth_id": booth_id,
+            "cursor": cursor,
+            "limit": limit,
+            "fields": ",".join(selected) if selected else None,
+        },
+        tags=(NFTS_TAG,),
+    )
+    body = cache.get(key)
+    if body is None:
+        # The sort key is read even when not requested, to build the cursor
+        query = select(*_nft_columns(selected, *NFT_SORT_COLUMNS)).order_by(
+            NFTItem.created_at.desc(), NFTItem.id.desc()
+        )
 
-    if booth_id:
-        query = query.filter(NFTItem.booth_id == booth_id)
+        if booth_id:
+            query = query.where(NFTItem.booth_id == booth_id)
+        if after:
+            query = query.where(tuple_(NFTItem.created_at, NFTItem.id) < after)
 
-    nfts = query.offset(skip).limit(limit).all()
+        # One extra row tells whether another page follows
+        rows = (await db.execute(query.limit(limit + 1))).mappings().all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor((rows[-1]["created_at"], rows[-1]["id"]))
 
-    return [NFTItemResponse.model_validate(nft) for nft in nfts]
+        body = cache.store(
+            key, {"items": rows_to_dicts(rows, selected), "next_cursor": next_cursor}
+        )
+
+    return json_response(body)
 
 
 @router.get("/nft/{nft_id}", response_model=NFTItemResponse)
-async def get_nft(nft_id: str, db: Session = Depends(get_db)):
+async def get_nft(
+    nft_id: str,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
     """Get a specific NFT by ID.
 
     Args:
         nft_id: NFT ID
+        fields: Comma-separated fields to return, e.g. "id,name,price"
+            (default: all)
         db: Database session
 
     Returns:
@@ -349,21 +492,91 @@ async def get_nft(nft_id: str, db: Session = Depends(get_db)):
     Raises:
         HTTPException: If NFT not found
     """
-    nft = db.query(NFTItem).filter(NFTItem.id == nft_id).first()
+    selected = parse_fields(fields, NFTItemResponse)
 
-    if not nft:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="NFT not found"
+    cache = get_response_cache()
+    key = cache.make_key(
+        "market:nft",
+        {"nft_id": nft_id, "fields": ",".join(selected) if selected else None},
+        tags=(_nft_tag(nft_id),),
+    )
+    body = cache.get(key)
+    if body is None:
+        result = await db.execute(
+            select(*_nft_columns(selected)).where(NFTItem.id == nft_id)
         )
+        row = result.mappings().first()
 
-    return NFTItemResponse.model_validate(nft)
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="NFT not found"
+            )
+
+        body = cache.store(key, dict(row))
+
+    return json_response(body)
+
+
+@router.get("/nft/{nft_id}/history", response_model=NFTTransactionPage)
+async def get_nft_history(
+    nft_id: str,
+    cursor: Optional[str] = None,
+    limit: int = MAX_PAGE_SIZE,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Get the transactions of an NFT, newest first.
+
+    Pages are read with keyset pagination on (timestamp, id); pass the
+    returned next_cursor to get the following page.
+
+    Args:
+        nft_id: NFT ID
+        cursor: Cursor from the previous page
+        limit: Maximum number of transactions to return (max: 100)
+        db: Database session
+
+    Returns:
+        Page of NFT transactions
+
+    Raises:
+        HTTPException: If NFT not found
+    """
+    after = decode_cursor(cursor, (int, str))
+    limit = clamp_page_size(limit)
+
+    query = (
+        select(*TRANSACTION_COLUMNS)
+        .where(NFTTransaction.nft_id == nft_id)
+        .order_by(NFTTransaction.timestamp.desc(), NFTTransaction.id.desc())
+    )
+    if after:
+        query = query.where(tuple_(NFTTransaction.timestamp, NFTTransaction.id) < after)
+
+    # One extra row tells whether another page follows
+    rows = (await db.execute(query.limit(limit + 1))).mappings().all()
+
+    # Every NFT has at least its mint, so an empty first page means no NFT
+    if not rows and after is None:
+        if not await db.scalar(select(NFTItem.id).where(NFTItem.id == nft_id)):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="NFT not found"
+            )
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor((rows[-1]["timestamp"], rows[-1]["id"]))
+
+    return json_response(
+        encode_json({"items": rows_to_dicts(rows), "next_cursor": next_cursor})
+    )
 
 
 @router.delete("/nft/{nft_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_nft(
     nft_id: str,
     authorization: str = Depends(lambda: None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Delete an NFT item.
 
@@ -382,7 +595,7 @@ async def delete_nft(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication required"
         )
 
-    nft = db.query(NFTItem).filter(NFTItem.id == nft_id).first()
+    nft = await db.scalar(select(NFTItem).where(NFTItem.id == nft_id))
 
     if not nft:
         raise HTTPException(
@@ -396,11 +609,14 @@ async def delete_nft(
         )
 
     # Update booth stats
-    booth = db.query(MarketBooth).filter(MarketBooth.id == nft.booth_id).first()
+    booth = await db.scalar(select(MarketBooth).where(MarketBooth.id == nft.booth_id))
     if booth:
         booth.active_listings = max(0, booth.active_listings - 1)
 
-    db.delete(nft)
-    db.commit()
+    # Not left to ON DELETE CASCADE, which SQLite only honours when enabled
+    await db.execute(delete(NFTTransaction).where(NFTTransaction.nft_id == nft_id))
+    await db.delete(nft)
+    await db.commit()
+    get_response_cache().invalidate(NFTS_TAG, _nft_tag(nft_id), BOOTHS_TAG)
 
     logger.info(f"NFT deleted: {nft_id} by {user.username}")
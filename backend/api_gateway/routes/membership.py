@@ -4,7 +4,8 @@ Membership and payment routes.
 
 from fastapi import APIRouter, HTTPException, Request, Depends
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 import os
 import sys
@@ -13,8 +14,8 @@ import time
 # Add backend to path for database module
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-from database import get_db, User, Subscription
-from ..auth import get_current_user_from_token
+from database import get_async_db, User, Subscription
+from ..auth import get_current_user_from_token, load_user, lookup_api_key
 
 logger = logging.getLogger(__name__)
 
@@ -104,7 +105,7 @@ async def create_checkout_session(request: CheckoutRequest) -> dict:
 
 
 @router.post("/webhook")
-async def stripe_webhook(request: Request, db: Session = Depends(get_db)):
+async def stripe_webhook(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Handle Stripe webhook events.
 
     Args:
@@ -138,17 +139,15 @@ async def stripe_webhook(request: Request, db: Session = Depends(get_db)):
 
             if customer_email:
                 # Find or create user
-                user = db.query(User).filter(User.email == customer_email).first()
+                user = await db.scalar(select(User).where(User.email == customer_email))
 
                 if user:
                     # Update user's stripe customer ID
                     user.stripe_customer_id = stripe_customer_id
 
                     # Activate subscription
-                    subscription = (
-                        db.query(Subscription)
-                        .filter(Subscription.user_id == user.id)
-                        .first()
+                    subscription = await db.scalar(
+                        select(Subscription).where(Subscription.user_id == user.id)
                     )
 
                     if subscription:
@@ -167,7 +166,7 @@ async def stripe_webhook(request: Request, db: Session = Depends(get_db)):
                         )
                         db.add(subscription)
 
-                    db.commit()
+                    await db.commit()
                     logger.info(f"Subscription activated for user: {user.username}")
 
         elif event_type == "customer.subscription.deleted":
@@ -175,15 +174,15 @@ async def stripe_webhook(request: Request, db: Session = Depends(get_db)):
             subscription_id = event_data.get("data", {}).get("object", {}).get("id")
 
             if subscription_id:
-                subscription = (
-                    db.query(Subscription)
-                    .filter(Subscription.stripe_subscription_id == subscription_id)
-                    .first()
+                subscription = await db.scalar(
+                    select(Subscription).where(
+                        Subscription.stripe_subscription_id == subscription_id
+                    )
                 )
 
                 if subscription:
                     subscription.status = "cancelled"
-                    db.commit()
+                    await db.commit()
                     logger.info(
                         f"Subscription cancelled for user_id: {subscription.user_id}"
                     )
@@ -197,7 +196,9 @@ async def stripe_webhook(request: Request, db: Session = Depends(get_db)):
 
 @router.get("/status")
 async def check_membership_status(
-    api_key: str = None, authorization: str = None, db: Session = Depends(get_db)
+    api_key: str = None,
+    authorization: str = None,
+    db: AsyncSession = Depends(get_async_db),
 ) -> dict:
     """Check membership status.
 
@@ -217,7 +218,9 @@ async def check_membership_status(
 
     # Try to get user from API key
     if not user and api_key:
-        user = db.query(User).filter(User.api_key == api_key).first()
+        entry = await lookup_api_key(db, api_key)
+        if entry:
+            user = await load_user(db, entry[0])
 
     if not user:
         return {
@@ -228,13 +231,13 @@ async def check_membership_status(
         }
 
     # Get subscription
-    subscription = (
-        db.query(Subscription).filter(Subscription.user_id == user.id).first()
+    subscription = await db.scalar(
+        select(Subscription).where(Subscription.user_id == user.id)
     )
 
     return {
         "username": user.username,
-        "api_key": user.api_key[:8] + "..." if user.api_key else None,
+        "api_key": user.api_key_prefix + "..." if user.api_key_prefix else None,
         "active": subscription.status == "active" if subscription else False,
         "plan": subscription.plan_type if subscription else None,
         "status": subscription.status if subscription else None,
@@ -36,12 +36,20 @@ class UserResponse(BaseModel):
     email: str
     avatar: str
     is_active: bool
-    api_key: Optional[str]
+    api_key: Optional[str] = None  # Only returned when a key is issued
+    api_key_prefix: Optional[str] = None
 
     class Config:
         from_attributes = True
 
 
+class ApiKeyResponse(BaseModel):
+    """Schema for a newly issued API key."""
+
+    api_key: str
+    api_key_prefix: str
+
+
 class PasswordChange(BaseModel):
     """Schema for password change."""
 
@@ -35,13 +35,27 @@ class NFTItemResponse(BaseModel):
     favorites: int
     sales: int
     nft_attributes: Dict[str, Any]
-    transaction_history: List[Dict[str, Any]]
     created_at: int
 
     class Config:
         from_attributes = True
 
 
+class NFTTransactionResponse(BaseModel):
+    """Schema for an NFT transaction response."""
+
+    id: str
+    nft_id: str
+    type: str
+    from_address: str
+    to_address: str
+    price: Optional[float] = None
+    timestamp: int
+
+    class Config:
+        from_attributes = True
+
+
 class MarketBoothCreate(BaseModel):
     """Schema for creating a market booth."""
 
@@ -81,3 +95,24 @@ class MarketBoothResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class NFTItemPage(BaseModel):
+    """Schema for a page of NFT items."""
+
+    items: List[NFTItemResponse]
+    next_cursor: Optional[str] = None
+
+
+class MarketBoothPage(BaseModel):
+    """Schema for a page of market booths."""
+
+    items: List[MarketBoothResponse]
+    next_cursor: Optional[str] = None
+
+
+class NFTTransactionPage(BaseModel):
+    """Schema for a page of NFT transactions."""
+
+    items: List[NFTTransactionResponse]
+    next_cursor: Optional[str] = None
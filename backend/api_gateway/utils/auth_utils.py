@@ -1,20 +1,39 @@
 """Authentication utilities for password hashing and JWT tokens."""
 
+import hashlib
 import os
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt_sha256"], deprecated="auto")
+from .cache import TTLCache
+from .revocation import get_revocation_list
+
+# Password hashing. Hashes below the configured cost, and plain bcrypt hashes
+# from older seed data, still verify but report needs_password_update().
+PASSWORD_HASH_ROUNDS = int(os.getenv("PASSWORD_HASH_ROUNDS", "12"))
+pwd_context = CryptContext(
+    schemes=["bcrypt_sha256", "bcrypt"],
+    deprecated=["bcrypt"],
+    bcrypt_sha256__rounds=PASSWORD_HASH_ROUNDS,
+    bcrypt_sha256__min_rounds=PASSWORD_HASH_ROUNDS,
+)
 
 # JWT settings
 SECRET_KEY = os.getenv("JWT_SECRET", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
 
+# Verified token claims are cached by token hash, never past the token's exp
+TOKEN_CACHE_TTL_SECONDS = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+
+# Leading characters of an API key kept in plain text to identify it
+API_KEY_PREFIX_LENGTH = 8
+
 
 def hash_password(password: str) -> str:
     """Hash a password using bcrypt.
@@ -41,6 +60,18 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def needs_password_update(hashed_password: str) -> bool:
+    """Check whether a hash should be replaced with one at the current cost.
+
+    Args:
+        hashed_password: Hashed password from database
+
+    Returns:
+        True if the hash uses a deprecated scheme or too few rounds
+    """
+    return pwd_context.needs_update(hashed_password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token.
 
@@ -62,9 +93,37 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+# Global token cache instance
+_token_cache: Optional[TTLCache] = None
+
+
+def get_token_cache() -> TTLCache:
+    """Get or create the verified token cache instance."""
+    global _token_cache
+    if _token_cache is None:
+        _token_cache = TTLCache(max_size=TOKEN_CACHE_SIZE, ttl=TOKEN_CACHE_TTL_SECONDS)
+    return _token_cache
+
+
+def hash_token(token: str) -> str:
+    """Get the key a token is cached and revoked under."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _credentials_error() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
 def decode_access_token(token: str) -> dict:
     """Decode and verify a JWT access token.
 
+    Repeat calls with the same token return cached claims without verifying
+    the signature again; revoked tokens are rejected either way.
+
     Args:
         token: JWT token to decode
 
@@ -72,17 +131,54 @@ def decode_access_token(token: str) -> dict:
         Decoded token payload
 
     Raises:
-        HTTPException: If token is invalid or expired
+        HTTPException: If token is invalid, expired or revoked
     """
+    token_hash = hash_token(token)
+    cache = get_token_cache()
+    revocations = get_revocation_list()
+
+    payload = cache.get(token_hash)
+    if payload is not None:
+        if revocations.is_revoked(token_hash):
+            cache.delete(token_hash)
+            raise _credentials_error()
+        return dict(payload)
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
+        raise _credentials_error()
+
+    if revocations.is_revoked(token_hash, check_shared=True):
+        raise _credentials_error()
+
+    expires_at = payload.get("exp")
+    if expires_at is not None:
+        cache.set(
+            token_hash,
+            dict(payload),
+            ttl=min(TOKEN_CACHE_TTL_SECONDS, float(expires_at) - time.time()),
         )
+    return payload
+
+
+def revoke_access_token(token: str) -> dict:
+    """Reject a token for the rest of its lifetime.
+
+    Args:
+        token: JWT token to revoke
+
+    Returns:
+        The revoked token's payload
+
+    Raises:
+        HTTPException: If token is already invalid, expired or revoked
+    """
+    payload = decode_access_token(token)
+    token_hash = hash_token(token)
+    get_revocation_list().revoke(token_hash, float(payload.get("exp", time.time())))
+    get_token_cache().delete(token_hash)
+    return payload
 
 
 def generate_api_key() -> str:
@@ -94,3 +190,23 @@ def generate_api_key() -> str:
     import secrets
 
     return f"ak_{secrets.token_urlsafe(32)}"
+
+
+def hash_api_key(api_key: str) -> str:
+    """Hash an API key for storage and lookup.
+
+    API keys are random and high-entropy, so a fast unsalted digest is
+    enough and lets the hash itself be the lookup key.
+
+    Args:
+        api_key: Plain text API key
+
+    Returns:
+        Hex-encoded SHA-256 of the key
+    """
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+
+def api_key_prefix(api_key: str) -> str:
+    """Get the part of an API key shown to identify it."""
+    return api_key[:API_KEY_PREFIX_LENGTH]
@@ -0,0 +1,215 @@
+"""In-process LRU caches with per-entry expiry and cross-process invalidation."""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a time to live.
+
+    The least recently used entry is evicted once ``max_size`` is reached.
+    Each entry may carry its own TTL, which is how short negative entries
+    and claims capped at a token's expiry share one structure.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10_000,
+        ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the cache.
+
+        Args:
+            max_size: Maximum number of entries
+            ttl: Default seconds an entry stays valid
+            clock: Monotonic clock in seconds
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a live entry, refreshing its recency."""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING or entry[1] <= self.clock():
+                if entry is not _MISSING:
+                    del self._entries[key]
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store an entry.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Seconds the entry stays valid (defaults to the cache TTL)
+        """
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, self.clock() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> bool:
+        """Remove an entry, returning whether it was present."""
+        with self._lock:
+            return self._entries.pop(key, _MISSING) is not _MISSING
+
+    def evict_matching(self, predicate: Callable[[Any], bool]) -> int:
+        """Remove every entry whose value matches a predicate.
+
+        Linear in the cache size; meant for rare evictions by a secondary
+        attribute, such as all keys belonging to one user.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            keys = [
+                key for key, (value, _) in self._entries.items() if predicate(value)
+            ]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_statistics(self) -> Dict:
+        """Get cache statistics.
+
+        Returns:
+            Dictionary with statistics
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else None,
+            "evictions": self.evictions,
+        }
+
+
+class CacheInvalidator:
+    """Broadcasts cache evictions to every API process through Redis pub/sub.
+
+    Each process subscribes to one channel; ``publish`` sends an eviction to
+    all of them (including the sender, which has already evicted locally).
+    Without a Redis client evictions stay local to the process.
+    """
+
+    def __init__(self, client=None, channel: str = "alphanest:cache:invalidate"):
+        """Initialize the invalidator.
+
+        Args:
+            client: Redis client with pub/sub support, or None
+            channel: Pub/sub channel carrying evictions
+        """
+        self.client = client if hasattr(client, "pubsub") else None
+        self.channel = channel
+        self._handlers: Dict[str, Callable[[str], None]] = {}
+        self._thread = None
+
+    def register(self, namespace: str, handler: Callable[[str], None]):
+        """Handle evictions published for a namespace.
+
+        Args:
+            namespace: Name of the cache, e.g. "user"
+            handler: Called with the evicted key
+        """
+        self._handlers[namespace] = handler
+        self._start()
+
+    def publish(self, namespace: str, key: str):
+        """Tell the other processes to evict a key."""
+        if self.client is None:
+            return
+        try:
+            self.client.publish(self.channel, f"{namespace}:{key}")
+        except Exception as e:
+            logger.warning(f"Failed to publish cache eviction: {e}")
+
+    def _start(self):
+        if self.client is None or self._thread is not None:
+            return
+        try:
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{self.channel: self._on_message})
+            self._thread = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+        except Exception as e:
+            logger.warning(f"Cache eviction listener unavailable: {e}")
+
+    def _on_message(self, message: Dict):
+        data = message.get("data")
+        if isinstance(data, bytes):
+            data = data.decode("utf-8")
+        namespace, _, key = str(data).partition(":")
+        handler = self._handlers.get(namespace)
+        if handler is not None:
+            handler(key)
+
+    def stop(self):
+        """Stop listening for evictions."""
+        if self._thread is not None:
+            self._thread.stop()
+            self._thread = None
+
+
+def create_invalidator(redis_url: Optional[str] = None) -> CacheInvalidator:
+    """Create a cache invalidator for the given Redis URL.
+
+    Args:
+        redis_url: Redis connection URL (defaults to REDIS_URL)
+
+    Returns:
+        A CacheInvalidator, broadcasting only if Redis is configured
+    """
+    redis_url = redis_url or os.getenv("REDIS_URL")
+    if not redis_url:
+        return CacheInvalidator()
+
+    import redis
+
+    return CacheInvalidator(redis.from_url(redis_url, decode_responses=True))
+
+
+# Global invalidator instance
+_invalidator: Optional[CacheInvalidator] = None
+
+
+def get_invalidator() -> CacheInvalidator:
+    """Get or create the cache invalidator instance."""
+    global _invalidator
+    if _invalidator is None:
+        _invalidator = create_invalidator()
+    return _invalidator
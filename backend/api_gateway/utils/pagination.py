@@ -0,0 +1,63 @@
+"""Opaque cursors for keyset pagination."""
+
+import base64
+import binascii
+import json
+from typing import Any, Optional, Sequence, Tuple, Type
+
+from fastapi import HTTPException, status
+
+# Largest page a listing returns
+MAX_PAGE_SIZE = 100
+
+
+def clamp_page_size(limit: int) -> int:
+    """Limit a requested page size to 1..MAX_PAGE_SIZE."""
+    return min(max(limit, 1), MAX_PAGE_SIZE)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor.
+
+    Args:
+        values: Sort key columns, e.g. (created_at, id)
+
+    Returns:
+        URL-safe cursor string
+    """
+    raw = json.dumps(list(values), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: Optional[str], types: Sequence[Type]) -> Optional[Tuple]:
+    """Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor from a previous page, or None for the first page
+        types: Expected type of each sort key column
+
+    Returns:
+        Tuple of sort key values, or None for the first page
+
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError):
+        values = None
+    if (
+        not isinstance(values, list)
+        or len(values) != len(types)
+        or not all(
+            isinstance(value, expected) and not isinstance(value, bool)
+            for value, expected in zip(values, types)
+        )
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+    return tuple(values)
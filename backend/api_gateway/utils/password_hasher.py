@@ -0,0 +1,176 @@
+"""Password hashing on a bounded process pool.
+
+bcrypt deliberately burns tens to hundreds of milliseconds of CPU per call.
+Running it inline in an ``async def`` route stalls every other request on
+the worker, so hashes and verifications are sent to a process pool instead.
+The number of calls in flight is capped: past the cap callers get a 503
+rather than queueing without bound behind a login storm.
+"""
+
+import asyncio
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Optional
+
+from fastapi import HTTPException, status
+
+from .auth_utils import hash_password, needs_password_update, verify_password
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHasher:
+    """Hashes and verifies passwords on a process pool with backpressure.
+
+    Counters are only updated from the event loop thread, so no locking is
+    needed.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_pending: int = 0):
+        """Initialize the hasher.
+
+        Args:
+            max_workers: Worker processes (defaults to the CPU count)
+            max_pending: Calls allowed in flight, running or queued, before
+                requests are rejected (defaults to 8 per worker)
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.max_workers * 8
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.upgrades = 0
+        self.upgrades_skipped = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Calls waiting for a free worker."""
+        return max(0, self.in_flight - self.max_workers)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def has_capacity(self, background: bool = False) -> bool:
+        """Check whether another call may be submitted.
+
+        Background work only uses the lower half of the capacity so it never
+        causes a request to be rejected.
+        """
+        limit = self.max_pending // 2 if background else self.max_pending
+        return self.in_flight < max(1, limit)
+
+    async def _submit(self, func: Callable, *args):
+        if not self.has_capacity():
+            self.rejected += 1
+            logger.warning(
+                f"Password hasher saturated ({self.in_flight} in flight), "
+                f"rejecting request"
+            )
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server busy, please retry shortly",
+                headers={"Retry-After": "1"},
+            )
+
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool for the next call
+            logger.error("Password hashing pool broke, restarting it")
+            self._executor = None
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server busy, please retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+
+    async def hash(self, password: str) -> str:
+        """Hash a password.
+
+        Raises:
+            HTTPException: 503 if the pool is saturated
+        """
+        return await self._submit(hash_password, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """Verify a password against a hash.
+
+        Raises:
+            HTTPException: 503 if the pool is saturated
+        """
+        return await self._submit(verify_password, password, hashed_password)
+
+    async def upgrade(self, password: str, hashed_password: str) -> Optional[str]:
+        """Rehash a verified password whose hash is outdated.
+
+        Skipped when the pool is busier than half its capacity; the hash is
+        upgraded on a later login instead.
+
+        Args:
+            password: Plain text password, already verified
+            hashed_password: Current hash
+
+        Returns:
+            The new hash, or None if no upgrade was needed or it was skipped
+        """
+        if not needs_password_update(hashed_password):
+            return None
+        if not self.has_capacity(background=True):
+            self.upgrades_skipped += 1
+            return None
+        new_hash = await self._submit(hash_password, password)
+        self.upgrades += 1
+        return new_hash
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def get_statistics(self) -> Dict:
+        """Get hasher statistics.
+
+        Returns:
+            Dictionary with statistics
+        """
+        return {
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "peak_in_flight": self.peak_in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "upgrades": self.upgrades,
+            "upgrades_skipped": self.upgrades_skipped,
+        }
+
+
+# Global hasher instance
+_hasher: Optional[PasswordHasher] = None
+
+
+def get_password_hasher() -> PasswordHasher:
+    """Get or create the password hasher instance."""
+    global _hasher
+    if _hasher is None:
+        workers = os.getenv("PASSWORD_HASH_WORKERS")
+        _hasher = PasswordHasher(
+            max_workers=int(workers) if workers else None,
+            max_pending=int(os.getenv("PASSWORD_HASH_MAX_PENDING", "0")),
+        )
+    return _hasher
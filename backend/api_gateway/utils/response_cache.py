@@ -0,0 +1,211 @@
+"""Cache of encoded JSON responses with tag-based invalidation."""
+
+import logging
+import os
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple
+from urllib.parse import urlencode
+
+from fastapi import Response
+
+from .cache import CacheInvalidator, TTLCache, get_invalidator
+from .serialization import encode_json
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "30"))
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "1000"))
+
+
+class ResponseCache:
+    """Two-tier cache of response bodies keyed by route and parameters.
+
+    Bodies are kept in an in-process LRU and, when Redis is configured, in
+    Redis so other API processes can serve them too. Every key embeds the
+    current version of each tag the response depends on; invalidating a tag
+    bumps its version, so earlier entries can no longer be reached and a
+    request that read the database before a write cannot store a stale body
+    under the new version. Tag versions live in Redis when it is available
+    and are cached locally until another process announces a bump.
+    """
+
+    def __init__(
+        self,
+        max_size: int = RESPONSE_CACHE_SIZE,
+        ttl: float = RESPONSE_CACHE_TTL_SECONDS,
+        invalidator: Optional[CacheInvalidator] = None,
+        key_prefix: str = "alphanest:response",
+    ):
+        """Initialize the cache.
+
+        Args:
+            max_size: Maximum number of bodies kept in process
+            ttl: Seconds a body stays valid
+            invalidator: Broadcasts tag bumps; its Redis client also stores
+                bodies and tag versions (local only if None or without Redis)
+            key_prefix: Prefix for the Redis keys used by the cache
+        """
+        self.ttl = ttl
+        self.invalidator = invalidator or CacheInvalidator()
+        self.client = self.invalidator.client
+        self.key_prefix = key_prefix
+        self._local = TTLCache(max_size=max_size, ttl=ttl)
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.shared_hits = 0
+        self.invalidations = 0
+        self.invalidator.register("response", self._on_invalidated)
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.key_prefix}:tag:{tag}"
+
+    def _body_key(self, key: str) -> str:
+        return f"{self.key_prefix}:body:{key}"
+
+    def _tag_versions(self, tags: Tuple[str, ...]) -> Tuple[int, ...]:
+        with self._lock:
+            missing = [tag for tag in tags if tag not in self._versions]
+        if missing:
+            fetched = [0] * len(missing)
+            if self.client is not None:
+                try:
+                    fetched = [
+                        int(value or 0)
+                        for value in self.client.mget(
+                            [self._tag_key(tag) for tag in missing]
+                        )
+                    ]
+                except Exception as e:
+                    logger.warning(f"Failed to read response cache tags: {e}")
+            with self._lock:
+                for tag, version in zip(missing, fetched):
+                    self._versions.setdefault(tag, version)
+        with self._lock:
+            return tuple(self._versions.get(tag, 0) for tag in tags)
+
+    def make_key(
+        self,
+        route: str,
+        params: Optional[Dict[str, Any]] = None,
+        tags: Iterable[str] = (),
+    ) -> str:
+        """Build the cache key of a response.
+
+        Args:
+            route: Name of the route, e.g. "market:nfts"
+            params: Query and path parameters the response depends on
+            tags: Tags whose invalidation must drop the response
+
+        Returns:
+            Cache key including the current tag versions
+        """
+        tags = tuple(sorted(tags))
+        query = urlencode(
+            sorted((k, v) for k, v in (params or {}).items() if v is not None)
+        )
+        versions = ",".join(
+            f"{tag}={version}" for tag, version in zip(tags, self._tag_versions(tags))
+        )
+        return f"{route}?{query}#{versions}"
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Get a cached body, checking this process before Redis.
+
+        Args:
+            key: Key from make_key
+
+        Returns:
+            JSON body, or None on a miss
+        """
+        body = self._local.get(key)
+        if body is not None or self.client is None:
+            return body
+        try:
+            body = self.client.get(self._body_key(key))
+        except Exception as e:
+            logger.warning(f"Failed to read response cache: {e}")
+            return None
+        if body is not None:
+            if isinstance(body, str):
+                body = body.encode("utf-8")
+            self.shared_hits += 1
+            self._local.set(key, body)
+        return body
+
+    def store(self, key: str, content: Any) -> bytes:
+        """Encode a response and cache its body.
+
+        Args:
+            key: Key from make_key
+            content: Models, row dictionaries or JSON-compatible data
+
+        Returns:
+            JSON body
+        """
+        body = encode_json(content)
+        self._local.set(key, body)
+        if self.client is not None:
+            try:
+                self.client.set(self._body_key(key), body, ex=max(1, int(self.ttl)))
+            except Exception as e:
+                logger.warning(f"Failed to write response cache: {e}")
+        return body
+
+    def invalidate(self, *tags: str):
+        """Drop every cached response depending on any of the tags.
+
+        Args:
+            tags: Tags to invalidate
+        """
+        for tag in tags:
+            version = None
+            if self.client is not None:
+                try:
+                    version = int(self.client.incr(self._tag_key(tag)))
+                except Exception as e:
+                    logger.warning(f"Failed to bump response cache tag: {e}")
+            with self._lock:
+                if version is None:
+                    version = self._versions.get(tag, 0) + 1
+                self._versions[tag] = version
+            self.invalidations += 1
+            self.invalidator.publish("response", tag)
+
+    def _on_invalidated(self, tag: str):
+        # Re-read the version from Redis on next use
+        with self._lock:
+            self._versions.pop(tag, None)
+
+    def clear(self):
+        """Remove all bodies cached in this process."""
+        self._local.clear()
+
+    def get_statistics(self) -> Dict:
+        """Get cache statistics.
+
+        Returns:
+            Dictionary with statistics
+        """
+        return {
+            **self._local.get_statistics(),
+            "shared": self.client is not None,
+            "shared_hits": self.shared_hits,
+            "invalidations": self.invalidations,
+        }
+
+
+def json_response(body: bytes) -> Response:
+    """Wrap an encoded body in a response, skipping response_model validation."""
+    return Response(content=body, media_type="application/json")
+
+
+# Global response cache instance
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Get or create the response cache instance."""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache(invalidator=get_invalidator())
+    return _response_cache
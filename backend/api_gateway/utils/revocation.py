@@ -0,0 +1,121 @@
+"""Revocation list for access tokens that have not yet expired."""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from .cache import CacheInvalidator, get_invalidator
+
+logger = logging.getLogger(__name__)
+
+
+class TokenRevocationList:
+    """Token hashes rejected until the token's own expiry.
+
+    Revocations are held in memory so the check on a cached token costs a
+    dictionary lookup. With Redis configured they are also written to Redis,
+    where processes that start later find them on their first full decode
+    of a token, and broadcast so running processes reject them at once.
+    """
+
+    def __init__(
+        self,
+        invalidator: Optional[CacheInvalidator] = None,
+        key_prefix: str = "auth:revoked",
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initialize the revocation list.
+
+        Args:
+            invalidator: Broadcasts revocations; its Redis client also stores
+                them (local only if None or without Redis)
+            key_prefix: Prefix for the Redis keys of revoked tokens
+            clock: Wall clock in seconds, matching token expiry times
+        """
+        self.invalidator = invalidator
+        self.client = invalidator.client if invalidator is not None else None
+        self.key_prefix = key_prefix
+        self.clock = clock
+        self._revoked: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        if invalidator is not None:
+            invalidator.register("token", self._on_revoked)
+
+    def revoke(self, token_hash: str, expires_at: float):
+        """Reject a token until it expires.
+
+        Args:
+            token_hash: SHA-256 of the token
+            expires_at: Unix time the token expires
+        """
+        self._add(token_hash, expires_at)
+        ttl = int(expires_at - self.clock()) + 1
+        if self.client is not None and ttl > 0:
+            try:
+                self.client.set(f"{self.key_prefix}:{token_hash}", 1, ex=ttl)
+            except Exception as e:
+                logger.warning(f"Failed to store token revocation: {e}")
+        if self.invalidator is not None:
+            self.invalidator.publish("token", f"{token_hash}:{expires_at}")
+
+    def is_revoked(self, token_hash: str, check_shared: bool = False) -> bool:
+        """Check whether a token has been revoked.
+
+        Args:
+            token_hash: SHA-256 of the token
+            check_shared: Also look the token up in Redis, for revocations
+                made before this process subscribed
+
+        Returns:
+            True if the token must be rejected
+        """
+        with self._lock:
+            expires_at = self._revoked.get(token_hash)
+            if expires_at is not None:
+                if expires_at > self.clock():
+                    return True
+                del self._revoked[token_hash]
+
+        if check_shared and self.client is not None:
+            key = f"{self.key_prefix}:{token_hash}"
+            try:
+                ttl = self.client.ttl(key)
+            except Exception as e:
+                logger.warning(f"Failed to check token revocation: {e}")
+                return False
+            if ttl is not None and ttl > 0:
+                self._add(token_hash, self.clock() + ttl)
+                return True
+        return False
+
+    def _add(self, token_hash: str, expires_at: float):
+        with self._lock:
+            now = self.clock()
+            # Drop expired revocations so the list stays bounded
+            self._revoked = {
+                key: expiry for key, expiry in self._revoked.items() if expiry > now
+            }
+            self._revoked[token_hash] = expires_at
+
+    def _on_revoked(self, message: str):
+        token_hash, _, expires_at = message.partition(":")
+        try:
+            self._add(token_hash, float(expires_at))
+        except ValueError:
+            logger.warning(f"Ignoring malformed token revocation: {message}")
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+
+# Global revocation list instance
+_revocations: Optional[TokenRevocationList] = None
+
+
+def get_revocation_list() -> TokenRevocationList:
+    """Get or create the token revocation list instance."""
+    global _revocations
+    if _revocations is None:
+        _revocations = TokenRevocationList(get_invalidator())
+    return _revocations
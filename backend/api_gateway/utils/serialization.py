@@ -0,0 +1,98 @@
+"""Fast JSON encoding of API responses with orjson."""
+
+from decimal import Decimal
+from typing import Any, Iterable, List, Optional, Sequence, Tuple, Type
+
+import orjson
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy import Column, Table
+
+# Datetimes in UTC end in "Z", as Pydantic writes them
+_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def encode_json(content: Any) -> bytes:
+    """Encode a response body.
+
+    Row dictionaries from rows_to_dicts encode directly; Pydantic models
+    are dumped first.
+
+    Args:
+        content: Models, row dictionaries or other JSON-compatible data
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    return orjson.dumps(content, default=_default, option=_OPTIONS)
+
+
+def response_columns(table: Table, model: Type[BaseModel]) -> List[Column]:
+    """Get the table columns backing the fields of a response schema.
+
+    Selecting these columns instead of ORM entities lets list routes encode
+    rows straight to JSON without building an object per row.
+
+    Args:
+        table: Table the rows come from
+        model: Response schema
+
+    Returns:
+        Columns named like the schema's fields, in field order
+    """
+    return [table.c[name] for name in model.model_fields if name in table.c]
+
+
+def parse_fields(
+    fields: Optional[str], model: Type[BaseModel]
+) -> Optional[Tuple[str, ...]]:
+    """Parse a comma-separated sparse fieldset against a response schema.
+
+    Args:
+        fields: Value of a fields= query parameter, e.g. "id,name,price"
+        model: Response schema the fields belong to
+
+    Returns:
+        Requested field names in schema order, or None for every field
+
+    Raises:
+        HTTPException: If a field is not part of the schema
+    """
+    if not fields:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(model.model_fields)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+        )
+    return tuple(name for name in model.model_fields if name in requested) or None
+
+
+def rows_to_dicts(
+    rows: Iterable, fields: Optional[Sequence[str]] = None, **extra: Any
+) -> List[dict]:
+    """Convert row mappings to dictionaries.
+
+    Args:
+        rows: Row mappings
+        fields: Keys to keep (defaults to every column)
+        extra: Constant fields added to each dictionary
+
+    Returns:
+        List of dictionaries
+    """
+    if fields is None:
+        return [{**row, **extra} for row in rows]
+    return [{**{name: row[name] for name in fields}, **extra} for row in rows]
@@ -0,0 +1,425 @@
+"""
+Backtesting of arbitrage rules over recorded multi-exchange quotes.
+
+Recorded quotes are aligned into a dense tape of (symbol, exchange, step)
+bid/ask arrays. Each configuration is evaluated with the engine's own
+spread rule: a signal at one step is filled at the quotes seen ``latency_ms``
+later, with slippage applied against the trade. Parameter grids are spread
+over a process pool; the tape is placed in shared memory once and attached
+by every worker instead of being pickled per task.
+"""
+
+import itertools
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from arbitrage_engine.engine import ArbitrageEngine, spread_after_fees
+from arbitrage_engine.history import HistoryStore
+
+logger = logging.getLogger(__name__)
+
+# Quotes closer together than this are treated as one step of the tape
+DEFAULT_RESOLUTION_MS = 1000
+
+
+def default_taker_fees() -> Dict[str, float]:
+    """Get the taker fee of every exchange the engine monitors."""
+    engine = ArbitrageEngine()
+    return {
+        name: connector.get_trading_fees()["taker"]
+        for name, connector in engine.exchanges.items()
+    }
+
+
+@dataclass(frozen=True)
+class BacktestConfig:
+    """One set of rule parameters to evaluate."""
+
+    min_spread_threshold: float = 0.5  # Net profit percentage to trade at
+    position_size_usd: float = 10000.0
+    latency_ms: int = 0  # Delay between signal and fill
+    slippage_bps: float = 0.0  # Adverse price move on each leg
+    fee_multiplier: float = 1.0  # Scales every exchange's taker fee
+    fee_overrides: Dict[str, float] = field(default_factory=dict)
+    best_only: bool = True  # Trade only the best pair per symbol and step
+
+
+@dataclass
+class BacktestResult:
+    """Outcome of replaying the tape with one configuration."""
+
+    config: BacktestConfig
+    signals: int = 0
+    trades: int = 0  # Signals whose fill fell within the tape
+    hits: int = 0  # Trades with positive realized net profit
+    pnl_usd: float = 0.0
+    avg_net_profit_pct: float = 0.0
+    max_drawdown_usd: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of trades that were profitable."""
+        return self.hits / self.trades if self.trades else 0.0
+
+    def to_dict(self) -> Dict:
+        """Convert the result to a JSON-ready dictionary."""
+        data = asdict(self)
+        data["hit_rate"] = self.hit_rate
+        return data
+
+
+class QuoteTape:
+    """Aligned bid/ask arrays for every symbol and exchange.
+
+    ``bid`` and ``ask`` have shape (symbols, exchanges, steps) and are
+    forward-filled, so each step holds the latest known quote. Missing
+    quotes are NaN and never produce a signal.
+    """
+
+    def __init__(
+        self,
+        symbols: List[str],
+        exchanges: List[str],
+        timestamps: np.ndarray,
+        bid: np.ndarray,
+        ask: np.ndarray,
+    ):
+        """Initialize the tape.
+
+        Args:
+            symbols: Symbol for each row of the price arrays
+            exchanges: Exchange for each column of the price arrays
+            timestamps: Step times in milliseconds, ascending
+            bid: Bid prices, shape (symbols, exchanges, steps)
+            ask: Ask prices, shape (symbols, exchanges, steps)
+        """
+        self.symbols = symbols
+        self.exchanges = exchanges
+        self.timestamps = timestamps
+        self.bid = bid
+        self.ask = ask
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @classmethod
+    def from_quotes(
+        cls,
+        timestamps: np.ndarray,
+        symbols: np.ndarray,
+        exchanges: np.ndarray,
+        bid: np.ndarray,
+        ask: np.ndarray,
+        resolution_ms: int = DEFAULT_RESOLUTION_MS,
+    ) -> "QuoteTape":
+        """Build a tape from individual quote rows.
+
+        Args:
+            timestamps: Quote times in milliseconds
+            symbols: Symbol of each quote
+            exchanges: Exchange of each quote
+            bid: Bid of each quote
+            ask: Ask of each quote
+            resolution_ms: Quotes in the same window share a step
+
+        Returns:
+            The aligned tape
+        """
+        symbol_names, symbol_idx = np.unique(symbols, return_inverse=True)
+        exchange_names, exchange_idx = np.unique(exchanges, return_inverse=True)
+        buckets = np.asarray(timestamps, dtype=np.int64) // resolution_ms
+        steps, step_idx = np.unique(buckets, return_inverse=True)
+
+        shape = (len(symbol_names), len(exchange_names), len(steps))
+        bid_grid = np.full(shape, np.nan)
+        ask_grid = np.full(shape, np.nan)
+
+        # Later quotes in a step win; zero prices mean the fetch failed
+        order = np.argsort(timestamps, kind="stable")
+        valid = (np.asarray(bid) > 0) & (np.asarray(ask) > 0)
+        order = order[valid[order]]
+        bid_grid[symbol_idx[order], exchange_idx[order], step_idx[order]] = bid[order]
+        ask_grid[symbol_idx[order], exchange_idx[order], step_idx[order]] = ask[order]
+
+        _forward_fill(bid_grid)
+        _forward_fill(ask_grid)
+
+        return cls(
+            [str(name) for name in symbol_names],
+            [str(name) for name in exchange_names],
+            steps * resolution_ms,
+            bid_grid,
+            ask_grid,
+        )
+
+    @classmethod
+    def from_history(
+        cls,
+        store: HistoryStore,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        symbol: Optional[str] = None,
+        resolution_ms: int = DEFAULT_RESOLUTION_MS,
+    ) -> "QuoteTape":
+        """Build a tape from the quotes in a history store.
+
+        Args:
+            store: History store the poller records to
+            start: Inclusive start time in milliseconds
+            end: Exclusive end time in milliseconds
+            symbol: Only quotes for this trading pair
+            resolution_ms: Quotes in the same window share a step
+
+        Returns:
+            The aligned tape
+        """
+        quotes = store.query("quotes", symbol=symbol, start=start, end=end)
+        return cls.from_quotes(
+            quotes["timestamp"],
+            quotes["symbol"],
+            quotes["exchange"],
+            quotes["bid"],
+            quotes["ask"],
+            resolution_ms=resolution_ms,
+        )
+
+
+def _forward_fill(grid: np.ndarray):
+    """Carry the last non-NaN value forward along the step axis in place."""
+    steps = np.arange(grid.shape[-1])
+    last = np.where(np.isnan(grid), 0, steps)
+    np.maximum.accumulate(last, axis=-1, out=last)
+    filled = np.take_along_axis(grid, last, axis=-1)
+    grid[...] = filled
+
+
+def run_backtest(
+    tape: QuoteTape,
+    config: BacktestConfig,
+    taker_fees: Optional[Dict[str, float]] = None,
+) -> BacktestResult:
+    """Replay the tape with one configuration.
+
+    Args:
+        tape: Aligned quotes to replay
+        config: Rule parameters
+        taker_fees: Base taker fee per exchange (engine fees by default)
+
+    Returns:
+        The backtest result
+    """
+    fees = dict(taker_fees if taker_fees is not None else default_taker_fees())
+    fees.update(config.fee_overrides)
+    fee = np.array(
+        [fees.get(name, 0.0) * config.fee_multiplier for name in tape.exchanges]
+    )
+
+    n_exchanges, n_steps = len(tape.exchanges), len(tape)
+    slippage = config.slippage_bps / 10000
+    # Step at which a signal is filled, or n_steps if it falls off the tape
+    fill_step = np.searchsorted(tape.timestamps, tape.timestamps + config.latency_ms)
+
+    buy_idx, sell_idx = np.nonzero(~np.eye(n_exchanges, dtype=bool))
+    result = BacktestResult(config=config)
+    step_pnl = np.zeros(n_steps)
+    realized_total = 0.0
+
+    for s in range(len(tape.symbols)):
+        ask, bid = tape.ask[s], tape.bid[s]
+
+        # Signal rule on quoted prices, as in ArbitrageEngine.find_opportunities
+        with np.errstate(invalid="ignore"):
+            _, net = spread_after_fees(
+                ask[buy_idx], bid[sell_idx], fee[buy_idx, None], fee[sell_idx, None]
+            )
+        net = np.where(np.isnan(net), -np.inf, net)
+
+        if config.best_only:
+            best = np.argmax(net, axis=0)
+            steps = np.nonzero(
+                net[best, np.arange(n_steps)] >= config.min_spread_threshold
+            )[0]
+            pairs = best[steps]
+        else:
+            pairs, steps = np.nonzero(net >= config.min_spread_threshold)
+
+        result.signals += len(steps)
+
+        fills = fill_step[steps]
+        on_tape = fills < n_steps
+        steps, pairs, fills = steps[on_tape], pairs[on_tape], fills[on_tape]
+
+        buy, sell = buy_idx[pairs], sell_idx[pairs]
+        buy_fill = ask[buy, fills] * (1 + slippage)
+        sell_fill = bid[sell, fills] * (1 - slippage)
+        _, realized = spread_after_fees(buy_fill, sell_fill, fee[buy], fee[sell])
+
+        pnl = realized / 100 * config.position_size_usd
+        np.add.at(step_pnl, fills, pnl)
+
+        result.trades += len(realized)
+        result.hits += int(np.count_nonzero(realized > 0))
+        realized_total += float(realized.sum())
+
+    equity = np.cumsum(step_pnl)
+    result.pnl_usd = float(equity[-1]) if n_steps else 0.0
+    if n_steps:
+        result.max_drawdown_usd = float(
+            np.max(np.maximum.accumulate(np.maximum(equity, 0)) - equity)
+        )
+    result.avg_net_profit_pct = realized_total / result.trades if result.trades else 0.0
+    return result
+
+
+# Tape attached by pool workers from shared memory
+_worker_tape: Optional[QuoteTape] = None
+_worker_fees: Optional[Dict[str, float]] = None
+_worker_segments: List[shared_memory.SharedMemory] = []
+
+
+def _attach_worker(
+    symbols: List[str],
+    exchanges: List[str],
+    arrays: Dict[str, tuple],
+    taker_fees: Dict[str, float],
+):
+    """Pool initializer: map the shared tape arrays into this process."""
+    global _worker_tape, _worker_fees
+    views = {}
+    for name, (shm_name, shape, dtype) in arrays.items():
+        segment = shared_memory.SharedMemory(name=shm_name)
+        _worker_segments.append(segment)
+        views[name] = np.ndarray(shape, dtype=dtype, buffer=segment.buf)
+    _worker_tape = QuoteTape(
+        symbols, exchanges, views["timestamps"], views["bid"], views["ask"]
+    )
+    _worker_fees = taker_fees
+
+
+def _run_worker(config: BacktestConfig) -> BacktestResult:
+    return run_backtest(_worker_tape, config, _worker_fees)
+
+
+def run_grid(
+    tape: QuoteTape,
+    configs: Sequence[BacktestConfig],
+    processes: Optional[int] = None,
+    taker_fees: Optional[Dict[str, float]] = None,
+) -> List[BacktestResult]:
+    """Evaluate many configurations, in parallel when worthwhile.
+
+    Args:
+        tape: Aligned quotes to replay
+        configs: Configurations to evaluate
+        processes: Worker processes (CPU count by default; 1 runs inline)
+        taker_fees: Base taker fee per exchange (engine fees by default)
+
+    Returns:
+        Results in the same order as configs
+    """
+    fees = taker_fees if taker_fees is not None else default_taker_fees()
+    processes = processes or os.cpu_count() or 1
+    processes = min(processes, len(configs))
+    if processes <= 1:
+        return [run_backtest(tape, config, fees) for config in configs]
+
+    segments = []
+    arrays = {}
+    try:
+        for name in ("timestamps", "bid", "ask"):
+            source = np.ascontiguousarray(getattr(tape, name))
+            segment = shared_memory.SharedMemory(
+                create=True, size=max(source.nbytes, 1)
+            )
+            segments.append(segment)
+            np.ndarray(source.shape, dtype=source.dtype, buffer=segment.buf)[...] = (
+                source
+            )
+            arrays[name] = (segment.name, source.shape, source.dtype.str)
+
+        with ProcessPoolExecutor(
+            max_workers=processes,
+            initializer=_attach_worker,
+            initargs=(tape.symbols, tape.exchanges, arrays, fees),
+        ) as pool:
+            chunksize = max(1, len(configs) // (processes * 4))
+            return list(pool.map(_run_worker, configs, chunksize=chunksize))
+    finally:
+        for segment in segments:
+            segment.close()
+            segment.unlink()
+
+
+def parameter_grid(**axes: Sequence) -> List[BacktestConfig]:
+    """Build the cartesian product of parameter values.
+
+    Args:
+        **axes: BacktestConfig field names mapped to the values to try
+
+    Returns:
+        One configuration per combination
+    """
+    names = list(axes)
+    return [
+        BacktestConfig(**dict(zip(names, values)))
+        for values in itertools.product(*(axes[name] for name in names))
+    ]
+
+
+def _parse_floats(value: str) -> List[float]:
+    return [float(item) for item in value.split(",") if item]
+
+
+def main():
+    """Main entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Backtest arbitrage rules")
+    parser.add_argument(
+        "--history-dir",
+        default=os.getenv("HISTORY_DIR"),
+        help="Directory of the opportunity history store (default: HISTORY_DIR)",
+    )
+    parser.add_argument("--start", type=int, help="Start time in milliseconds")
+    parser.add_argument("--end", type=int, help="End time in milliseconds")
+    parser.add_argument("--symbol", help="Only replay this trading pair")
+    parser.add_argument("--thresholds", default="0.5", help="Comma-separated")
+    parser.add_argument("--position-sizes", default="10000", help="Comma-separated")
+    parser.add_argument("--latencies-ms", default="0", help="Comma-separated")
+    parser.add_argument("--slippage-bps", default="0", help="Comma-separated")
+    parser.add_argument("--fee-multipliers", default="1", help="Comma-separated")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--top", type=int, default=20, help="Results to print")
+
+    args = parser.parse_args()
+    if not args.history_dir:
+        parser.error("--history-dir or HISTORY_DIR is required")
+
+    tape = QuoteTape.from_history(
+        HistoryStore(args.history_dir), args.start, args.end, args.symbol
+    )
+    configs = parameter_grid(
+        min_spread_threshold=_parse_floats(args.thresholds),
+        position_size_usd=_parse_floats(args.position_sizes),
+        latency_ms=[int(v) for v in _parse_floats(args.latencies_ms)],
+        slippage_bps=_parse_floats(args.slippage_bps),
+        fee_multiplier=_parse_floats(args.fee_multipliers),
+    )
+    logger.info(f"Replaying {len(tape)} steps with {len(configs)} configurations")
+
+    results = run_grid(tape, configs, processes=args.processes)
+    results.sort(key=lambda result: result.pnl_usd, reverse=True)
+    for result in results[: args.top]:
+        print(json.dumps(result.to_dict()))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -13,6 +13,7 @@ from arbitrage_engine.exchanges.coinbase import CoinbaseConnector
 from arbitrage_engine.exchanges.kucoin import KucoinConnector
 from arbitrage_engine.exchanges.kraken import KrakenConnector
 from arbitrage_engine.exchanges.bybit import BybitConnector
+from arbitrage_engine.simulator import MarketSimulator, SimulatedConnector
 
 logger = logging.getLogger(__name__)
 
@@ -33,14 +34,38 @@ class ArbitrageOpportunity:
     timestamp: int
 
 
+def spread_after_fees(buy_price, sell_price, buy_taker_fee, sell_taker_fee):
+    """Calculate spread percentage and net profit after taker fees.
+
+    Works element-wise on numpy arrays as well as on floats, so the
+    backtester applies exactly the same rule as the live engine.
+
+    Args:
+        buy_price: Price to buy at
+        sell_price: Price to sell at
+        buy_taker_fee: Taker fee of the buy exchange as a fraction
+        sell_taker_fee: Taker fee of the sell exchange as a fraction
+
+    Returns:
+        Tuple of (spread_pct, net_profit_pct)
+    """
+    spread_pct = (sell_price - buy_price) / buy_price * 100
+    net_profit_pct = spread_pct - (buy_taker_fee + sell_taker_fee) * 100
+    return spread_pct, net_profit_pct
+
+
 class ArbitrageEngine:
     """Main arbitrage detection engine."""
 
-    def __init__(self, demo_mode: bool = False):
+    def __init__(
+        self, demo_mode: bool = False, simulator: Optional[MarketSimulator] = None
+    ):
         """Initialize arbitrage engine.
 
         Args:
-            demo_mode: If True, use mocked data for demonstration
+            demo_mode: If True, detect opportunities in a simulated market
+            simulator: Market simulator to read prices from; created from
+                SIM_* environment variables in demo mode if not given
         """
         self.demo_mode = demo_mode
         self.exchanges = {
@@ -60,6 +85,22 @@ class ArbitrageEngine:
             "XRP/USDT",
         ]
 
+        if demo_mode and simulator is None:
+            simulator = MarketSimulator.from_env(exchanges=list(self.exchanges))
+
+        # Route price reads through the simulator, keeping real fee schedules
+        self.simulator = simulator
+        if simulator is not None:
+            self.exchanges = {
+                name: SimulatedConnector(connector, simulator)
+                for name, connector in self.exchanges.items()
+                if name in simulator.exchanges
+            }
+            self.watched_symbols = list(simulator.symbols)
+
+        # Tickers from the latest scan, by symbol then exchange
+        self.last_quotes: Dict[str, Dict[str, Dict]] = {}
+
         # Minimum spread threshold to consider (in percentage)
         self.min_spread_threshold = 0.5
 
@@ -68,7 +109,7 @@ class ArbitrageEngine:
         self.cache_ttl = 10  # seconds
 
     def get_demo_data(self) -> List[ArbitrageOpportunity]:
-        """Generate mock arbitrage data for demo mode.
+        """Generate fixed sample arbitrage data.
 
         Returns:
             List of mock arbitrage opportunities
@@ -179,21 +220,72 @@ class ArbitrageEngine:
         Returns:
             Tuple of (spread_pct, net_profit_pct)
         """
-        # Calculate raw spread
-        spread = sell_price - buy_price
-        spread_pct = (spread / buy_price) * 100
-
         # Get trading fees
         buy_fees = self.exchanges[buy_exchange].get_trading_fees()
         sell_fees = self.exchanges[sell_exchange].get_trading_fees()
 
-        # Calculate total fees (using taker fees as worst case)
-        total_fee_pct = (buy_fees["taker"] + sell_fees["taker"]) * 100
+        # Using taker fees as worst case
+        return spread_after_fees(
+            buy_price, sell_price, buy_fees["taker"], sell_fees["taker"]
+        )
+
+    def scan_symbol(
+        self, symbol: str, timestamp: Optional[int] = None
+    ) -> Tuple[List[ArbitrageOpportunity], Dict[str, Dict]]:
+        """Find arbitrage opportunities for one symbol.
 
-        # Net profit after fees
-        net_profit_pct = spread_pct - total_fee_pct
+        Args:
+            symbol: Trading pair symbol
+            timestamp: Opportunity timestamp in milliseconds (defaults to now)
 
-        return spread_pct, net_profit_pct
+        Returns:
+            Tuple of (opportunities, tickers by exchange)
+        """
+        if timestamp is None:
+            timestamp = int(time.time() * 1000)
+
+        opportunities = []
+        prices = self.fetch_prices(symbol)
+
+        if len(prices) < 2:
+            return opportunities, prices
+
+        # Check every ordered pair so both directions are considered
+        exchange_names = list(prices.keys())
+
+        for buy_exchange in exchange_names:
+            for sell_exchange in exchange_names:
+                if buy_exchange == sell_exchange:
+                    continue
+
+                buy_price = prices[buy_exchange].get("ask", 0)
+                sell_price = prices[sell_exchange].get("bid", 0)
+
+                if buy_price == 0 or sell_price == 0:
+                    continue
+
+                spread_pct, net_profit_pct = self.calculate_spread(
+                    buy_price, sell_price, buy_exchange, sell_exchange
+                )
+
+                # Check if spread meets threshold
+                if net_profit_pct >= self.min_spread_threshold:
+                    opportunity = ArbitrageOpportunity(
+                        symbol=symbol,
+                        buy_exchange=buy_exchange,
+                        sell_exchange=sell_exchange,
+                        buy_price=buy_price,
+                        sell_price=sell_price,
+                        spread_pct=spread_pct,
+                        net_profit_pct=net_profit_pct,
+                        estimated_profit_usd=net_profit_pct
+                        * 100,  # Assuming $10k position
+                        volume_24h=0.0,  # Would need to fetch from exchange
+                        timestamp=timestamp,
+                    )
+                    opportunities.append(opportunity)
+
+        return opportunities, prices
 
     def find_opportunities(self) -> List[ArbitrageOpportunity]:
         """Find arbitrage opportunities across all exchanges.
@@ -201,52 +293,17 @@ class ArbitrageEngine:
         Returns:
             List of arbitrage opportunities
         """
-        if self.demo_mode:
-            return self.get_demo_data()
-
         opportunities = []
+        quotes = {}
         timestamp = int(time.time() * 1000)
 
         for symbol in self.watched_symbols:
-            prices = self.fetch_prices(symbol)
-
-            if len(prices) < 2:
-                continue
-
-            # Find best buy and sell prices
-            exchange_names = list(prices.keys())
-
-            for i, buy_exchange in enumerate(exchange_names):
-                for sell_exchange in exchange_names[i + 1 :]:
-                    buy_price = prices[buy_exchange].get("ask", 0)
-                    sell_price = prices[sell_exchange].get("bid", 0)
-
-                    if buy_price == 0 or sell_price == 0:
-                        continue
-
-                    spread_pct, net_profit_pct = self.calculate_spread(
-                        buy_price, sell_price, buy_exchange, sell_exchange
-                    )
-
-                    # Check if spread meets threshold
-                    if net_profit_pct >= self.min_spread_threshold:
-                        opportunity = ArbitrageOpportunity(
-                            symbol=symbol,
-                            buy_exchange=buy_exchange,
-                            sell_exchange=sell_exchange,
-                            buy_price=buy_price,
-                            sell_price=sell_price,
-                            spread_pct=spread_pct,
-                            net_profit_pct=net_profit_pct,
-                            estimated_profit_usd=net_profit_pct
-                            * 100,  # Assuming $10k position
-                            volume_24h=0.0,  # Would need to fetch from exchange
-                            timestamp=timestamp,
-                        )
-                        opportunities.append(opportunity)
+            symbol_opportunities, quotes[symbol] = self.scan_symbol(symbol, timestamp)
+            opportunities.extend(symbol_opportunities)
 
         # Sort by net profit percentage
         opportunities.sort(key=lambda x: x.net_profit_pct, reverse=True)
+        self.last_quotes = quotes
 
         return opportunities
 
@@ -261,4 +318,5 @@ class ArbitrageEngine:
             "symbols_watched": len(self.watched_symbols),
             "min_spread_threshold": self.min_spread_threshold,
             "demo_mode": self.demo_mode,
+            "simulated": self.simulator is not None,
         }
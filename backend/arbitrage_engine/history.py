@@ -0,0 +1,594 @@
+"""
+Append-only columnar history of opportunities and exchange quotes.
+
+Rows are buffered in memory and written as immutable segments. Each segment
+is a directory holding one ``.npy`` file per column, sorted by timestamp, so
+readers memory-map only the columns they need. A JSON manifest records every
+segment with its row count and min/max timestamp; time-range queries skip
+segments outside the range without opening them. Strings (symbols and
+exchange names) are stored as integer codes from a shared dictionary.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from arbitrage_engine.engine import ArbitrageOpportunity
+
+logger = logging.getLogger(__name__)
+
+# Column names and dtypes per table; timestamp is always the sort column
+TABLES: Dict[str, Dict[str, str]] = {
+    "opportunities": {
+        "timestamp": "int64",
+        "symbol": "int32",
+        "buy_exchange": "int32",
+        "sell_exchange": "int32",
+        "buy_price": "float64",
+        "sell_price": "float64",
+        "spread_pct": "float64",
+        "net_profit_pct": "float64",
+        "estimated_profit_usd": "float64",
+    },
+    "quotes": {
+        "timestamp": "int64",
+        "symbol": "int32",
+        "exchange": "int32",
+        "bid": "float64",
+        "ask": "float64",
+    },
+}
+
+# Columns holding dictionary codes
+STRING_COLUMNS = {"symbol", "buy_exchange", "sell_exchange", "exchange"}
+
+# Default value column summarized by aggregate()
+DEFAULT_VALUES = {"opportunities": "net_profit_pct", "quotes": "bid"}
+
+# Default grouping columns of aggregate()
+DEFAULT_GROUP_BY = {
+    "opportunities": ("symbol", "buy_exchange", "sell_exchange"),
+    "quotes": ("symbol", "exchange"),
+}
+
+DEFAULT_SEGMENT_ROWS = 100_000
+
+# Oldest buffered row age in seconds that triggers a segment write
+DEFAULT_MAX_BUFFER_SECONDS = 60.0
+
+# Memory-mapped segment columns kept open per store
+DEFAULT_MAX_MAPPED_COLUMNS = 256
+
+MANIFEST_FILE = "manifest.json"
+DICTIONARY_FILE = "dictionary.json"
+
+
+def _write_json(path: str, data):
+    # Write then rename so readers never see a partial file
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+class HistoryStore:
+    """Append-only, segmented columnar store for opportunity history.
+
+    One process writes; any number of processes may read the same directory.
+    Readers pick up new segments when the manifest changes on disk.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        segment_rows: int = DEFAULT_SEGMENT_ROWS,
+        max_buffer_seconds: Optional[float] = DEFAULT_MAX_BUFFER_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+        max_mapped_columns: int = DEFAULT_MAX_MAPPED_COLUMNS,
+    ):
+        """Open or create a history store.
+
+        Args:
+            path: Directory holding the store
+            segment_rows: Buffered rows per table that trigger a segment write
+            max_buffer_seconds: Age of the oldest buffered row that triggers a
+                segment write, so other processes see quiet tables too
+                (None to write only when segment_rows is reached)
+            clock: Monotonic time source for buffer ages
+            max_mapped_columns: Segment column files kept memory-mapped; the
+                least recently read are closed first
+        """
+        self.path = path
+        self.segment_rows = segment_rows
+        self.max_buffer_seconds = max_buffer_seconds
+        self.clock = clock
+        os.makedirs(os.path.join(path, "segments"), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._buffers: Dict[str, Dict[str, list]] = {
+            table: {column: [] for column in columns}
+            for table, columns in TABLES.items()
+        }
+        # When the oldest row still in each buffer was recorded
+        self._buffered_since: Dict[str, Optional[float]] = dict.fromkeys(TABLES)
+        self._segments: List[Dict] = []
+        self._strings: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self._manifest_mtime: Optional[float] = None
+        self.max_mapped_columns = max_mapped_columns
+        # Segment columns are read outside _lock, so the LRU has its own
+        self._mapped_lock = threading.Lock()
+        self._mapped: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self._reload()
+
+    @classmethod
+    def from_env(cls) -> Optional["HistoryStore"]:
+        """Open the store configured by HISTORY_DIR, if any."""
+        path = os.getenv("HISTORY_DIR")
+        if not path:
+            return None
+        return cls(path)
+
+    # Dictionary and manifest
+
+    def _reload(self):
+        """Reload the manifest and dictionary if another process changed them."""
+        manifest_path = os.path.join(self.path, MANIFEST_FILE)
+        try:
+            mtime = os.stat(manifest_path).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime == self._manifest_mtime:
+            return
+
+        with open(manifest_path) as f:
+            segments = json.load(f)["segments"]
+        # The dictionary is written before the manifest, so it covers every
+        # code referenced by the segments just read
+        with open(os.path.join(self.path, DICTIONARY_FILE)) as f:
+            strings = json.load(f)
+
+        if len(strings) > len(self._strings):
+            for value in strings[len(self._strings) :]:
+                self._codes[value] = len(self._strings)
+                self._strings.append(value)
+        self._segments = segments
+        self._manifest_mtime = mtime
+
+        # Close mappings of segments no longer in the manifest
+        names = {segment["name"] for segment in segments}
+        with self._mapped_lock:
+            for key in [key for key in self._mapped if key[0] not in names]:
+                del self._mapped[key]
+
+    def _encode(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self._strings)
+            self._codes[value] = code
+            self._strings.append(value)
+        return code
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """Convert dictionary codes back to strings.
+
+        Args:
+            codes: Array of dictionary codes
+
+        Returns:
+            Object array of strings
+        """
+        strings = np.array(self._strings, dtype=object)
+        return strings[codes] if len(codes) else np.array([], dtype=object)
+
+    # Writing
+
+    def record(
+        self,
+        opportunities: Sequence[ArbitrageOpportunity],
+        quotes: Optional[Dict[str, Dict[str, Dict]]] = None,
+        timestamp: Optional[int] = None,
+    ):
+        """Append one poll cycle.
+
+        Args:
+            opportunities: Opportunities found in the cycle
+            quotes: Tickers by symbol then exchange, as fetched by the engine
+            timestamp: Cycle time in milliseconds for quotes without their own
+        """
+        if timestamp is None:
+            timestamp = int(time.time() * 1000)
+
+        with self._lock:
+            rows = self._buffers["opportunities"]
+            for opp in opportunities:
+                rows["timestamp"].append(opp.timestamp or timestamp)
+                rows["symbol"].append(self._encode(opp.symbol))
+                rows["buy_exchange"].append(self._encode(opp.buy_exchange))
+                rows["sell_exchange"].append(self._encode(opp.sell_exchange))
+                rows["buy_price"].append(opp.buy_price)
+                rows["sell_price"].append(opp.sell_price)
+                rows["spread_pct"].append(opp.spread_pct)
+                rows["net_profit_pct"].append(opp.net_profit_pct)
+                rows["estimated_profit_usd"].append(opp.estimated_profit_usd)
+
+            rows = self._buffers["quotes"]
+            for symbol, tickers in (quotes or {}).items():
+                for exchange, ticker in tickers.items():
+                    rows["timestamp"].append(ticker.get("timestamp") or timestamp)
+                    rows["symbol"].append(self._encode(symbol))
+                    rows["exchange"].append(self._encode(exchange))
+                    rows["bid"].append(float(ticker.get("bid") or 0.0))
+                    rows["ask"].append(float(ticker.get("ask") or 0.0))
+
+            now = self.clock()
+            for table, rows in self._buffers.items():
+                if not rows["timestamp"]:
+                    continue
+                since = self._buffered_since[table]
+                if since is None:
+                    self._buffered_since[table] = since = now
+                if len(rows["timestamp"]) >= self.segment_rows or (
+                    self.max_buffer_seconds is not None
+                    and now - since >= self.max_buffer_seconds
+                ):
+                    self._write_segment(table)
+
+    def flush(self):
+        """Write all buffered rows as new segments."""
+        with self._lock:
+            for table in TABLES:
+                self._write_segment(table)
+
+    def _write_segment(self, table: str):
+        buffer = self._buffers[table]
+        rows = len(buffer["timestamp"])
+        if rows == 0:
+            return
+
+        columns = {
+            name: np.asarray(values, dtype=TABLES[table][name])
+            for name, values in buffer.items()
+        }
+        order = np.argsort(columns["timestamp"], kind="stable")
+        columns = {name: values[order] for name, values in columns.items()}
+
+        name = f"{table}-{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}"
+        final_dir = os.path.join(self.path, "segments", name)
+        tmp_dir = f"{final_dir}.tmp"
+        os.makedirs(tmp_dir)
+        for column, values in columns.items():
+            np.save(os.path.join(tmp_dir, f"{column}.npy"), values)
+        os.rename(tmp_dir, final_dir)
+
+        self._segments.append(
+            {
+                "name": name,
+                "table": table,
+                "rows": rows,
+                "min_timestamp": int(columns["timestamp"][0]),
+                "max_timestamp": int(columns["timestamp"][-1]),
+            }
+        )
+        _write_json(os.path.join(self.path, DICTIONARY_FILE), self._strings)
+        _write_json(
+            os.path.join(self.path, MANIFEST_FILE), {"segments": self._segments}
+        )
+        self._manifest_mtime = os.stat(
+            os.path.join(self.path, MANIFEST_FILE)
+        ).st_mtime_ns
+
+        for values in buffer.values():
+            values.clear()
+        self._buffered_since[table] = None
+
+        logger.debug(f"Wrote history segment {name} ({rows} rows)")
+
+    # Reading
+
+    def _column(self, segment: Dict, column: str) -> np.ndarray:
+        key = (segment["name"], column)
+        with self._mapped_lock:
+            values = self._mapped.get(key)
+            if values is not None:
+                self._mapped.move_to_end(key)
+                return values
+
+        values = np.load(
+            os.path.join(self.path, "segments", segment["name"], f"{column}.npy"),
+            mmap_mode="r",
+        )
+        with self._mapped_lock:
+            self._mapped[key] = values
+            while len(self._mapped) > self.max_mapped_columns:
+                # Arrays still referenced by callers keep their mapping open
+                self._mapped.popitem(last=False)
+        return values
+
+    def _buffered_columns(self, table: str) -> Dict[str, np.ndarray]:
+        columns = {
+            name: np.asarray(values, dtype=TABLES[table][name])
+            for name, values in self._buffers[table].items()
+        }
+        order = np.argsort(columns["timestamp"], kind="stable")
+        return {name: values[order] for name, values in columns.items()}
+
+    def _filter_codes(self, table: str, **filters: Optional[str]) -> Dict:
+        codes = {}
+        for name, value in filters.items():
+            if value is None:
+                continue
+            if name == "exchange" and table == "opportunities":
+                # Either side of the trade
+                codes[name] = self._codes.get(value, -1)
+            elif name in TABLES[table]:
+                codes[name] = self._codes.get(value, -1)
+            else:
+                raise ValueError(f"Unknown filter for {table}: {name}")
+        return codes
+
+    def scan(
+        self,
+        table: str = "opportunities",
+        columns: Optional[Sequence[str]] = None,
+        symbol: Optional[str] = None,
+        exchange: Optional[str] = None,
+        buy_exchange: Optional[str] = None,
+        sell_exchange: Optional[str] = None,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> Iterator[Dict[str, np.ndarray]]:
+        """Iterate over matching rows one segment at a time.
+
+        Only segments overlapping the time range are opened, and only the
+        requested columns are read, so memory use is bounded by a segment.
+
+        Args:
+            table: "opportunities" or "quotes"
+            columns: Columns to return (all columns if None)
+            symbol: Only rows for this trading pair
+            exchange: Only rows on this exchange (either side for opportunities)
+            buy_exchange: Only opportunities buying on this exchange
+            sell_exchange: Only opportunities selling on this exchange
+            start: Inclusive start time in milliseconds
+            end: Exclusive end time in milliseconds
+
+        Yields:
+            Dictionaries of column arrays with dictionary codes left encoded
+
+        Raises:
+            ValueError: If the table, a column or a filter is unknown
+        """
+        if table not in TABLES:
+            raise ValueError(f"Unknown history table: {table}")
+        columns = list(columns or TABLES[table])
+        for column in columns:
+            if column not in TABLES[table]:
+                raise ValueError(f"Unknown column for {table}: {column}")
+
+        with self._lock:
+            self._reload()
+            codes = self._filter_codes(
+                table,
+                symbol=symbol,
+                exchange=exchange,
+                buy_exchange=buy_exchange,
+                sell_exchange=sell_exchange,
+            )
+            segments = [
+                segment
+                for segment in self._segments
+                if segment["table"] == table
+                and (start is None or segment["max_timestamp"] >= start)
+                and (end is None or segment["min_timestamp"] < end)
+            ]
+            buffered = self._buffered_columns(table)
+
+        sources = [(segment, None) for segment in segments] + [(None, buffered)]
+        for segment, data in sources:
+            if data is None:
+
+                def read(column, segment=segment):
+                    return self._column(segment, column)
+
+            else:
+                if len(data["timestamp"]) == 0:
+                    continue
+
+                def read(column, data=data):
+                    return data[column]
+
+            timestamps = read("timestamp")
+            lo = 0 if start is None else int(np.searchsorted(timestamps, start, "left"))
+            hi = (
+                len(timestamps)
+                if end is None
+                else int(np.searchsorted(timestamps, end, "left"))
+            )
+            if lo >= hi:
+                continue
+
+            mask = None
+            for name, code in codes.items():
+                if name == "exchange" and table == "opportunities":
+                    match = (read("buy_exchange")[lo:hi] == code) | (
+                        read("sell_exchange")[lo:hi] == code
+                    )
+                else:
+                    match = read(name)[lo:hi] == code
+                mask = match if mask is None else mask & match
+
+            chunk = {}
+            for column in columns:
+                values = read(column)[lo:hi]
+                chunk[column] = np.asarray(values[mask] if mask is not None else values)
+            if len(chunk[columns[0]]):
+                yield chunk
+
+    def query(
+        self, table: str = "opportunities", decode: bool = True, **filters
+    ) -> Dict[str, np.ndarray]:
+        """Get all matching rows as column arrays.
+
+        Args:
+            table: "opportunities" or "quotes"
+            decode: Convert symbol and exchange codes to strings
+            **filters: Column selection and filters accepted by scan()
+
+        Returns:
+            Dictionary of column arrays sorted by timestamp within segments
+        """
+        columns = list(filters.get("columns") or TABLES[table])
+        chunks = list(self.scan(table, **filters))
+        result = {
+            column: (
+                np.concatenate([chunk[column] for chunk in chunks])
+                if chunks
+                else np.array([], dtype=TABLES[table][column])
+            )
+            for column in columns
+        }
+        if decode:
+            for column in STRING_COLUMNS.intersection(result):
+                result[column] = self.decode(result[column])
+        return result
+
+    def aggregate(
+        self,
+        table: str = "opportunities",
+        group_by: Optional[Sequence[str]] = None,
+        value: Optional[str] = None,
+        bucket_ms: Optional[int] = None,
+        **filters,
+    ) -> List[Dict]:
+        """Summarize matching rows per group without loading them all.
+
+        Args:
+            table: "opportunities" or "quotes"
+            group_by: Columns to group on (symbol and exchange pair for
+                opportunities, symbol and exchange for quotes by default)
+            value: Numeric column to summarize (net_profit_pct for
+                opportunities, bid for quotes by default)
+            bucket_ms: Also group by time buckets of this many milliseconds
+            **filters: Filters accepted by scan()
+
+        Returns:
+            List of groups with count, mean, min, max, first_seen and
+            last_seen, ordered by time bucket then group
+
+        Raises:
+            ValueError: If a column or filter is unknown
+        """
+        if table not in TABLES:
+            raise ValueError(f"Unknown history table: {table}")
+        value = value or DEFAULT_VALUES[table]
+        group_by = list(DEFAULT_GROUP_BY[table] if group_by is None else group_by)
+        for column in group_by + [value]:
+            if column not in TABLES[table]:
+                raise ValueError(f"Unknown column for {table}: {column}")
+
+        columns = list(dict.fromkeys(group_by + [value, "timestamp"]))
+        groups: Dict[Tuple, List] = {}
+
+        for chunk in self.scan(table, columns=columns, **filters):
+            keys = [chunk[column].astype(np.int64) for column in group_by]
+            if bucket_ms:
+                keys.append(chunk["timestamp"] // bucket_ms * bucket_ms)
+            if keys:
+                unique, inverse = np.unique(
+                    np.stack(keys, axis=1), axis=0, return_inverse=True
+                )
+                inverse = inverse.reshape(-1)
+            else:
+                unique = np.zeros((1, 0), dtype=np.int64)
+                inverse = np.zeros(len(chunk[value]), dtype=np.int64)
+
+            n = len(unique)
+            values = chunk[value]
+            timestamps = chunk["timestamp"]
+            counts = np.bincount(inverse, minlength=n)
+            sums = np.bincount(inverse, weights=values, minlength=n)
+            mins = np.full(n, np.inf)
+            maxs = np.full(n, -np.inf)
+            np.minimum.at(mins, inverse, values)
+            np.maximum.at(maxs, inverse, values)
+            first = np.full(n, np.iinfo(np.int64).max)
+            last = np.full(n, np.iinfo(np.int64).min)
+            np.minimum.at(first, inverse, timestamps)
+            np.maximum.at(last, inverse, timestamps)
+
+            for i, key in enumerate(map(tuple, unique.tolist())):
+                stats = groups.get(key)
+                if stats is None:
+                    groups[key] = [
+                        int(counts[i]),
+                        float(sums[i]),
+                        float(mins[i]),
+                        float(maxs[i]),
+                        int(first[i]),
+                        int(last[i]),
+                    ]
+                else:
+                    stats[0] += int(counts[i])
+                    stats[1] += float(sums[i])
+                    stats[2] = min(stats[2], float(mins[i]))
+                    stats[3] = max(stats[3], float(maxs[i]))
+                    stats[4] = min(stats[4], int(first[i]))
+                    stats[5] = max(stats[5], int(last[i]))
+
+        results = []
+        for key in groups:
+            count, total, low, high, first_seen, last_seen = groups[key]
+            row = {
+                column: (self._strings[key[i]] if column in STRING_COLUMNS else key[i])
+                for i, column in enumerate(group_by)
+            }
+            if bucket_ms:
+                row["bucket"] = key[-1]
+            row.update(
+                {
+                    "count": count,
+                    "mean": total / count,
+                    "min": low,
+                    "max": high,
+                    "first_seen": first_seen,
+                    "last_seen": last_seen,
+                }
+            )
+            results.append(row)
+
+        results.sort(key=lambda row: [row[column] for column in group_by])
+        if bucket_ms:
+            results.sort(key=lambda row: row["bucket"])
+        return results
+
+    def get_statistics(self) -> Dict:
+        """Get store statistics.
+
+        Returns:
+            Dictionary with statistics
+        """
+        with self._lock:
+            self._reload()
+            stats = {}
+            for table in TABLES:
+                segments = [s for s in self._segments if s["table"] == table]
+                stats[table] = {
+                    "segments": len(segments),
+                    "rows": sum(s["rows"] for s in segments),
+                    "buffered_rows": len(self._buffers[table]["timestamp"]),
+                    "min_timestamp": min(
+                        (s["min_timestamp"] for s in segments), default=None
+                    ),
+                    "max_timestamp": max(
+                        (s["max_timestamp"] for s in segments), default=None
+                    ),
+                }
+            return stats
@@ -0,0 +1,200 @@
+"""
+Indexed filtering and keyset pagination over a set of opportunities.
+"""
+
+import base64
+import binascii
+import json
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from arbitrage_engine.engine import ArbitrageOpportunity
+
+if TYPE_CHECKING:
+    from arbitrage_engine.runner import CoalescingEngineRunner
+    from arbitrage_engine.snapshot import SnapshotStore
+
+# Default and maximum page sizes for filtered queries
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def _sort_key(opp: ArbitrageOpportunity) -> Tuple[float, str, str, str]:
+    # Highest net profit first; ties broken by a stable identity
+    return (-opp.net_profit_pct, opp.symbol, opp.buy_exchange, opp.sell_exchange)
+
+
+def encode_cursor(opp: ArbitrageOpportunity) -> str:
+    """Encode the position after an opportunity as an opaque cursor."""
+    raw = json.dumps(list(_sort_key(opp))).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str, str, str]:
+    """Decode a cursor produced by encode_cursor.
+
+    Raises:
+        InvalidCursor: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        neg_profit, symbol, buy_exchange, sell_exchange = json.loads(
+            base64.urlsafe_b64decode(padded.encode("ascii"))
+        )
+        return (float(neg_profit), str(symbol), str(buy_exchange), str(sell_exchange))
+    except (ValueError, TypeError, binascii.Error, UnicodeEncodeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+
+
+class OpportunityIndex:
+    """Read-only index over one set of opportunities.
+
+    Opportunities are kept sorted by net profit (descending). Per-symbol,
+    per-exchange and per-(symbol, exchange) posting lists hold ascending
+    positions into that order, so a filtered page is found with a few
+    binary searches and costs O(log n + page size).
+    """
+
+    def __init__(self, opportunities: List[ArbitrageOpportunity]):
+        """Build the index.
+
+        Args:
+            opportunities: Opportunities to index
+        """
+        self.opportunities = sorted(opportunities, key=_sort_key)
+        self._keys = [_sort_key(opp) for opp in self.opportunities]
+        self._neg_profits = [key[0] for key in self._keys]
+
+        self.by_symbol: Dict[str, List[int]] = {}
+        self.by_exchange: Dict[str, List[int]] = {}
+        self.by_symbol_exchange: Dict[Tuple[str, str], List[int]] = {}
+
+        for position, opp in enumerate(self.opportunities):
+            self.by_symbol.setdefault(opp.symbol, []).append(position)
+            for exchange in {opp.buy_exchange, opp.sell_exchange}:
+                self.by_exchange.setdefault(exchange, []).append(position)
+                self.by_symbol_exchange.setdefault((opp.symbol, exchange), []).append(
+                    position
+                )
+
+    def __len__(self) -> int:
+        return len(self.opportunities)
+
+    def query(
+        self,
+        symbol: Optional[str] = None,
+        exchange: Optional[str] = None,
+        min_net_profit: Optional[float] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[ArbitrageOpportunity], Optional[str]]:
+        """Get a filtered page of opportunities.
+
+        Args:
+            symbol: Only opportunities for this trading pair
+            exchange: Only opportunities buying or selling on this exchange
+            min_net_profit: Minimum net profit percentage
+            limit: Maximum number of results (all matches if None)
+            cursor: Cursor returned by a previous page
+
+        Returns:
+            Tuple of (opportunities, next_cursor); next_cursor is None on the
+            last page
+
+        Raises:
+            InvalidCursor: If the cursor is malformed
+        """
+        start = 0
+        if cursor:
+            start = bisect_right(self._keys, decode_cursor(cursor))
+
+        end = len(self.opportunities)
+        if min_net_profit is not None:
+            end = bisect_right(self._neg_profits, -min_net_profit)
+
+        if symbol and exchange:
+            positions = self.by_symbol_exchange.get((symbol, exchange), [])
+        elif symbol:
+            positions = self.by_symbol.get(symbol, [])
+        elif exchange:
+            positions = self.by_exchange.get(exchange, [])
+        else:
+            positions = None
+
+        if positions is None:
+            lo, hi = start, max(start, end)
+        else:
+            lo, hi = bisect_left(positions, start), bisect_left(positions, end)
+
+        if limit is not None and hi - lo > limit:
+            hi = lo + limit
+            has_more = True
+        else:
+            has_more = False
+
+        if positions is None:
+            page = self.opportunities[lo:hi]
+        else:
+            page = [self.opportunities[position] for position in positions[lo:hi]]
+
+        next_cursor = encode_cursor(page[-1]) if has_more and page else None
+        return page, next_cursor
+
+
+@dataclass
+class OpportunityPage:
+    """A filtered page of current opportunities."""
+
+    opportunities: List[ArbitrageOpportunity] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    snapshot_version: Optional[int] = None
+
+
+async def query_opportunities(
+    store: "SnapshotStore",
+    runner: "CoalescingEngineRunner",
+    symbol: Optional[str] = None,
+    exchange: Optional[str] = None,
+    min_net_profit: Optional[float] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> OpportunityPage:
+    """Query the current opportunities through the snapshot index.
+
+    Uses the index of the latest fresh snapshot, and only runs the engine
+    when no fresh snapshot is available.
+
+    Args:
+        store: Opportunity snapshot store
+        runner: Runner used when the snapshot is missing or stale
+        symbol: Only opportunities for this trading pair
+        exchange: Only opportunities buying or selling on this exchange
+        min_net_profit: Minimum net profit percentage
+        limit: Maximum number of results
+        cursor: Cursor returned by a previous page
+
+    Returns:
+        The requested page
+
+    Raises:
+        InvalidCursor: If the cursor is malformed
+    """
+    snapshot = store.get_fresh()
+    if snapshot is not None:
+        index, version = snapshot.index, snapshot.version
+    else:
+        index, version = OpportunityIndex(await runner.find_opportunities()), None
+
+    opportunities, next_cursor = index.query(
+        symbol=symbol,
+        exchange=exchange,
+        min_net_profit=min_net_profit,
+        limit=limit,
+        cursor=cursor,
+    )
+    return OpportunityPage(opportunities, next_cursor, version)
@@ -2,11 +2,13 @@
 FastAPI router for arbitrage endpoints.
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
 from typing import List, Dict
 import logging
 
 from arbitrage_engine.engine import ArbitrageEngine, ArbitrageOpportunity
+from arbitrage_engine.runner import CoalescingEngineRunner
+from arbitrage_engine.snapshot import SnapshotStore, get_snapshot_store
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +16,8 @@ router = APIRouter(prefix="/api/arbitrage", tags=["arbitrage"])
 
 # Global engine instance
 _engine: ArbitrageEngine = None
+_runner: CoalescingEngineRunner = None
+_demo_runner: CoalescingEngineRunner = None
 
 
 def get_engine() -> ArbitrageEngine:
@@ -24,17 +28,43 @@ def get_engine() -> ArbitrageEngine:
     return _engine
 
 
+def get_runner() -> CoalescingEngineRunner:
+    """Get or create the runner that executes engine scans off the event loop."""
+    global _runner
+    if _runner is None:
+        _runner = CoalescingEngineRunner(get_engine())
+    return _runner
+
+
+def get_demo_runner() -> CoalescingEngineRunner:
+    """Get or create the runner for the shared simulated demo market."""
+    global _demo_runner
+    if _demo_runner is None:
+        _demo_runner = CoalescingEngineRunner(ArbitrageEngine(demo_mode=True))
+    return _demo_runner
+
+
 @router.get("/opportunities")
 async def get_opportunities(
-    engine: ArbitrageEngine = Depends(get_engine),
+    response: Response,
+    runner: CoalescingEngineRunner = Depends(get_runner),
+    store: SnapshotStore = Depends(get_snapshot_store),
 ) -> List[Dict]:
     """Get current arbitrage opportunities.
 
+    Serves the latest published snapshot, falling back to a local engine
+    run when it is missing or stale.
+
     Returns:
         List of arbitrage opportunities
     """
     try:
-        opportunities = engine.find_opportunities()
+        snapshot = store.get_fresh()
+        if snapshot is not None:
+            opportunities = snapshot.opportunities
+            response.headers["X-Snapshot-Version"] = str(snapshot.version)
+        else:
+            opportunities = await runner.find_opportunities()
         return [
             {
                 "symbol": opp.symbol,
@@ -66,14 +96,15 @@ async def get_statistics(engine: ArbitrageEngine = Depends(get_engine)) -> Dict:
 
 
 @router.get("/demo")
-async def get_demo_data() -> List[Dict]:
+async def get_demo_data(
+    runner: CoalescingEngineRunner = Depends(get_demo_runner),
+) -> List[Dict]:
     """Get demo arbitrage data (no authentication required).
 
     Returns:
-        List of demo arbitrage opportunities
+        List of demo arbitrage opportunities from the simulated market
     """
-    demo_engine = ArbitrageEngine(demo_mode=True)
-    opportunities = demo_engine.get_demo_data()
+    opportunities = await runner.find_opportunities()
 
     return [
         {
@@ -0,0 +1,77 @@
+"""
+Async, coalescing wrapper around the synchronous arbitrage engine.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from arbitrage_engine.engine import ArbitrageEngine, ArbitrageOpportunity
+
+logger = logging.getLogger(__name__)
+
+
+class CoalescingEngineRunner:
+    """Runs engine scans off the event loop and shares in-flight results.
+
+    ``ArbitrageEngine.find_opportunities`` is blocking and network bound, so
+    it runs on a dedicated thread pool. Callers that arrive while a scan is
+    already running await that scan instead of starting another one.
+    """
+
+    def __init__(self, engine: ArbitrageEngine, max_workers: int = 2):
+        """Initialize the runner.
+
+        Args:
+            engine: Engine to run scans with
+            max_workers: Threads reserved for engine scans
+        """
+        self.engine = engine
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="arbitrage-engine"
+        )
+        self._inflight: Optional[asyncio.Future] = None
+        self.computations = 0
+        self.coalesced = 0
+
+    async def find_opportunities(self) -> List[ArbitrageOpportunity]:
+        """Find opportunities without blocking the event loop.
+
+        Returns:
+            List of arbitrage opportunities
+        """
+        future = self._inflight
+        if future is None or future.done():
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(
+                self._executor, self.engine.find_opportunities
+            )
+            future.add_done_callback(self._clear_inflight)
+            self._inflight = future
+            self.computations += 1
+        else:
+            self.coalesced += 1
+
+        # Shield so one cancelled request does not cancel the shared scan
+        return await asyncio.shield(future)
+
+    def _clear_inflight(self, future: asyncio.Future):
+        if self._inflight is future:
+            self._inflight = None
+
+    def get_statistics(self) -> Dict:
+        """Get runner statistics.
+
+        Returns:
+            Dictionary with statistics
+        """
+        return {
+            "computations": self.computations,
+            "coalesced_requests": self.coalesced,
+            "in_flight": self._inflight is not None,
+        }
+
+    def shutdown(self):
+        """Shut down the engine thread pool."""
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,289 @@
+"""
+Synthetic multi-exchange market for demo mode and load testing.
+
+Prices follow a shared geometric random walk per symbol. Each exchange
+tracks that walk with its own mean-reverting deviation, so venues stay
+correlated, and spread events occasionally push one venue rich or cheap
+for a while. Simulated connectors expose these prices through the same
+interface as the real exchange connectors, so the engine runs its normal
+detection path against them.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Reference prices for the symbols the engine watches by default
+BASE_PRICES = {
+    "BTC/USDT": 43250.0,
+    "ETH/USDT": 2280.0,
+    "BNB/USDT": 315.0,
+    "SOL/USDT": 98.5,
+    "XRP/USDT": 0.6125,
+}
+
+DEFAULT_EXCHANGES = ["Binance", "Coinbase", "KuCoin", "Kraken", "Bybit"]
+
+# Upper bound on ticks applied in one catch-up, so a long idle period
+# does not stall the next caller
+MAX_CATCH_UP_TICKS = 1000
+
+
+@dataclass
+class SpreadEvent:
+    """A temporary price dislocation on one exchange for one symbol."""
+
+    symbol_index: int
+    exchange_index: int
+    offset: float  # Relative price offset, e.g. -0.02 for 2% cheap
+    remaining_ticks: int
+
+
+class MarketSimulator:
+    """Correlated random-walk prices across exchanges with spread events."""
+
+    def __init__(
+        self,
+        symbol_count: int = 5,
+        exchanges: Optional[List[str]] = None,
+        tick_rate: float = 10.0,
+        volatility: float = 0.0005,
+        venue_noise: float = 0.0002,
+        mean_reversion: float = 0.1,
+        half_spread: float = 0.0001,
+        event_rate: float = 0.02,
+        event_size: tuple = (0.015, 0.03),
+        event_duration: tuple = (20, 100),
+        min_active_events: int = 1,
+        seed: Optional[int] = None,
+    ):
+        """Initialize the simulator.
+
+        Args:
+            symbol_count: Number of symbols to simulate; the first ones reuse
+                the engine's default pairs, the rest are synthetic
+            exchanges: Exchange names to simulate
+            tick_rate: Price updates per second of wall-clock time
+            volatility: Per-tick standard deviation of the shared price walk
+            venue_noise: Per-tick standard deviation of each venue's deviation
+            mean_reversion: Fraction of a venue's deviation removed per tick
+            half_spread: Relative distance of bid and ask from the venue price
+            event_rate: Probability per tick of a new spread event
+            event_size: Range of relative offsets for spread events
+            event_duration: Range of spread event lengths in ticks
+            min_active_events: Spread events kept active at all times
+            seed: Random seed for reproducible runs
+        """
+        self.exchanges = list(exchanges or DEFAULT_EXCHANGES)
+        self.symbols = self._build_symbols(symbol_count)
+        self.tick_rate = tick_rate
+        self.volatility = volatility
+        self.venue_noise = venue_noise
+        self.mean_reversion = mean_reversion
+        self.half_spread = half_spread
+        self.event_rate = event_rate
+        self.event_size = event_size
+        self.event_duration = event_duration
+        self.min_active_events = min_active_events
+
+        self._rng = np.random.default_rng(seed)
+        self._symbol_index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self._exchange_index = {name: i for i, name in enumerate(self.exchanges)}
+
+        self._mid = np.array(
+            [
+                BASE_PRICES.get(symbol, self._synthetic_price(i))
+                for i, symbol in enumerate(self.symbols)
+            ]
+        )
+        self._deviation = np.zeros((len(self.symbols), len(self.exchanges)))
+        self._offsets = np.zeros_like(self._deviation)
+        self.events: List[SpreadEvent] = []
+
+        self.ticks = 0
+        self._last_advance = time.monotonic()
+        self._lock = threading.Lock()
+
+        self._ensure_min_events()
+        self._refresh_offsets()
+
+    @classmethod
+    def from_env(cls, **overrides) -> "MarketSimulator":
+        """Create a simulator configured from SIM_* environment variables.
+
+        Args:
+            **overrides: Constructor arguments that take precedence
+        """
+        seed = os.getenv("SIM_SEED")
+        options = {
+            "symbol_count": int(os.getenv("SIM_SYMBOL_COUNT", "5")),
+            "tick_rate": float(os.getenv("SIM_TICK_RATE", "10")),
+            "seed": int(seed) if seed else None,
+        }
+        options.update(overrides)
+        return cls(**options)
+
+    @staticmethod
+    def _build_symbols(count: int) -> List[str]:
+        symbols = list(BASE_PRICES)[:count]
+        for i in range(len(symbols), count):
+            symbols.append(f"SIM{i:04d}/USDT")
+        return symbols
+
+    def _synthetic_price(self, i: int) -> float:
+        # Spread synthetic symbols over several orders of magnitude
+        return float(10 ** (i % 6 - 1) * (1 + (i * 7919 % 100) / 100))
+
+    def step(self, ticks: int = 1):
+        """Advance the market by a number of ticks.
+
+        Args:
+            ticks: Number of ticks to apply
+        """
+        with self._lock:
+            self._step(ticks)
+
+    def _step(self, ticks: int):
+        shape = self._deviation.shape
+        for _ in range(ticks):
+            self._mid *= np.exp(self.volatility * self._rng.standard_normal(shape[0]))
+            self._deviation *= 1 - self.mean_reversion
+            self._deviation += self.venue_noise * self._rng.standard_normal(shape)
+
+            for event in self.events:
+                event.remaining_ticks -= 1
+            self.events = [event for event in self.events if event.remaining_ticks > 0]
+
+            if self._rng.random() < self.event_rate:
+                self._spawn_event()
+            self._ensure_min_events()
+            self.ticks += 1
+
+        self._refresh_offsets()
+
+    def _spawn_event(self):
+        low, high = self.event_size
+        magnitude = self._rng.uniform(low, high)
+        sign = -1.0 if self._rng.random() < 0.5 else 1.0
+        self.events.append(
+            SpreadEvent(
+                symbol_index=int(self._rng.integers(len(self.symbols))),
+                exchange_index=int(self._rng.integers(len(self.exchanges))),
+                offset=sign * magnitude,
+                remaining_ticks=int(self._rng.integers(*self.event_duration)),
+            )
+        )
+
+    def _ensure_min_events(self):
+        while len(self.events) < self.min_active_events:
+            self._spawn_event()
+
+    def _refresh_offsets(self):
+        self._offsets[:] = 0.0
+        for event in self.events:
+            self._offsets[event.symbol_index, event.exchange_index] += event.offset
+
+    def advance(self):
+        """Apply the ticks due since the last call based on tick_rate."""
+        with self._lock:
+            now = time.monotonic()
+            due = int((now - self._last_advance) * self.tick_rate)
+            if due <= 0:
+                return
+            self._last_advance += due / self.tick_rate
+            self._step(min(due, MAX_CATCH_UP_TICKS))
+
+    def get_ticker(self, exchange: str, symbol: str) -> Dict:
+        """Get the current ticker for a symbol on an exchange.
+
+        Args:
+            exchange: Exchange name
+            symbol: Trading pair symbol
+
+        Returns:
+            Dictionary with price data in the connector ticker format
+
+        Raises:
+            KeyError: If the exchange or symbol is not simulated
+        """
+        self.advance()
+        s = self._symbol_index[symbol]
+        e = self._exchange_index[exchange]
+
+        with self._lock:
+            price = float(
+                self._mid[s] * (1 + self._deviation[s, e] + self._offsets[s, e])
+            )
+
+        return {
+            "symbol": symbol,
+            "exchange": exchange,
+            "bid": price * (1 - self.half_spread),
+            "ask": price * (1 + self.half_spread),
+            "last": price,
+            "timestamp": int(time.time() * 1000),
+        }
+
+    def get_statistics(self) -> Dict:
+        """Get simulator statistics.
+
+        Returns:
+            Dictionary with statistics
+        """
+        return {
+            "symbols": len(self.symbols),
+            "exchanges": len(self.exchanges),
+            "tick_rate": self.tick_rate,
+            "ticks": self.ticks,
+            "active_spread_events": len(self.events),
+        }
+
+
+class SimulatedConnector:
+    """Exchange connector that serves simulated prices.
+
+    Fee and symbol handling are delegated to the real connector so the
+    engine's spread and fee calculations are unchanged.
+    """
+
+    def __init__(self, connector, simulator: MarketSimulator):
+        """Initialize the simulated connector.
+
+        Args:
+            connector: Real connector for the exchange being simulated
+            simulator: Market simulator providing prices
+        """
+        self.connector = connector
+        self.simulator = simulator
+        self.name = connector.name
+
+    def normalize_symbol(self, symbol: str) -> str:
+        """Normalize symbol to standard format."""
+        return self.connector.normalize_symbol(symbol)
+
+    def get_ticker(self, symbol: str) -> Dict:
+        """Get the simulated price ticker for a symbol."""
+        return self.simulator.get_ticker(self.name, symbol)
+
+    def get_orderbook(self, symbol: str, depth: int = 5) -> Dict:
+        """Get a single-level orderbook around the simulated price."""
+        ticker = self.get_ticker(symbol)
+        return {
+            "symbol": symbol,
+            "exchange": self.name,
+            "bids": [[ticker["bid"], 1.0]],
+            "asks": [[ticker["ask"], 1.0]],
+            "timestamp": ticker["timestamp"],
+        }
+
+    def get_trading_fees(self) -> Dict[str, float]:
+        """Get trading fee structure of the real exchange."""
+        return self.connector.get_trading_fees()
+
+    def get_withdrawal_fees(self) -> Dict[str, float]:
+        """Get withdrawal fee structure of the real exchange."""
+        return self.connector.get_withdrawal_fees()
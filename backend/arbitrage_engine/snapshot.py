@@ -0,0 +1,317 @@
+"""
+Versioned opportunity snapshots shared through Redis.
+
+The poller publishes the result of each cycle here so API workers can serve
+reads without repeating the exchange fan-out.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from functools import cached_property
+from typing import Any, Dict, List, Optional
+
+from arbitrage_engine.engine import ArbitrageOpportunity
+from arbitrage_engine.index import OpportunityIndex
+
+logger = logging.getLogger(__name__)
+
+# Snapshots older than this are considered stale by API readers
+DEFAULT_MAX_AGE_SECONDS = float(os.getenv("SNAPSHOT_MAX_AGE_SECONDS", "30"))
+
+
+@dataclass
+class OpportunitySnapshot:
+    """A published set of opportunities from one engine cycle."""
+
+    version: int
+    generated_at: int  # Timestamp in milliseconds
+    opportunities: List[ArbitrageOpportunity] = field(default_factory=list)
+
+    @cached_property
+    def index(self) -> OpportunityIndex:
+        """Index over this snapshot's opportunities, built on first use."""
+        return OpportunityIndex(self.opportunities)
+
+    def age_seconds(self) -> float:
+        """Get the snapshot age in seconds."""
+        return max(0.0, time.time() - self.generated_at / 1000)
+
+    def is_fresh(self, max_age: float = DEFAULT_MAX_AGE_SECONDS) -> bool:
+        """Check whether the snapshot is recent enough to serve.
+
+        Args:
+            max_age: Maximum age in seconds
+
+        Returns:
+            True if the snapshot is younger than max_age
+        """
+        return self.age_seconds() <= max_age
+
+    def to_json(self) -> str:
+        """Serialize the snapshot to JSON."""
+        return json.dumps(
+            {
+                "version": self.version,
+                "generated_at": self.generated_at,
+                "opportunities": [asdict(opp) for opp in self.opportunities],
+            }
+        )
+
+    @classmethod
+    def from_json(cls, payload: str) -> "OpportunitySnapshot":
+        """Deserialize a snapshot from JSON."""
+        data = json.loads(payload)
+        return cls(
+            version=data["version"],
+            generated_at=data["generated_at"],
+            opportunities=[
+                ArbitrageOpportunity(**opp) for opp in data.get("opportunities", [])
+            ],
+        )
+
+
+class InMemoryRedis:
+    """Minimal in-process stand-in for the Redis commands used here.
+
+    Used in tests and when ``REDIS_URL`` is not configured. Values are only
+    visible within the current process.
+    """
+
+    def __init__(self):
+        """Initialize the in-memory store."""
+        self._data: Dict[str, Any] = {}
+        self._expires: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _expire_key(self, name: str):
+        expires_at = self._expires.get(name)
+        if expires_at is not None and time.monotonic() >= expires_at:
+            self._data.pop(name, None)
+            self._expires.pop(name, None)
+
+    def get(self, name: str) -> Optional[Any]:
+        """Get the value of a key."""
+        with self._lock:
+            self._expire_key(name)
+            return self._data.get(name)
+
+    def mget(self, names: List[str]) -> List[Optional[Any]]:
+        """Get the values of several keys."""
+        return [self.get(name) for name in names]
+
+    def set(
+        self,
+        name: str,
+        value: Any,
+        ex: Optional[float] = None,
+        px: Optional[int] = None,
+        nx: bool = False,
+    ) -> Optional[bool]:
+        """Set the value of a key with optional expiry."""
+        with self._lock:
+            self._expire_key(name)
+            if nx and name in self._data:
+                return None
+            self._data[name] = value
+            if ex is not None:
+                self._expires[name] = time.monotonic() + ex
+            elif px is not None:
+                self._expires[name] = time.monotonic() + px / 1000
+            else:
+                self._expires.pop(name, None)
+            return True
+
+    def incr(self, name: str, amount: int = 1) -> int:
+        """Increment the integer value of a key."""
+        with self._lock:
+            self._expire_key(name)
+            value = int(self._data.get(name, 0)) + amount
+            self._data[name] = value
+            return value
+
+    def delete(self, *names: str) -> int:
+        """Delete one or more keys."""
+        with self._lock:
+            removed = 0
+            for name in names:
+                self._expire_key(name)
+                if self._data.pop(name, None) is not None:
+                    removed += 1
+                self._expires.pop(name, None)
+            return removed
+
+    def flushall(self):
+        """Remove all keys."""
+        with self._lock:
+            self._data.clear()
+            self._expires.clear()
+
+
+class SnapshotStore:
+    """Publishes and reads versioned opportunity snapshots."""
+
+    def __init__(self, client=None, key_prefix: str = "arbitrage:snapshot"):
+        """Initialize the snapshot store.
+
+        Args:
+            client: Redis client (defaults to an in-memory stand-in)
+            key_prefix: Prefix for the Redis keys used by the store
+        """
+        self.client = client if client is not None else InMemoryRedis()
+        self.key_prefix = key_prefix
+        self.key = f"{key_prefix}:latest"
+        self.version_key = f"{key_prefix}:version"
+        # Last decoded snapshot, reused while the published version is unchanged
+        self._cached: Optional[OpportunitySnapshot] = None
+
+    def publish(self, opportunities: List[ArbitrageOpportunity]) -> OpportunitySnapshot:
+        """Publish a new snapshot.
+
+        Args:
+            opportunities: Opportunities from the latest engine cycle
+
+        Returns:
+            The published snapshot
+        """
+        snapshot = OpportunitySnapshot(
+            version=int(self.client.incr(self.version_key)),
+            generated_at=int(time.time() * 1000),
+            opportunities=list(opportunities),
+        )
+        self.client.set(self.key, snapshot.to_json())
+        return snapshot
+
+    def partition_key(self, partition: int) -> str:
+        """Get the key of one partition's opportunities."""
+        return f"{self.key_prefix}:partition:{partition}"
+
+    def publish_partitions(
+        self,
+        partitions: Dict[int, List[ArbitrageOpportunity]],
+        partition_count: int,
+        max_age: float = DEFAULT_MAX_AGE_SECONDS,
+    ) -> OpportunitySnapshot:
+        """Publish some partitions and a snapshot merged from all of them.
+
+        Used by sharded pollers: each replica writes the partitions (shards)
+        it owns, then merges every partition into the latest snapshot.
+        Partitions expire after max_age, so shards whose replica stopped
+        publishing drop out of the merged snapshot.
+
+        Args:
+            partitions: Opportunities for each partition owned by the caller
+            partition_count: Total number of partitions
+            max_age: Seconds a partition is kept without being republished
+
+        Returns:
+            The published merged snapshot
+        """
+        generated_at = int(time.time() * 1000)
+        for partition, opportunities in partitions.items():
+            payload = OpportunitySnapshot(
+                version=0, generated_at=generated_at, opportunities=opportunities
+            ).to_json()
+            self.client.set(self.partition_key(partition), payload, ex=max_age)
+
+        payloads = self.client.mget(
+            [self.partition_key(partition) for partition in range(partition_count)]
+        )
+        merged: List[ArbitrageOpportunity] = []
+        for payload in payloads:
+            if payload is None:
+                continue
+            if isinstance(payload, bytes):
+                payload = payload.decode("utf-8")
+            merged.extend(OpportunitySnapshot.from_json(payload).opportunities)
+
+        merged.sort(key=lambda opp: opp.net_profit_pct, reverse=True)
+        return self.publish(merged)
+
+    def get_latest(self) -> Optional[OpportunitySnapshot]:
+        """Get the most recently published snapshot.
+
+        Only the version counter is read when the snapshot has not changed
+        since the last call, so the decoded snapshot and its index are reused.
+
+        Returns:
+            The latest snapshot, or None if none exists or Redis is unavailable
+        """
+        try:
+            version = self.client.get(self.version_key)
+            cached = self._cached
+            if (
+                cached is not None
+                and version is not None
+                and int(version) == cached.version
+            ):
+                return cached
+            payload = self.client.get(self.key)
+        except Exception as e:
+            logger.error(f"Error reading opportunity snapshot: {e}")
+            return None
+
+        if payload is None:
+            return None
+
+        if isinstance(payload, bytes):
+            payload = payload.decode("utf-8")
+
+        try:
+            snapshot = OpportunitySnapshot.from_json(payload)
+        except (ValueError, KeyError, TypeError) as e:
+            logger.error(f"Invalid opportunity snapshot: {e}")
+            return None
+
+        self._cached = snapshot
+        return snapshot
+
+    def get_fresh(
+        self, max_age: float = DEFAULT_MAX_AGE_SECONDS
+    ) -> Optional[OpportunitySnapshot]:
+        """Get the latest snapshot if it is not stale.
+
+        Args:
+            max_age: Maximum age in seconds
+
+        Returns:
+            The latest snapshot, or None if missing or stale
+        """
+        snapshot = self.get_latest()
+        if snapshot is None or not snapshot.is_fresh(max_age):
+            return None
+        return snapshot
+
+
+def create_redis_client(redis_url: Optional[str] = None):
+    """Create a Redis client for the given URL.
+
+    Args:
+        redis_url: Redis connection URL (defaults to REDIS_URL)
+
+    Returns:
+        A redis client, or an InMemoryRedis if no URL is configured
+    """
+    redis_url = redis_url or os.getenv("REDIS_URL")
+    if not redis_url:
+        logger.warning("REDIS_URL not set, using in-memory snapshot store")
+        return InMemoryRedis()
+
+    import redis
+
+    return redis.from_url(redis_url, decode_responses=True)
+
+
+# Global snapshot store instance
+_store: Optional[SnapshotStore] = None
+
+
+def get_snapshot_store() -> SnapshotStore:
+    """Get or create the snapshot store instance."""
+    global _store
+    if _store is None:
+        _store = SnapshotStore(create_redis_client())
+    return _store
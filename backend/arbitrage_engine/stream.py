@@ -0,0 +1,236 @@
+"""
+Fan-out of opportunity deltas to streaming clients.
+
+One background task watches the published snapshot (or runs the engine when
+there is none), diffs each new set of opportunities against the previous one
+and pushes only open/update/close changes to every subscriber.
+"""
+
+import asyncio
+import json
+import logging
+from dataclasses import asdict
+from typing import Callable, Dict, List, Optional, Set
+
+from arbitrage_engine.engine import ArbitrageOpportunity
+from arbitrage_engine.runner import CoalescingEngineRunner
+from arbitrage_engine.snapshot import SnapshotStore
+
+logger = logging.getLogger(__name__)
+
+# Fields ignored when deciding whether an opportunity changed
+_VOLATILE_FIELDS = {"timestamp"}
+
+
+def opportunity_key(opp: ArbitrageOpportunity) -> str:
+    """Get the identity of an opportunity across cycles."""
+    return f"{opp.symbol}|{opp.buy_exchange}|{opp.sell_exchange}"
+
+
+def _changed(old: ArbitrageOpportunity, new: ArbitrageOpportunity) -> bool:
+    old_data, new_data = asdict(old), asdict(new)
+    return any(
+        old_data[name] != new_data[name]
+        for name in old_data
+        if name not in _VOLATILE_FIELDS
+    )
+
+
+def diff_opportunities(
+    previous: Dict[str, ArbitrageOpportunity],
+    current: List[ArbitrageOpportunity],
+) -> List[Dict]:
+    """Compute the changes between two sets of opportunities.
+
+    Args:
+        previous: Opportunities from the last cycle keyed by opportunity_key
+        current: Opportunities from this cycle
+
+    Returns:
+        List of change dictionaries with type open, update or close
+    """
+    changes = []
+    seen = set()
+
+    for opp in current:
+        key = opportunity_key(opp)
+        seen.add(key)
+        old = previous.get(key)
+        if old is None:
+            changes.append({"type": "open", "key": key, "opportunity": opp})
+        elif _changed(old, opp):
+            changes.append({"type": "update", "key": key, "opportunity": opp})
+
+    for key in previous:
+        if key not in seen:
+            changes.append({"type": "close", "key": key, "opportunity": None})
+
+    return changes
+
+
+class Subscription:
+    """A single client's view of the broadcast."""
+
+    def __init__(self, max_queue: int):
+        """Initialize the subscription.
+
+        Args:
+            max_queue: Delta batches buffered before the client is dropped
+        """
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.dropped = False
+        self.snapshot: List[Dict] = []
+        self.version = 0
+
+
+class OpportunityBroadcaster:
+    """Computes opportunity deltas once and fans them out to subscribers."""
+
+    def __init__(
+        self,
+        store: SnapshotStore,
+        runner: CoalescingEngineRunner,
+        interval: float = 2.0,
+        max_queue: int = 32,
+        serializer: Callable[[ArbitrageOpportunity], Dict] = asdict,
+    ):
+        """Initialize the broadcaster.
+
+        Args:
+            store: Snapshot store published to by the poller
+            runner: Runner used when no fresh snapshot is available
+            interval: Seconds between checks for new opportunities
+            max_queue: Per-client queue size; clients that fall further
+                behind are disconnected
+            serializer: Converts opportunities to JSON-ready dictionaries
+        """
+        self.store = store
+        self.runner = runner
+        self.interval = interval
+        self.max_queue = max_queue
+        self.serializer = serializer
+
+        self.current: Dict[str, ArbitrageOpportunity] = {}
+        self.version = 0
+        self.subscribers: Set[Subscription] = set()
+        self.dropped_clients = 0
+        self._snapshot_version: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self) -> Subscription:
+        """Register a new client.
+
+        The subscription carries the current snapshot so the client can
+        apply subsequent deltas to it.
+
+        Returns:
+            The new subscription
+        """
+        subscription = Subscription(self.max_queue)
+        subscription.snapshot = [self.serializer(opp) for opp in self.current.values()]
+        subscription.version = self.version
+        self.subscribers.add(subscription)
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Remove a client."""
+        self.subscribers.discard(subscription)
+
+        if not self.subscribers and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def publish(self, opportunities: List[ArbitrageOpportunity]) -> List[Dict]:
+        """Diff a new set of opportunities and fan the changes out.
+
+        Args:
+            opportunities: Latest opportunities
+
+        Returns:
+            The serialized changes that were sent
+        """
+        changes = diff_opportunities(self.current, opportunities)
+        self.current = {opportunity_key(opp): opp for opp in opportunities}
+
+        if not changes:
+            return []
+
+        self.version += 1
+        batch = {
+            "version": self.version,
+            "changes": [
+                {
+                    "type": change["type"],
+                    "key": change["key"],
+                    "opportunity": (
+                        self.serializer(change["opportunity"])
+                        if change["opportunity"] is not None
+                        else None
+                    ),
+                }
+                for change in changes
+            ],
+        }
+
+        for subscription in list(self.subscribers):
+            try:
+                subscription.queue.put_nowait(batch)
+            except asyncio.QueueFull:
+                # Slow consumer: disconnect it so it resyncs from a snapshot
+                subscription.dropped = True
+                self.dropped_clients += 1
+                self.subscribers.discard(subscription)
+
+        return batch["changes"]
+
+    async def refresh(self):
+        """Pull the latest opportunities and publish any changes."""
+        snapshot = self.store.get_fresh()
+        if snapshot is not None:
+            if snapshot.version != self._snapshot_version:
+                self._snapshot_version = snapshot.version
+                self.publish(snapshot.opportunities)
+            return
+
+        self.publish(await self.runner.find_opportunities())
+
+    async def _run(self):
+        """Background loop feeding subscribers while any are connected."""
+        while self.subscribers:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error refreshing opportunity stream: {e}")
+            await asyncio.sleep(self.interval)
+
+    def get_statistics(self) -> Dict:
+        """Get broadcaster statistics.
+
+        Returns:
+            Dictionary with statistics
+        """
+        return {
+            "subscribers": len(self.subscribers),
+            "dropped_clients": self.dropped_clients,
+            "version": self.version,
+            "open_opportunities": len(self.current),
+        }
+
+
+def format_sse(event: str, data: Dict) -> str:
+    """Format a server-sent event.
+
+    Args:
+        event: Event name
+        data: JSON-serializable payload
+
+    Returns:
+        The encoded event
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
@@ -7,6 +7,17 @@ import logging
 from typing import List, Dict, Optional, Any
 from datetime import datetime
 import json
+import sys
+
+# Add backend root to path for the arbitrage engine
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from arbitrage_engine.engine import ArbitrageEngine
+from arbitrage_engine.index import query_opportunities
+from arbitrage_engine.runner import CoalescingEngineRunner
+from arbitrage_engine.snapshot import get_snapshot_store
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +30,7 @@ class ChatService:
         self.api_key = os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             logger.warning("OPENAI_API_KEY not set, chat features will be limited")
+        self._arbitrage_runner: Optional[CoalescingEngineRunner] = None
 
     async def create_message(
         self,
@@ -117,17 +129,31 @@ class ChatService:
         """Look up arbitrage opportunities."""
         symbol = params.get("symbol", "BTC/USDT")
 
-        # This would call the arbitrage engine
+        if self._arbitrage_runner is None:
+            demo_mode = os.getenv("DEMO_MODE", "false").lower() == "true"
+            self._arbitrage_runner = CoalescingEngineRunner(
+                ArbitrageEngine(demo_mode=demo_mode)
+            )
+
+        page = await query_opportunities(
+            get_snapshot_store(),
+            self._arbitrage_runner,
+            symbol=symbol,
+            min_net_profit=params.get("min_profit_pct", 0.5),
+            limit=params.get("limit", 10),
+        )
+
         return {
             "tool": "arbitrage_lookup",
             "symbol": symbol,
             "opportunities": [
                 {
-                    "buy_exchange": "Binance",
-                    "sell_exchange": "Coinbase",
-                    "spread_pct": 0.45,
-                    "net_profit_pct": 0.25,
+                    "buy_exchange": opp.buy_exchange,
+                    "sell_exchange": opp.sell_exchange,
+                    "spread_pct": round(opp.spread_pct, 2),
+                    "net_profit_pct": round(opp.net_profit_pct, 2),
                 }
+                for opp in page.opportunities
             ],
         }
 
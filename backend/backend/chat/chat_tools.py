@@ -23,6 +23,11 @@ CHAT_TOOLS = [
                     "description": "Minimum profit percentage threshold",
                     "default": 0.5,
                 },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of opportunities to return",
+                    "default": 10,
+                },
             },
             "required": ["symbol"],
         },
@@ -2,7 +2,7 @@
 Arbitrage tools for MCP server.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import sys
 import os
 
@@ -12,14 +12,28 @@ sys.path.insert(
 )
 
 from arbitrage_engine.engine import ArbitrageEngine
+from arbitrage_engine.index import query_opportunities
+from arbitrage_engine.runner import CoalescingEngineRunner
+from arbitrage_engine.snapshot import SnapshotStore, get_snapshot_store
 
 
 class ArbitrageTools:
     """Tools for arbitrage analysis."""
 
-    def __init__(self):
-        """Initialize arbitrage tools."""
-        self.engine = ArbitrageEngine(demo_mode=False)
+    def __init__(
+        self,
+        store: Optional[SnapshotStore] = None,
+        runner: Optional[CoalescingEngineRunner] = None,
+    ):
+        """Initialize arbitrage tools.
+
+        Args:
+            store: Opportunity snapshot store (defaults to the shared store)
+            runner: Runner used when no fresh snapshot is available
+        """
+        self.runner = runner or CoalescingEngineRunner(ArbitrageEngine(demo_mode=False))
+        self.engine = self.runner.engine
+        self.store = store or get_snapshot_store()
 
     def get_schemas(self) -> List[Dict[str, Any]]:
         """Get tool schemas."""
@@ -34,11 +48,19 @@ class ArbitrageTools:
                             "type": "string",
                             "description": "Trading pair symbol (optional, finds all if not specified)",
                         },
+                        "exchange": {
+                            "type": "string",
+                            "description": "Only opportunities buying or selling on this exchange (optional)",
+                        },
                         "min_profit_pct": {
                             "type": "number",
                             "description": "Minimum profit percentage threshold",
                             "default": 0.5,
                         },
+                        "limit": {
+                            "type": "integer",
+                            "description": "Maximum number of opportunities to return (optional)",
+                        },
                     },
                 },
             },
@@ -62,18 +84,15 @@ class ArbitrageTools:
 
     async def _find_opportunities(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Find arbitrage opportunities."""
-        opportunities = self.engine.find_opportunities()
-
-        # Filter by symbol if provided
-        symbol = params.get("symbol")
-        if symbol:
-            opportunities = [opp for opp in opportunities if opp.symbol == symbol]
-
-        # Filter by minimum profit
-        min_profit = params.get("min_profit_pct", 0.5)
-        opportunities = [
-            opp for opp in opportunities if opp.net_profit_pct >= min_profit
-        ]
+        page = await query_opportunities(
+            self.store,
+            self.runner,
+            symbol=params.get("symbol"),
+            exchange=params.get("exchange"),
+            min_net_profit=params.get("min_profit_pct", 0.5),
+            limit=params.get("limit"),
+        )
+        opportunities = page.opportunities
 
         return {
             "opportunities": [
@@ -1,10 +1,30 @@
 """Database module for AlphaNest."""
 
-from .db import get_db, engine, SessionLocal, Base, init_db
-from .models import User, Subscription, Trade, NFTItem, MarketBooth
+from .db import (
+    get_db,
+    get_async_db,
+    get_async_engine,
+    get_async_session_factory,
+    get_async_read_db,
+    get_read_session_factory,
+    get_database_pool_statistics,
+    LazyAsyncSession,
+    engine,
+    SessionLocal,
+    Base,
+    init_db,
+)
+from .models import User, Subscription, Trade, NFTItem, NFTTransaction, MarketBooth
 
 __all__ = [
     "get_db",
+    "get_async_db",
+    "get_async_engine",
+    "get_async_session_factory",
+    "get_async_read_db",
+    "get_read_session_factory",
+    "get_database_pool_statistics",
+    "LazyAsyncSession",
     "engine",
     "SessionLocal",
     "Base",
@@ -13,5 +33,6 @@ __all__ = [
     "Subscription",
     "Trade",
     "NFTItem",
+    "NFTTransaction",
     "MarketBooth",
 ]
@@ -1,11 +1,22 @@
 """Database connection and session management."""
 
+import itertools
 import os
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import logging
 
+from .pool import get_pool_statistics, pool_options
+
 logger = logging.getLogger(__name__)
 
 # Get database URL from environment
@@ -18,16 +29,169 @@ DATABASE_URL = os.getenv(
     f"{os.getenv('DB_NAME', 'alphanest')}",
 )
 
+# Read replicas for read-only routes, comma separated
+DATABASE_REPLICA_URLS = [
+    url.strip()
+    for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",")
+    if url.strip()
+]
+
 # Create engine
 engine = create_engine(
     DATABASE_URL,
     pool_pre_ping=True,  # Verify connections before using
     echo=os.getenv("DEBUG", "false").lower() == "true",  # Log SQL in debug mode
+    **pool_options(DATABASE_URL),
 )
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async drivers used in place of the configured synchronous ones
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Get the async-driver equivalent of a database URL.
+
+    Args:
+        url: Database URL, e.g. postgresql://... or sqlite:///...
+
+    Returns:
+        The URL with an asyncio driver, e.g. postgresql+asyncpg://...
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend} URLs")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(
+        hide_password=False
+    )
+
+
+# Async URL; defaults to DATABASE_URL with an async driver. Resolved when the
+# async engine is created, so sync-only users (alembic, the worker) can run on
+# backends without an async driver
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+
+# Async engines and session factories, created on first use so importing the
+# module does not require the async driver
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+_replica_session_factories: Optional[List[async_sessionmaker]] = None
+_replica_cycle = None
+
+
+def _create_async_engine(url: str) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        pool_pre_ping=True,
+        echo=os.getenv("DEBUG", "false").lower() == "true",
+        **pool_options(url, is_async=True),
+    )
+
+
+def get_async_engine() -> AsyncEngine:
+    """Get or create the async engine instance.
+
+    Raises:
+        ValueError: If ASYNC_DATABASE_URL is unset and DATABASE_URL has no
+            known async driver
+    """
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = _create_async_engine(
+            ASYNC_DATABASE_URL or to_async_url(DATABASE_URL)
+        )
+    return _async_engine
+
+
+def get_async_session_factory() -> async_sessionmaker:
+    """Get or create the async session factory.
+
+    Objects are not expired on commit, since reloading them implicitly is
+    not possible with async I/O.
+    """
+    global _async_session_factory
+    if _async_session_factory is None:
+        _async_session_factory = async_sessionmaker(
+            get_async_engine(), autoflush=False, expire_on_commit=False
+        )
+    return _async_session_factory
+
+
+def get_replica_session_factories() -> List[async_sessionmaker]:
+    """Get or create a session factory per configured read replica."""
+    global _replica_session_factories, _replica_cycle
+    if _replica_session_factories is None:
+        _replica_session_factories = [
+            async_sessionmaker(
+                _create_async_engine(to_async_url(url)),
+                autoflush=False,
+                expire_on_commit=False,
+            )
+            for url in DATABASE_REPLICA_URLS
+        ]
+        _replica_cycle = itertools.cycle(_replica_session_factories)
+    return _replica_session_factories
+
+
+def get_read_session_factory() -> async_sessionmaker:
+    """Get the session factory for a read-only request.
+
+    Replicas are used in turn; without replicas this is the primary's
+    session factory.
+    """
+    if not get_replica_session_factories():
+        return get_async_session_factory()
+    return next(_replica_cycle)
+
+
+class LazyAsyncSession:
+    """Stand-in for an AsyncSession that creates it on first use.
+
+    Dependencies such as optional_api_key take a session but often return
+    without touching it. Deferring creation means those requests never
+    build a session, start the engine or check out a connection.
+    """
+
+    def __init__(self, create: Callable[[], AsyncSession]):
+        """Initialize the proxy.
+
+        Args:
+            create: Called once to create the real session
+        """
+        self._create = create
+        self._session: Optional[AsyncSession] = None
+
+    @property
+    def started(self) -> bool:
+        """Whether the real session has been created."""
+        return self._session is not None
+
+    def _get_session(self) -> AsyncSession:
+        if self._session is None:
+            self._session = self._create()
+        return self._session
+
+    def __getattr__(self, name: str):
+        return getattr(self._get_session(), name)
+
+    def __contains__(self, instance) -> bool:
+        return self._session is not None and instance in self._session
+
+    def __iter__(self):
+        return iter(self._session) if self._session is not None else iter(())
+
+    async def close(self):
+        """Close the real session, if one was created."""
+        if self._session is not None:
+            await self._session.close()
+
+
 # Create base class for models
 Base = declarative_base()
 
@@ -45,6 +209,52 @@ def get_db():
         db.close()
 
 
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Dependency for FastAPI routes to get an async database session.
+
+    The session is created on first use, so requests that never query do
+    not take a connection from the pool.
+
+    Yields:
+        Async database session that will be automatically closed after use
+    """
+    db = LazyAsyncSession(lambda: get_async_session_factory()())
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+async def get_async_read_db() -> AsyncIterator[AsyncSession]:
+    """Dependency for read-only routes to get a session on a read replica.
+
+    Replicas may lag the primary, so routes that must see a write made in
+    the same request flow should use get_async_db instead.
+
+    Yields:
+        Async database session that will be automatically closed after use
+    """
+    db = LazyAsyncSession(lambda: get_read_session_factory()())
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+def get_database_pool_statistics() -> Dict[str, Any]:
+    """Get pool statistics for every engine created so far.
+
+    Returns:
+        Dictionary with statistics per engine
+    """
+    data = {"sync": get_pool_statistics(engine)}
+    if _async_engine is not None:
+        data["async"] = get_pool_statistics(_async_engine)
+    for i, factory in enumerate(_replica_session_factories or ()):
+        data[f"replica_{i}"] = get_pool_statistics(factory.kw["bind"])
+    return data
+
+
 def init_db():
     """Initialize database - create all tables.
 
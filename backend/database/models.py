@@ -11,6 +11,7 @@ from sqlalchemy import (
     Text,
     JSON,
     BigInteger,
+    Index,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -30,7 +31,9 @@ class User(Base):
     username = Column(String(100), unique=True, nullable=False, index=True)
     hashed_password = Column(String(255), nullable=False)
     stripe_customer_id = Column(String(255), unique=True, nullable=True)
-    api_key = Column(String(255), unique=True, nullable=True, index=True)
+    # Only a SHA-256 of the API key is stored; the prefix identifies it to users
+    api_key_hash = Column(String(64), unique=True, nullable=True, index=True)
+    api_key_prefix = Column(String(16), nullable=True)
     avatar = Column(String(10), default="👤")
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -76,8 +79,9 @@ class Trade(Base):
     __tablename__ = "trades"
 
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    # Null for opportunities recorded by the poller rather than a user
     user_id = Column(
-        String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+        String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=True
     )
     pair = Column(String(50), nullable=False)
     buy_exchange = Column(String(100), nullable=False)
@@ -110,7 +114,7 @@ class MarketBooth(Base):
     layout = Column(String(50), default="grid")  # grid, gallery, terminal
 
     # Stats
-    popularity = Column(Integer, default=0)
+    popularity = Column(Integer, default=0, nullable=False)
     reputation = Column(Integer, default=0)
     total_sales = Column(Integer, default=0)
     total_volume = Column(Float, default=0.0)
@@ -121,6 +125,9 @@ class MarketBooth(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # Keyset pagination order of booth listings
+    __table_args__ = (Index("ix_market_booths_popularity_id", "popularity", "id"),)
+
     # Relationships
     user = relationship("User", back_populates="booth")
     listings = relationship(
@@ -156,12 +163,49 @@ class NFTItem(Base):
     favorites = Column(Integer, default=0)
     sales = Column(Integer, default=0)
 
-    # NFT attributes and transaction history as JSON
+    # NFT attributes as JSON
     nft_attributes = Column(JSON, default={})
-    transaction_history = Column(JSON, default=[])
 
     created_at = Column(BigInteger, nullable=False)  # Timestamp in milliseconds
 
+    # Keyset pagination order of NFT listings, overall and per booth
+    __table_args__ = (
+        Index("ix_nft_items_created_at_id", "created_at", "id"),
+        Index("ix_nft_items_booth_id_created_at_id", "booth_id", "created_at", "id"),
+    )
+
     # Relationships
     owner = relationship("User", back_populates="nfts")
     booth = relationship("MarketBooth", back_populates="listings")
+    # Append-only and unbounded: never loaded with the NFT, removed by the
+    # database's ON DELETE CASCADE
+    transactions = relationship(
+        "NFTTransaction",
+        back_populates="nft",
+        lazy="write_only",
+        passive_deletes=True,
+    )
+
+
+class NFTTransaction(Base):
+    """NFT mint, sale, trade or transfer record."""
+
+    __tablename__ = "nft_transactions"
+
+    id = Column(String(100), primary_key=True)
+    nft_id = Column(
+        String(50), ForeignKey("nft_items.id", ondelete="CASCADE"), nullable=False
+    )
+    type = Column(String(20), nullable=False)  # mint, sale, trade, transfer
+    from_address = Column(String(100), nullable=False)
+    to_address = Column(String(100), nullable=False)
+    price = Column(Float, nullable=True)
+    timestamp = Column(BigInteger, nullable=False)  # Timestamp in milliseconds
+
+    # History of one NFT, newest first, paged on (timestamp, id)
+    __table_args__ = (
+        Index("ix_nft_transactions_nft_id_timestamp", "nft_id", "timestamp", "id"),
+    )
+
+    # Relationships
+    nft = relationship("NFTItem", back_populates="transactions")
@@ -0,0 +1,155 @@
+"""Connection pool configuration and checkout statistics."""
+
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Pool sizing, shared by the sync, async and replica engines
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # Seconds
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # Seconds
+
+
+class PoolStatistics:
+    """Checkout counters for one connection pool."""
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.checkouts = 0
+        self.overflow_hits = 0  # Checkouts that opened a connection past pool_size
+        self.timeouts = 0  # Checkouts that gave up after pool_timeout
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._lock = threading.Lock()
+
+    def record_checkout(self, wait: float, overflowed: bool):
+        """Record a connection leaving the pool.
+
+        Args:
+            wait: Seconds spent obtaining the connection
+            overflowed: Whether an overflow connection was opened
+        """
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            if overflowed:
+                self.overflow_hits += 1
+
+    def record_timeout(self, wait: float):
+        """Record a checkout that timed out."""
+        with self._lock:
+            self.timeouts += 1
+            self.max_wait = max(self.max_wait, wait)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the statistics to a JSON-ready dictionary."""
+        return {
+            "checkouts": self.checkouts,
+            "overflow_hits": self.overflow_hits,
+            "timeouts": self.timeouts,
+            "wait": {
+                "total": self.total_wait,
+                "mean": self.total_wait / self.checkouts if self.checkouts else None,
+                "max": self.max_wait,
+            },
+        }
+
+
+class _TimedPoolMixin:
+    """Times how long each checkout waits for a connection."""
+
+    _statistics: Optional[PoolStatistics] = None
+
+    @property
+    def statistics(self) -> PoolStatistics:
+        if self._statistics is None:
+            self._statistics = PoolStatistics()
+        return self._statistics
+
+    def _do_get(self):
+        overflow = self._overflow
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.statistics.record_timeout(time.perf_counter() - started)
+            raise
+        self.statistics.record_checkout(
+            time.perf_counter() - started,
+            overflowed=self._overflow > max(overflow, 0),
+        )
+        return connection
+
+    def recreate(self):
+        # Keep the counters when the pool is replaced, e.g. on dispose()
+        pool = super().recreate()
+        pool._statistics = self.statistics
+        return pool
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    """QueuePool that keeps checkout statistics."""
+
+
+class TimedAsyncQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that keeps checkout statistics."""
+
+
+def pool_options(url: str, is_async: bool = False) -> Dict[str, Any]:
+    """Get the create_engine pool arguments for a database URL.
+
+    In-memory SQLite databases keep SQLAlchemy's default single-connection
+    pool, since each new connection would see an empty database.
+
+    Args:
+        url: Database URL
+        is_async: Whether the engine uses an asyncio driver
+
+    Returns:
+        Keyword arguments for create_engine or create_async_engine
+    """
+    parsed = make_url(url)
+    in_memory = parsed.database in (None, "", ":memory:")
+    if parsed.get_backend_name() == "sqlite" and in_memory:
+        return {}
+    return {
+        "poolclass": TimedAsyncQueuePool if is_async else TimedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_timeout": DB_POOL_TIMEOUT,
+    }
+
+
+def get_pool_statistics(engine) -> Dict[str, Any]:
+    """Get the occupancy and checkout statistics of an engine's pool.
+
+    Args:
+        engine: Engine or AsyncEngine
+
+    Returns:
+        Dictionary with statistics
+    """
+    pool = engine.pool
+    data: Dict[str, Any] = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        data.update(
+            {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": pool._max_overflow,
+                "timeout": pool.timeout(),
+            }
+        )
+    if isinstance(pool, _TimedPoolMixin):
+        data.update(pool.statistics.to_dict())
+    return data
@@ -1,5 +1,6 @@
 """Seed database with demo data."""
 
+import hashlib
 import sys
 import os
 from datetime import datetime
@@ -8,7 +9,14 @@ import uuid
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from database import SessionLocal, User, Subscription, MarketBooth, NFTItem
+from database import (
+    SessionLocal,
+    User,
+    Subscription,
+    MarketBooth,
+    NFTItem,
+    NFTTransaction,
+)
 from passlib.context import CryptContext
 
 # Password hashing
@@ -20,6 +28,11 @@ def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def hash_api_key(api_key: str) -> str:
+    """Hash an API key the way the API gateway looks it up."""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+
 def seed_demo_users(db):
     """Seed demo users."""
     demo_users_data = [
@@ -61,7 +74,8 @@ def seed_demo_users(db):
             email=user_data["email"],
             hashed_password=hash_password(user_data["password"]),
             avatar=user_data["avatar"],
-            api_key=user_data["api_key"],
+            api_key_hash=hash_api_key(user_data["api_key"]),
+            api_key_prefix=user_data["api_key"][:8],
             is_active=True,
         )
         db.add(user)
@@ -308,19 +322,19 @@ def seed_nft_items(db, users, booths):
                 favorites=0,
                 sales=0,
                 nft_attributes=template["metadata"],
-                transaction_history=[
-                    {
-                        "id": f"tx_{nft_id}",
-                        "nftId": nft_id,
-                        "type": "mint",
-                        "from": "0x0",
-                        "to": user.id,
-                        "timestamp": timestamp,
-                    }
-                ],
                 created_at=timestamp,
             )
             db.add(nft)
+            db.add(
+                NFTTransaction(
+                    id=f"tx_{nft_id}",
+                    nft_id=nft_id,
+                    type="mint",
+                    from_address="0x0",
+                    to_address=user.id,
+                    timestamp=timestamp,
+                )
+            )
             print(f"Created NFT: {nft.name} for {user.username}")
 
     db.commit()
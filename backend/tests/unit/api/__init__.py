@@ -0,0 +1 @@
+"""Init file for API route tests."""
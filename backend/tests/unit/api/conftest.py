@@ -0,0 +1,147 @@
+"""Shared fixtures for API route tests.
+
+Routes are called directly with an async session on a temporary SQLite
+file; a synchronous session on the same file seeds and checks data.
+``client`` sends requests through the application instead, so header and
+dependency wiring is exercised too. ``query_counter`` records the SQL statements routes issue so tests can
+assert that list endpoints do not run one query per row (N+1).
+"""
+
+import asyncio
+import sys
+import os
+from contextlib import contextmanager
+from typing import List
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add backend root to Python path
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+)
+
+from database import Base, get_async_db, get_async_read_db
+from api_gateway.utils import response_cache
+
+
+class QueryCounter:
+    """Records the SQL statements executed on an engine."""
+
+    def __init__(self, engine):
+        """Initialize the counter and start listening on the engine."""
+        self.engine = engine
+        self.statements: List[str] = []
+        event.listen(engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        """Number of statements recorded."""
+        return len(self.statements)
+
+    def reset(self):
+        """Forget recorded statements."""
+        self.statements.clear()
+
+    def close(self):
+        """Stop listening on the engine."""
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+    @contextmanager
+    def assert_max_queries(self, limit: int):
+        """Fail if the block runs more than limit statements."""
+        start = self.count
+        yield
+        executed = self.statements[start:]
+        assert (
+            len(executed) <= limit
+        ), f"Expected at most {limit} queries, got {len(executed)}:\n" + "\n".join(
+            executed
+        )
+
+
+@pytest.fixture
+def database_path(tmp_path):
+    """Create the test schema in a SQLite file shared by both engines."""
+    path = tmp_path / "test.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+    return path
+
+
+@pytest.fixture
+def db_engine(database_path):
+    """Create a synchronous engine for seeding and checking test data."""
+    engine = create_engine(
+        f"sqlite:///{database_path}", connect_args={"check_same_thread": False}
+    )
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db_session(db_engine):
+    """Create a synchronous session for seeding and checking test data."""
+    session = sessionmaker(autocommit=False, autoflush=False, bind=db_engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def async_db_engine(database_path):
+    """Create the async engine routes run against."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{database_path}")
+    yield engine
+    asyncio.run(engine.dispose())
+
+
+@pytest.fixture
+def async_db_session(async_db_engine):
+    """Create an async session to pass to routes."""
+    session = async_sessionmaker(
+        async_db_engine, autoflush=False, expire_on_commit=False
+    )()
+    yield session
+    asyncio.run(session.close())
+
+
+@pytest.fixture
+def query_counter(async_db_engine):
+    """Count the statements routes execute."""
+    counter = QueryCounter(async_db_engine.sync_engine)
+    yield counter
+    counter.close()
+
+
+@pytest.fixture(autouse=True)
+def fresh_response_cache(monkeypatch):
+    """Give every test its own response cache."""
+    cache = response_cache.ResponseCache()
+    monkeypatch.setattr(response_cache, "_response_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def client(async_db_engine):
+    """Create a test client for the application on the test database."""
+    from api_gateway.main import app
+
+    session_factory = async_sessionmaker(
+        async_db_engine, autoflush=False, expire_on_commit=False
+    )
+
+    async def test_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_async_db] = test_db
+    app.dependency_overrides[get_async_read_db] = test_db
+    yield TestClient(app)
+    app.dependency_overrides.clear()
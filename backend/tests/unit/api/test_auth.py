@@ -0,0 +1,313 @@
+"""Tests for request authentication helpers."""
+
+import asyncio
+import json
+import sys
+import os
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+# Add backend root to Python path
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+)
+
+from fastapi import HTTPException
+
+from database import User, MarketBooth
+from database import db as database_db
+from api_gateway import auth
+from api_gateway.routes import auth as auth_routes
+from api_gateway.routes import market
+from api_gateway.schemas.auth import UserCreate
+from api_gateway.utils.auth_utils import create_access_token, hash_api_key
+from api_gateway.utils.password_hasher import PasswordHasher
+
+
+@pytest.fixture(autouse=True)
+def empty_caches(monkeypatch):
+    """Start every test with empty authentication caches."""
+    monkeypatch.delenv("DEMO_MODE", raising=False)
+    auth.get_user_cache().clear()
+    auth.get_api_key_cache().clear()
+    yield
+    auth.get_user_cache().clear()
+    auth.get_api_key_cache().clear()
+
+
+def add_user(session, user_id="user-1", username="alice", api_key=None, **fields):
+    """Create a user with a booth."""
+    user = User(
+        id=user_id,
+        username=username,
+        email=f"{username}@example.com",
+        hashed_password="x",
+        api_key_hash=hash_api_key(api_key) if api_key else None,
+        **fields,
+    )
+    session.add_all([user, MarketBooth(id=f"booth-{user_id}", user_id=user_id)])
+    session.commit()
+    session.expunge_all()
+    return user
+
+
+def bearer(user_id: str) -> str:
+    """Build an Authorization header for a user."""
+    return f"Bearer {create_access_token(data={'sub': user_id})}"
+
+
+def test_token_user_is_cached(db_session, async_db_session, query_counter):
+    """Test that repeat token lookups skip the users query."""
+    add_user(db_session)
+    header = bearer("user-1")
+
+    async def scenario():
+        first = await auth.get_current_user_from_token(header, async_db_session)
+        async_db_session.expunge_all()
+        query_counter.reset()
+        with query_counter.assert_max_queries(0):
+            second = await auth.get_current_user_from_token(header, async_db_session)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first.username == second.username == "alice"
+    assert second in async_db_session
+
+
+def test_cached_user_can_be_modified(db_session, async_db_session):
+    """Test that a user served from the cache is attached to the session."""
+    add_user(db_session)
+    header = bearer("user-1")
+
+    async def scenario():
+        await auth.get_current_user_from_token(header, async_db_session)
+        async_db_session.expunge_all()
+        user = await auth.get_current_user_from_token(header, async_db_session)
+        user.avatar = "🦊"
+        await async_db_session.commit()
+
+    asyncio.run(scenario())
+
+    assert db_session.query(User).one().avatar == "🦊"
+    assert auth.get_user_cache().get("user-1") is None
+
+
+def test_change_elsewhere_evicts_user(db_session, async_db_session):
+    """Test that a change committed through another session evicts the user."""
+    add_user(db_session)
+    header = bearer("user-1")
+    asyncio.run(auth.get_current_user_from_token(header, async_db_session))
+
+    db_session.query(User).filter(User.id == "user-1").one().is_active = False
+    db_session.commit()
+
+    async_db_session.expunge_all()
+    user = asyncio.run(auth.get_current_user_from_token(header, async_db_session))
+    assert user.is_active is False
+
+
+def test_rolled_back_change_keeps_cache(db_session, async_db_session):
+    """Test that an aborted change does not evict the cached user."""
+    add_user(db_session)
+    header = bearer("user-1")
+
+    async def scenario():
+        user = await auth.get_current_user_from_token(header, async_db_session)
+        user.avatar = "🦊"
+        await async_db_session.flush()
+        await async_db_session.rollback()
+
+    asyncio.run(scenario())
+
+    assert auth.get_user_cache().get("user-1")["avatar"] == "👤"
+
+
+def test_invalid_or_unknown_token(async_db_session):
+    """Test that bad tokens and unknown users authenticate as nobody."""
+
+    def current_user(header):
+        return asyncio.run(auth.get_current_user_from_token(header, async_db_session))
+
+    assert current_user(None) is None
+    assert current_user("Bearer nonsense") is None
+    assert current_user(bearer("missing")) is None
+
+
+@pytest.fixture
+def verify_key(async_db_session):
+    """Run verify_api_key, returning the HTTP status of a rejection."""
+
+    def verify(api_key):
+        try:
+            asyncio.run(auth.verify_api_key(api_key, async_db_session))
+            return 200
+        except HTTPException as e:
+            return e.status_code
+
+    return verify
+
+
+def test_api_key_verification_is_cached(db_session, query_counter, verify_key):
+    """Test that repeat verifications of a key skip the database."""
+    add_user(db_session, api_key="ak_valid")
+
+    assert verify_key("ak_valid") == 200
+    with query_counter.assert_max_queries(0):
+        assert verify_key("ak_valid") == 200
+
+    assert "ak_valid" not in auth.get_api_key_cache()._entries
+    assert auth.get_api_key_cache().get(hash_api_key("ak_valid")) == ("user-1", True)
+
+
+def test_invalid_api_key_is_negatively_cached(
+    db_session, query_counter, monkeypatch, verify_key
+):
+    """Test that repeated invalid keys do not reach the database."""
+    add_user(db_session, api_key="ak_valid")
+
+    assert verify_key("ak_guess") == 403
+    with query_counter.assert_max_queries(0):
+        assert verify_key("ak_guess") == 403
+    assert verify_key(None) == 401
+
+    monkeypatch.setattr(auth, "API_KEY_NEGATIVE_TTL_SECONDS", 0)
+    auth.get_api_key_cache().clear()
+    assert verify_key("ak_other") == 403
+    with query_counter.assert_max_queries(1):
+        assert verify_key("ak_other") == 403
+
+
+def test_deactivation_evicts_api_key(db_session, verify_key):
+    """Test that deactivating a user rejects its cached key."""
+    add_user(db_session, api_key="ak_valid")
+    assert verify_key("ak_valid") == 200
+
+    user = db_session.query(User).one()
+    user.is_active = False
+    db_session.commit()
+
+    assert verify_key("ak_valid") == 403
+    assert auth.get_api_key_cache().get(hash_api_key("ak_valid")) == ("user-1", False)
+
+
+def test_rotation_evicts_old_key_and_negative_entry(db_session, client, verify_key):
+    """Test that a rotated key stops working and the new one works at once."""
+    add_user(db_session, api_key="ak_old")
+    assert verify_key("ak_old") == 200
+
+    response = client.post(
+        "/api/auth/api-key", headers={"Authorization": bearer("user-1")}
+    )
+
+    assert response.status_code == 200
+    rotated = response.json()
+    assert rotated["api_key_prefix"] == rotated["api_key"][:8]
+    assert verify_key("ak_old") == 403
+    assert verify_key(rotated["api_key"]) == 200
+    stored = db_session.query(User).one()
+    assert stored.api_key_hash == hash_api_key(rotated["api_key"])
+    assert client.post("/api/auth/api-key").status_code == 401
+
+
+def test_issued_key_replaces_negative_entry(db_session, verify_key):
+    """Test that a key probed before being issued is not stuck as invalid."""
+    add_user(db_session)
+    assert verify_key("ak_future") == 403
+
+    user = db_session.query(User).one()
+    user.api_key_hash = hash_api_key("ak_future")
+    db_session.commit()
+
+    assert verify_key("ak_future") == 200
+
+
+def test_register_returns_key_once(db_session, async_db_session, verify_key):
+    """Test that registration returns the key but stores only its hash."""
+    user_data = UserCreate(
+        username="bob", email="bob@example.com", password="secret123"
+    )
+    hasher = PasswordHasher(max_workers=1)
+    try:
+        token = asyncio.run(auth_routes.register(user_data, async_db_session, hasher))
+    finally:
+        hasher.shutdown()
+
+    api_key = token.user.api_key
+    stored = db_session.query(User).filter(User.username == "bob").one()
+    assert api_key.startswith("ak_")
+    assert stored.api_key_hash == hash_api_key(api_key)
+    assert stored.api_key_prefix == api_key[:8]
+    assert verify_key(api_key) == 200
+
+
+def test_register_invalidates_cached_booth_listing(async_db_session):
+    """Test that a registered user's booth shows up in cached listings."""
+    user_data = UserCreate(
+        username="carol", email="carol@example.com", password="secret123"
+    )
+    hasher = PasswordHasher(max_workers=1)
+
+    async def usernames():
+        response = await market.get_all_booths(
+            cursor=None, limit=100, db=async_db_session
+        )
+        return [booth["username"] for booth in json.loads(response.body)["items"]]
+
+    async def scenario():
+        before = await usernames()
+        await auth_routes.register(user_data, async_db_session, hasher)
+        return before, await usernames()
+
+    try:
+        before, after = asyncio.run(scenario())
+    finally:
+        hasher.shutdown()
+
+    assert before == []
+    assert after == ["carol"]
+
+
+def test_membership_resolves_user_by_api_key(db_session, async_db_session):
+    """Test that MembershipRequired finds the user behind an API key."""
+    add_user(db_session, api_key="ak_valid")
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(auth.MembershipRequired()("ak_valid", None, async_db_session))
+    # Authenticated, but without an active subscription
+    assert exc_info.value.status_code == 402
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(auth.MembershipRequired()("ak_wrong", None, async_db_session))
+    assert exc_info.value.status_code == 401
+
+
+def test_optional_api_key_without_header_skips_session(
+    db_session, async_db_engine, query_counter, monkeypatch
+):
+    """Test that anonymous requests never create a database session."""
+    add_user(db_session, api_key="ak_valid")
+    created = []
+
+    def create_session():
+        created.append(True)
+        return async_sessionmaker(async_db_engine, expire_on_commit=False)()
+
+    monkeypatch.setattr(
+        database_db, "get_async_session_factory", lambda: create_session
+    )
+
+    async def request(api_key):
+        dependency = database_db.get_async_db()
+        db = await dependency.__anext__()
+        result = await auth.optional_api_key(api_key, db)
+        await dependency.aclose()
+        return result, db.started
+
+    assert asyncio.run(request(None)) == (None, False)
+    assert not created
+    assert query_counter.count == 0
+
+    assert asyncio.run(request("ak_valid")) == ("ak_valid", True)
+    assert created == [True]
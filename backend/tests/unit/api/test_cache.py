@@ -0,0 +1,117 @@
+"""Tests for the in-process TTL cache and eviction broadcasting."""
+
+import sys
+import os
+
+# Add backend root to Python path
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+)
+
+from api_gateway.utils.cache import CacheInvalidator, TTLCache
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire():
+    """Test default and per-entry TTLs."""
+    clock = FakeClock()
+    cache = TTLCache(max_size=10, ttl=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=1)
+    cache.set("c", 3, ttl=0)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") == 2
+    assert cache.get("c") is None
+
+    clock.now = 5
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+
+    clock.now = 10
+    assert cache.get("a", "gone") == "gone"
+    assert len(cache) == 0
+
+
+def test_least_recently_used_is_evicted():
+    """Test that reads refresh recency when the cache is full."""
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+    stats = cache.get_statistics()
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 3
+    assert stats["misses"] == 1
+
+
+def test_delete_and_clear():
+    """Test explicit removal."""
+    cache = TTLCache()
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    assert cache.delete("a") is True
+    assert cache.delete("a") is False
+    cache.clear()
+    assert cache.get("b") is None
+
+
+class FakePubSubClient:
+    """Redis client stand-in delivering published messages synchronously."""
+
+    def __init__(self):
+        self.handlers = {}
+
+    def pubsub(self, ignore_subscribe_messages=True):
+        client = self
+
+        class PubSub:
+            def subscribe(self, **channels):
+                client.handlers.update(channels)
+
+            def run_in_thread(self, sleep_time, daemon):
+                return None
+
+        return PubSub()
+
+    def publish(self, channel, message):
+        self.handlers[channel]({"type": "message", "data": message})
+
+
+def test_invalidator_dispatches_by_namespace():
+    """Test that published evictions reach the registered cache."""
+    users = TTLCache()
+    keys = TTLCache()
+    users.set("u1", "alice")
+    keys.set("u1", "key")
+
+    invalidator = CacheInvalidator(FakePubSubClient())
+    invalidator.register("user", users.delete)
+    invalidator.register("key", keys.delete)
+    invalidator.publish("user", "u1")
+
+    assert users.get("u1") is None
+    assert keys.get("u1") == "key"
+
+
+def test_invalidator_without_redis_is_local():
+    """Test that publishing without Redis is a no-op."""
+    invalidator = CacheInvalidator()
+    invalidator.register("user", lambda key: None)
+    invalidator.publish("user", "u1")
@@ -0,0 +1,428 @@
+"""Tests for the marketplace routes."""
+
+import asyncio
+import json
+import sys
+import os
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+# Add backend root to Python path
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+)
+
+from database import Base, get_async_read_db, User, MarketBooth, NFTItem, NFTTransaction
+from api_gateway.routes import market
+from api_gateway.schemas.market import MarketBoothResponse, NFTItemResponse
+from api_gateway.utils.auth_utils import create_access_token
+
+
+def body(response):
+    """Decode a JSON response."""
+    return json.loads(response.body)
+
+
+def items(response):
+    """Decode the items of a listing page."""
+    return body(response)["items"]
+
+
+def add_booths(session, count: int):
+    """Create users, each with a booth and one NFT."""
+    for i in range(count):
+        user = User(
+            id=f"user-{i}",
+            username=f"user{i}",
+            email=f"user{i}@example.com",
+            hashed_password="x",
+        )
+        booth = MarketBooth(id=f"booth-{i}", user_id=user.id, popularity=i)
+        nft = NFTItem(
+            id=f"nft-{i}",
+            name=f"NFT {i}",
+            price=1.0 + i,
+            creator_id=user.id,
+            creator=user.username,
+            owner_id=user.id,
+            booth_id=booth.id,
+            created_at=1_700_000_000_000 + i,
+        )
+        session.add_all([user, booth, nft])
+    session.commit()
+    session.expunge_all()
+
+
+def test_get_all_booths_single_query(db_session, async_db_session, query_counter):
+    """Test that listing booths does not query each booth's user."""
+    add_booths(db_session, 20)
+
+    with query_counter.assert_max_queries(1):
+        booths = items(
+            asyncio.run(
+                market.get_all_booths(cursor=None, limit=100, db=async_db_session)
+            )
+        )
+
+    assert len(booths) == 20
+    assert {booth["username"] for booth in booths} == {f"user{i}" for i in range(20)}
+    assert all(booth["avatar"] == "👤" for booth in booths)
+
+
+def test_get_all_booths_pagination(db_session, async_db_session, query_counter):
+    """Test that cursors walk booths by popularity, limiting booths not rows."""
+    add_booths(db_session, 5)
+
+    async def walk():
+        pages, cursor = [], None
+        while True:
+            page = body(
+                await market.get_all_booths(cursor=cursor, limit=2, db=async_db_session)
+            )
+            pages.append([booth["id"] for booth in page["items"]])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return pages
+
+    pages = asyncio.run(walk())
+
+    assert pages == [["booth-4", "booth-3"], ["booth-2", "booth-1"], ["booth-0"]]
+
+
+def test_get_nfts_pagination(db_session, async_db_session):
+    """Test that cursors walk NFTs newest first, ties broken by id."""
+    add_booths(db_session, 3)
+    db_session.add(
+        NFTItem(
+            id="nft-1b",
+            name="NFT 1b",
+            price=1.0,
+            creator_id="user-1",
+            creator="user1",
+            owner_id="user-1",
+            booth_id="booth-1",
+            created_at=1_700_000_000_001,
+        )
+    )
+    db_session.commit()
+
+    async def walk(booth_id=None):
+        ids, cursor = [], None
+        while True:
+            page = body(
+                await market.get_nfts(
+                    booth_id=booth_id, cursor=cursor, limit=1, db=async_db_session
+                )
+            )
+            ids.extend(nft["id"] for nft in page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return ids
+
+    assert asyncio.run(walk()) == ["nft-2", "nft-1b", "nft-1", "nft-0"]
+    assert asyncio.run(walk("booth-1")) == ["nft-1b", "nft-1"]
+
+
+def test_invalid_cursor_is_rejected(async_db_session):
+    """Test that a malformed cursor is a client error."""
+    for cursor in ("not-a-cursor", "WyJ4Il0"):
+        try:
+            asyncio.run(
+                market.get_nfts(
+                    booth_id=None, cursor=cursor, limit=10, db=async_db_session
+                )
+            )
+            status = 200
+        except market.HTTPException as e:
+            status = e.status_code
+        assert status == 400
+
+
+def test_get_booth_single_query(db_session, async_db_session, query_counter):
+    """Test that fetching one booth loads its user in the same query."""
+    add_booths(db_session, 2)
+
+    with query_counter.assert_max_queries(1):
+        booth = asyncio.run(market.get_booth("booth-1", db=async_db_session))
+
+    assert booth.username == "user1"
+
+
+def test_get_nfts_single_query(db_session, async_db_session, query_counter):
+    """Test that listing NFTs runs a single query."""
+    add_booths(db_session, 10)
+
+    with query_counter.assert_max_queries(1):
+        nfts = items(
+            asyncio.run(
+                market.get_nfts(
+                    booth_id=None, cursor=None, limit=100, db=async_db_session
+                )
+            )
+        )
+
+    assert len(nfts) == 10
+
+
+def test_repeat_listings_are_cached(db_session, async_db_session, query_counter):
+    """Test that repeat listings are served without querying."""
+    add_booths(db_session, 3)
+
+    async def scenario():
+        await market.get_all_booths(cursor=None, limit=100, db=async_db_session)
+        await market.get_nfts(
+            booth_id=None, cursor=None, limit=100, db=async_db_session
+        )
+        await market.get_nft("nft-1", db=async_db_session)
+        with query_counter.assert_max_queries(0):
+            booths = await market.get_all_booths(
+                cursor=None, limit=100, db=async_db_session
+            )
+            nfts = await market.get_nfts(
+                booth_id=None, cursor=None, limit=100, db=async_db_session
+            )
+            nft = await market.get_nft("nft-1", db=async_db_session)
+        return items(booths), items(nfts), body(nft)
+
+    booths, nfts, nft = asyncio.run(scenario())
+
+    assert len(booths) == 3
+    assert len(nfts) == 3
+    assert nft["name"] == "NFT 1"
+
+
+def test_writes_invalidate_cached_listings(db_session, async_db_session):
+    """Test that creating and deleting NFTs is visible on the next read."""
+    add_booths(db_session, 1)
+    authorization = f"Bearer {create_access_token({'sub': 'user-0'})}"
+
+    async def list_nfts():
+        return items(
+            await market.get_nfts(
+                booth_id=None, cursor=None, limit=100, db=async_db_session
+            )
+        )
+
+    async def scenario():
+        before = await list_nfts()
+        await market.get_all_booths(cursor=None, limit=100, db=async_db_session)
+        await market.get_nft("nft-0", db=async_db_session)
+
+        created = await market.create_nft(
+            market.NFTItemCreate(name="Fresh", price=2.0),
+            authorization,
+            async_db_session,
+        )
+        after_create = await list_nfts()
+        booths = items(
+            await market.get_all_booths(cursor=None, limit=100, db=async_db_session)
+        )
+
+        await market.delete_nft("nft-0", authorization, async_db_session)
+        after_delete = await list_nfts()
+        try:
+            await market.get_nft("nft-0", db=async_db_session)
+            deleted_detail = 200
+        except market.HTTPException as e:
+            deleted_detail = e.status_code
+        return before, created, after_create, booths, after_delete, deleted_detail
+
+    before, created, after_create, booths, after_delete, deleted_detail = asyncio.run(
+        scenario()
+    )
+
+    assert [nft["id"] for nft in before] == ["nft-0"]
+    assert {nft["id"] for nft in after_create} == {"nft-0", created.id}
+    assert booths[0]["active_listings"] == 1
+    assert [nft["id"] for nft in after_delete] == [created.id]
+    assert deleted_detail == 404
+
+
+def test_cache_misses_ignore_lagging_replicas(db_session, client, tmp_path):
+    """Test that a replica behind the primary is never cached after a write."""
+    from api_gateway.main import app
+
+    add_booths(db_session, 1)
+    # A replica that has not replicated the rows yet
+    path = tmp_path / "replica.db"
+    schema_engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=schema_engine)
+    schema_engine.dispose()
+    replica = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+    async def lagging_replica():
+        async with async_sessionmaker(replica)() as session:
+            yield session
+
+    app.dependency_overrides[get_async_read_db] = lagging_replica
+    try:
+        booths = client.get("/api/market/booths").json()["items"]
+        nfts = client.get("/api/market/nft").json()["items"]
+    finally:
+        asyncio.run(replica.dispose())
+
+    assert [booth["id"] for booth in booths] == ["booth-0"]
+    assert [nft["id"] for nft in nfts] == ["nft-0"]
+
+
+def test_row_encoding_matches_response_models(db_session, async_db_session):
+    """Test that rows encoded straight to JSON match the response schemas."""
+    add_booths(db_session, 2)
+    nft = db_session.get(NFTItem, "nft-1")
+    nft.nft_attributes = {"power": 9, "tags": ["a", "b"]}
+    db_session.commit()
+
+    async def scenario():
+        nfts = await market.get_nfts(
+            booth_id=None, cursor=None, limit=100, db=async_db_session
+        )
+        booths = await market.get_all_booths(
+            cursor=None, limit=100, db=async_db_session
+        )
+        detail = await market.get_nft("nft-1", db=async_db_session)
+        return items(nfts), items(booths), body(detail)
+
+    nfts, booths, detail = asyncio.run(scenario())
+
+    expected_nfts = [
+        NFTItemResponse.model_validate(db_session.get(NFTItem, nft_id)).model_dump(
+            mode="json"
+        )
+        for nft_id in ("nft-1", "nft-0")
+    ]
+    expected_booths = [
+        MarketBoothResponse(
+            **{
+                **{
+                    column.key: getattr(booth, column.key)
+                    for column in MarketBooth.__table__.columns
+                },
+                "username": booth.user.username,
+                "avatar": booth.user.avatar,
+            }
+        ).model_dump(mode="json")
+        for booth in (
+            db_session.get(MarketBooth, "booth-1"),
+            db_session.get(MarketBooth, "booth-0"),
+        )
+    ]
+    assert nfts == expected_nfts
+    assert detail == expected_nfts[0]
+    assert booths == expected_booths
+
+
+def test_sparse_fieldsets_limit_columns_and_output(
+    db_session, async_db_session, query_counter
+):
+    """Test that fields= trims both the SELECT and the response."""
+    add_booths(db_session, 3)
+
+    async def scenario():
+        page = body(
+            await market.get_nfts(
+                booth_id=None,
+                cursor=None,
+                limit=2,
+                fields="name, price,rarity",
+                db=async_db_session,
+            )
+        )
+        next_page = body(
+            await market.get_nfts(
+                booth_id=None,
+                cursor=page["next_cursor"],
+                limit=2,
+                fields="name,price,rarity",
+                db=async_db_session,
+            )
+        )
+        detail = body(
+            await market.get_nft("nft-1", fields="id,name", db=async_db_session)
+        )
+        return page, next_page, detail
+
+    page, next_page, detail = asyncio.run(scenario())
+
+    assert page["items"] == [
+        {"name": "NFT 2", "price": 3.0, "rarity": "common"},
+        {"name": "NFT 1", "price": 2.0, "rarity": "common"},
+    ]
+    assert next_page["items"] == [{"name": "NFT 0", "price": 1.0, "rarity": "common"}]
+    assert detail == {"id": "nft-1", "name": "NFT 1"}
+    assert query_counter.statements
+    assert not any(
+        "nft_attributes" in statement for statement in query_counter.statements
+    )
+
+
+def test_unknown_field_is_rejected(async_db_session):
+    """Test that fields outside the response schema are a client error."""
+    try:
+        asyncio.run(market.get_nft("nft-1", fields="name,secret", db=async_db_session))
+        status = 200
+    except market.HTTPException as e:
+        status = e.status_code
+
+    assert status == 400
+
+
+def test_nft_history_pages_and_follows_deletes(db_session, async_db_session):
+    """Test that history is paged newest first and removed with its NFT."""
+    add_booths(db_session, 1)
+    authorization = f"Bearer {create_access_token({'sub': 'user-0'})}"
+
+    async def history(nft_id, cursor=None):
+        return body(
+            await market.get_nft_history(
+                nft_id, cursor=cursor, limit=2, db=async_db_session
+            )
+        )
+
+    created = asyncio.run(
+        market.create_nft(
+            market.NFTItemCreate(name="Fresh", price=2.0),
+            authorization,
+            async_db_session,
+        )
+    )
+    db_session.add_all(
+        NFTTransaction(
+            id=f"tx-{i}",
+            nft_id=created.id,
+            type="sale",
+            from_address="user-0",
+            to_address=f"0xbuyer{i}",
+            price=2.0 + i,
+            timestamp=created.created_at + i,
+        )
+        for i in (1, 2)
+    )
+    db_session.commit()
+
+    first = asyncio.run(history(created.id))
+    second = asyncio.run(history(created.id, first["next_cursor"]))
+
+    assert [tx["id"] for tx in first["items"]] == ["tx-2", "tx-1"]
+    assert second["items"] == [
+        {
+            "id": f"tx_{created.id}",
+            "nft_id": created.id,
+            "type": "mint",
+            "from_address": "0x0",
+            "to_address": "user-0",
+            "price": None,
+            "timestamp": created.created_at,
+        }
+    ]
+    assert second["next_cursor"] is None
+
+    asyncio.run(market.delete_nft(created.id, authorization, async_db_session))
+
+    assert db_session.query(NFTTransaction).count() == 0
+    try:
+        asyncio.run(history(created.id))
+        status = 200
+    except market.HTTPException as e:
+        status = e.status_code
+    assert status == 404
@@ -0,0 +1,151 @@
+"""Tests for the process-pool password hasher."""
+
+import asyncio
+import sys
+import os
+
+import pytest
+from fastapi import BackgroundTasks, HTTPException
+from passlib.context import CryptContext
+
+# Add backend root to Python path
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+)
+
+from database import User
+from api_gateway.routes import auth as auth_routes
+from api_gateway.schemas.auth import UserLogin
+from api_gateway.utils.auth_utils import needs_password_update, verify_password
+from api_gateway.utils.password_hasher import PasswordHasher
+
+# Hashes at the minimum bcrypt cost stand in for hashes from an older setting
+cheap_context = CryptContext(schemes=["bcrypt_sha256"], bcrypt_sha256__rounds=4)
+
+
+@pytest.fixture
+def hasher():
+    """Create a hasher with one worker process."""
+    hasher = PasswordHasher(max_workers=1, max_pending=2)
+    yield hasher
+    hasher.shutdown()
+
+
+def test_hash_and_verify(hasher):
+    """Test hashing and verifying on the pool."""
+
+    async def scenario():
+        hashed = await hasher.hash("secret123")
+        return (
+            hashed,
+            await hasher.verify("secret123", hashed),
+            await hasher.verify("wrong", hashed),
+        )
+
+    hashed, good, bad = asyncio.run(scenario())
+
+    assert good is True
+    assert bad is False
+    assert not needs_password_update(hashed)
+    stats = hasher.get_statistics()
+    assert stats["completed"] == 3
+    assert stats["in_flight"] == 0
+
+
+def test_saturation_rejects_with_503(hasher):
+    """Test that calls beyond max_pending are rejected, not queued."""
+
+    async def scenario():
+        return await asyncio.gather(
+            *(hasher.hash("secret123") for _ in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(scenario())
+
+    errors = [result for result in results if isinstance(result, HTTPException)]
+    assert len(errors) == 1
+    assert errors[0].status_code == 503
+    assert errors[0].headers["Retry-After"] == "1"
+    stats = hasher.get_statistics()
+    assert stats["rejected"] == 1
+    assert stats["peak_in_flight"] == 2
+
+
+def test_upgrade_only_outdated_hashes(hasher):
+    """Test that upgrade rehashes outdated hashes at the current cost."""
+    old_hash = cheap_context.hash("secret123")
+    assert needs_password_update(old_hash)
+
+    new_hash = asyncio.run(hasher.upgrade("secret123", old_hash))
+
+    assert verify_password("secret123", new_hash)
+    assert not needs_password_update(new_hash)
+    assert asyncio.run(hasher.upgrade("secret123", new_hash)) is None
+
+
+def test_upgrade_skipped_when_busy(hasher):
+    """Test that background upgrades yield to request traffic."""
+    hasher.in_flight = 1
+
+    assert asyncio.run(hasher.upgrade("secret123", cheap_context.hash("x"))) is None
+    assert hasher.upgrades_skipped == 1
+
+
+def test_login_upgrades_hash_in_background(db_session, async_db_session, hasher):
+    """Test that logging in replaces an outdated hash after the response."""
+    db_session.add(
+        User(
+            id="user-1",
+            username="alice",
+            email="alice@example.com",
+            hashed_password=cheap_context.hash("secret123"),
+        )
+    )
+    db_session.commit()
+    tasks = BackgroundTasks()
+
+    async def scenario():
+        token = await auth_routes.login(
+            UserLogin(username="alice", password="secret123"),
+            tasks,
+            async_db_session,
+            hasher,
+        )
+        await tasks()
+        return token
+
+    token = asyncio.run(scenario())
+
+    assert token.user.username == "alice"
+    db_session.expire_all()
+    stored = db_session.query(User).one()
+    assert not needs_password_update(stored.hashed_password)
+    assert verify_password("secret123", stored.hashed_password)
+    assert hasher.upgrades == 1
+
+
+def test_login_rejects_wrong_password(db_session, async_db_session, hasher):
+    """Test that a wrong password is rejected without scheduling work."""
+    db_session.add(
+        User(
+            id="user-1",
+            username="alice",
+            email="alice@example.com",
+            hashed_password=cheap_context.hash("secret123"),
+        )
+    )
+    db_session.commit()
+    tasks = BackgroundTasks()
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(
+            auth_routes.login(
+                UserLogin(username="alice", password="wrong"),
+                tasks,
+                async_db_session,
+                hasher,
+            )
+        )
+
+    assert exc_info.value.status_code == 401
+    assert not tasks.tasks
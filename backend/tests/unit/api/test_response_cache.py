@@ -0,0 +1,106 @@
+"""Tests for the two-tier response cache."""
+
+import json
+import sys
+import os
+
+# Add backend root to Python path
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+)
+
+from api_gateway.utils.cache import CacheInvalidator
+from api_gateway.utils.response_cache import ResponseCache
+
+
+class FakeRedis:
+    """Redis stand-in shared by several caches, as by several processes."""
+
+    def __init__(self):
+        self.values = {}
+        self.subscribers = []
+
+    def pubsub(self, ignore_subscribe_messages=True):
+        client = self
+
+        class PubSub:
+            def subscribe(self, **channels):
+                client.subscribers.extend(channels.values())
+
+            def run_in_thread(self, sleep_time, daemon):
+                return None
+
+        return PubSub()
+
+    def publish(self, channel, message):
+        for handler in self.subscribers:
+            handler({"type": "message", "data": message})
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+
+    def incr(self, key):
+        self.values[key] = int(self.values.get(key, 0)) + 1
+        return self.values[key]
+
+
+def test_key_depends_on_route_and_params():
+    """Test that parameters are order-insensitive and None is ignored."""
+    cache = ResponseCache()
+
+    assert cache.make_key("r", {"a": 1, "b": 2}) == cache.make_key(
+        "r", {"b": 2, "a": 1, "c": None}
+    )
+    assert cache.make_key("r", {"a": 1}) != cache.make_key("r", {"a": 2})
+    assert cache.make_key("r") != cache.make_key("s")
+
+
+def test_invalidated_tag_drops_responses():
+    """Test that invalidating a tag misses only the responses that use it."""
+    cache = ResponseCache()
+    nfts = cache.make_key("nfts", tags=("nfts",))
+    booths = cache.make_key("booths", tags=("booths",))
+    cache.store(nfts, [{"id": "nft-1"}])
+    cache.store(booths, [{"id": "booth-1"}])
+
+    cache.invalidate("nfts")
+
+    assert cache.get(cache.make_key("nfts", tags=("nfts",))) is None
+    assert cache.get(cache.make_key("booths", tags=("booths",))) is not None
+
+
+def test_read_started_before_write_is_not_served():
+    """Test that a body built before an invalidation is never served after it."""
+    cache = ResponseCache()
+    key = cache.make_key("nfts", tags=("nfts",))
+
+    cache.invalidate("nfts")  # A write lands while the read is in flight
+    cache.store(key, [{"id": "deleted"}])
+
+    assert cache.get(cache.make_key("nfts", tags=("nfts",))) is None
+
+
+def test_redis_tier_is_shared_between_processes():
+    """Test that bodies and invalidations reach every process."""
+    redis = FakeRedis()
+    first = ResponseCache(invalidator=CacheInvalidator(redis))
+    second = ResponseCache(invalidator=CacheInvalidator(redis))
+
+    first.store(first.make_key("nfts", tags=("nfts",)), [{"id": "nft-1"}])
+    body = second.get(second.make_key("nfts", tags=("nfts",)))
+
+    assert json.loads(body) == [{"id": "nft-1"}]
+    assert second.get_statistics()["shared_hits"] == 1
+
+    second.invalidate("nfts")
+
+    assert first.get(first.make_key("nfts", tags=("nfts",))) is None
+    assert first.make_key("nfts", tags=("nfts",)) == second.make_key(
+        "nfts", tags=("nfts",)
+    )
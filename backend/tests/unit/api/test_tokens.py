@@ -0,0 +1,171 @@
+"""Tests for the verified token cache and the revocation list."""
+
+import sys
+import os
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+
+# Add backend root to Python path
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+)
+
+from api_gateway.utils import auth_utils, revocation
+from api_gateway.utils.auth_utils import (
+    create_access_token,
+    decode_access_token,
+    hash_token,
+)
+from api_gateway.utils.cache import CacheInvalidator, TTLCache
+from api_gateway.utils.revocation import TokenRevocationList
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    """Redis stand-in with key expiry and pub/sub to every subscriber."""
+
+    def __init__(self):
+        self.keys = {}
+        self.handlers = {}
+
+    def set(self, name, value, ex=None):
+        self.keys[name] = ex
+
+    def ttl(self, name):
+        return self.keys.get(name, -2)
+
+    def pubsub(self, ignore_subscribe_messages=True):
+        client = self
+
+        class PubSub:
+            def subscribe(self, **channels):
+                for channel, handler in channels.items():
+                    client.handlers.setdefault(channel, []).append(handler)
+
+            def run_in_thread(self, sleep_time, daemon):
+                return None
+
+        return PubSub()
+
+    def publish(self, channel, message):
+        for handler in self.handlers.get(channel, []):
+            handler({"type": "message", "data": message})
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    """Give every test its own token cache and revocation list."""
+    clock = FakeClock(1000.0)
+    monkeypatch.setattr(auth_utils, "_token_cache", TTLCache(clock=clock))
+    monkeypatch.setattr(revocation, "_revocations", TokenRevocationList())
+    return clock
+
+
+@pytest.fixture
+def decode_calls(monkeypatch):
+    """Count full signature verifications."""
+    calls = []
+    original = auth_utils.jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(1)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(auth_utils.jwt, "decode", counting_decode)
+    return calls
+
+
+def test_repeat_decodes_skip_verification(decode_calls):
+    """Test that a verified token is served from the cache."""
+    token = create_access_token(data={"sub": "user-1"})
+
+    first = decode_access_token(token)
+    first["sub"] = "tampered"
+    second = decode_access_token(token)
+
+    assert len(decode_calls) == 1
+    assert second["sub"] == "user-1"
+
+
+def test_cache_entry_capped_at_expiry(decode_calls, fresh_state):
+    """Test that claims are not cached past the token's exp."""
+    token = create_access_token(
+        data={"sub": "user-1"}, expires_delta=timedelta(seconds=30)
+    )
+    decode_access_token(token)
+
+    fresh_state.now += 29
+    decode_access_token(token)
+    assert len(decode_calls) == 1
+
+    fresh_state.now += 2
+    decode_access_token(token)
+    assert len(decode_calls) == 2
+
+
+def test_invalid_token_is_not_cached(decode_calls):
+    """Test that bad tokens are rejected on every call."""
+    for _ in range(2):
+        with pytest.raises(HTTPException) as exc_info:
+            decode_access_token("not-a-token")
+        assert exc_info.value.status_code == 401
+    assert len(decode_calls) == 2
+
+
+def test_revoked_token_rejected_while_cached(decode_calls):
+    """Test that revocation applies to tokens already in the cache."""
+    token = create_access_token(data={"sub": "user-1"})
+    other = create_access_token(data={"sub": "user-2"})
+    decode_access_token(token)
+    decode_access_token(other)
+
+    auth_utils.get_revocation_list().revoke(hash_token(token), 4_000_000_000)
+
+    with pytest.raises(HTTPException):
+        decode_access_token(token)
+    assert decode_access_token(other)["sub"] == "user-2"
+
+
+def test_logout_revokes_token(client):
+    """Test that logging out rejects the token afterwards."""
+    token = create_access_token(data={"sub": "user-1"})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert client.post("/api/auth/logout", headers=headers).status_code == 204
+
+    with pytest.raises(HTTPException):
+        decode_access_token(token)
+    assert client.post("/api/auth/logout").status_code == 401
+
+
+def test_revocations_shared_across_processes():
+    """Test broadcast to running processes and lookup by later ones."""
+    client = FakeRedis()
+    clock = FakeClock(1000.0)
+    first = TokenRevocationList(CacheInvalidator(client), clock=clock)
+    running = TokenRevocationList(CacheInvalidator(client), clock=clock)
+
+    first.revoke("abc", 1060.0)
+
+    assert client.keys["auth:revoked:abc"] == 61
+    assert running.is_revoked("abc")
+
+    started_later = TokenRevocationList(CacheInvalidator(client), clock=clock)
+    assert not started_later.is_revoked("abc")
+    assert started_later.is_revoked("abc", check_shared=True)
+    # Remembered locally afterwards
+    assert started_later.is_revoked("abc")
+
+    clock.now = 1061.0
+    assert not running.is_revoked("abc")
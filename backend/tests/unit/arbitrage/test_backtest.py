@@ -0,0 +1,147 @@
+"""Tests for the arbitrage backtester."""
+
+import sys
+import os
+
+import numpy as np
+import pytest
+
+# Add backend root to Python path
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+)
+
+from arbitrage_engine.backtest import (
+    BacktestConfig,
+    QuoteTape,
+    default_taker_fees,
+    parameter_grid,
+    run_backtest,
+    run_grid,
+)
+from arbitrage_engine.engine import ArbitrageEngine
+from arbitrage_engine.history import HistoryStore
+from arbitrage_engine.simulator import MarketSimulator
+
+BASE_TIME = 1_700_000_000_000
+FEES = {"A": 0.001, "B": 0.001}
+
+
+def two_venue_tape(a_prices, b_prices, step_ms=1000):
+    """Build a one-symbol tape with zero-width quotes on venues A and B."""
+    n = len(a_prices)
+    timestamps = np.repeat(BASE_TIME + np.arange(n) * step_ms, 2)
+    prices = np.ravel(np.column_stack([a_prices, b_prices]))
+    return QuoteTape.from_quotes(
+        timestamps,
+        np.array(["BTC/USDT"] * 2 * n, dtype=object),
+        np.array(["A", "B"] * n, dtype=object),
+        prices,
+        prices,
+    )
+
+
+def test_tape_forward_fills_missing_quotes():
+    """Test that steps without a quote reuse the last known one."""
+    tape = QuoteTape.from_quotes(
+        np.array([BASE_TIME, BASE_TIME + 1000, BASE_TIME + 2000]),
+        np.array(["BTC/USDT"] * 3, dtype=object),
+        np.array(["A", "B", "A"], dtype=object),
+        np.array([100.0, 101.0, 102.0]),
+        np.array([100.5, 101.5, 102.5]),
+    )
+
+    assert tape.exchanges == ["A", "B"]
+    assert np.isnan(tape.bid[0, 1, 0])
+    assert list(tape.bid[0, 0]) == [100.0, 100.0, 102.0]
+    assert list(tape.bid[0, 1, 1:]) == [101.0, 101.0]
+
+
+def test_signals_pnl_and_hit_rate():
+    """Test PnL of a spread that persists versus one that closes."""
+    # B is 1% rich at steps 0 and 2; the spread closes at step 1
+    tape = two_venue_tape([100, 100, 100, 100], [101, 100, 101, 101])
+    config = BacktestConfig(min_spread_threshold=0.5, position_size_usd=10000)
+
+    instant = run_backtest(tape, config, FEES)
+    assert instant.signals == 3
+    assert instant.trades == 3
+    assert instant.hit_rate == 1.0
+    assert instant.pnl_usd == pytest.approx(3 * (1.0 - 0.2) * 100)
+
+    delayed = run_backtest(
+        tape, BacktestConfig(min_spread_threshold=0.5, latency_ms=1000), FEES
+    )
+    # Step 0 fills at step 1 (closed), step 2 at step 3, step 3 falls off
+    assert delayed.signals == 3
+    assert delayed.trades == 2
+    assert delayed.hits == 1
+    assert delayed.pnl_usd == pytest.approx((0.8 - 0.2) * 100)
+    assert delayed.max_drawdown_usd == pytest.approx(20.0)
+
+
+def test_slippage_and_fee_overrides_reduce_pnl():
+    """Test that slippage and higher fees reduce realized profit."""
+    tape = two_venue_tape([100, 100], [101, 101])
+
+    base = run_backtest(tape, BacktestConfig(), FEES)
+    slipped = run_backtest(tape, BacktestConfig(slippage_bps=10), FEES)
+    pricey = run_backtest(tape, BacktestConfig(fee_overrides={"B": 0.003}), FEES)
+
+    assert slipped.pnl_usd < base.pnl_usd
+    assert pricey.pnl_usd == pytest.approx(base.pnl_usd - 2 * 0.2 * 100)
+
+
+def test_matches_engine_on_recorded_cycles(tmp_path):
+    """Test that replay reproduces the engine's opportunities exactly."""
+    simulator = MarketSimulator(seed=21, tick_rate=0)
+    engine = ArbitrageEngine(simulator=simulator)
+    store = HistoryStore(str(tmp_path))
+
+    expected_signals, expected_profit = 0, 0.0
+    for i in range(20):
+        simulator.step(5)
+        opportunities = engine.find_opportunities()
+        quotes = {
+            symbol: {
+                exchange: dict(ticker, timestamp=BASE_TIME + i * 1000)
+                for exchange, ticker in tickers.items()
+            }
+            for symbol, tickers in engine.last_quotes.items()
+        }
+        store.record(opportunities, quotes)
+        expected_signals += len(opportunities)
+        expected_profit += sum(opp.estimated_profit_usd for opp in opportunities)
+
+    tape = QuoteTape.from_history(store)
+    result = run_backtest(tape, BacktestConfig(best_only=False))
+
+    assert expected_signals > 0
+    assert result.signals == expected_signals
+    assert result.pnl_usd == pytest.approx(expected_profit)
+
+
+def test_grid_runs_in_worker_processes():
+    """Test that pooled results match inline results in order."""
+    rng = np.random.default_rng(3)
+    a = 100 + rng.standard_normal(500).cumsum() * 0.1
+    b = a * (1 + rng.normal(0, 0.006, 500))
+    tape = two_venue_tape(a, b)
+    configs = parameter_grid(
+        min_spread_threshold=[0.2, 0.5, 0.8], latency_ms=[0, 2000], slippage_bps=[0, 5]
+    )
+
+    inline = run_grid(tape, configs, processes=1, taker_fees=FEES)
+    pooled = run_grid(tape, configs, processes=2, taker_fees=FEES)
+
+    assert len(configs) == 12
+    assert [r.to_dict() for r in pooled] == [r.to_dict() for r in inline]
+    assert inline[0].trades > inline[2].trades
+
+
+def test_default_fees_cover_engine_exchanges():
+    """Test that the base fee schedule comes from the connectors."""
+    fees = default_taker_fees()
+
+    assert fees["Coinbase"] == pytest.approx(0.006)
+    assert len(fees) == 5
@@ -0,0 +1,254 @@
+"""Tests for the columnar opportunity history store."""
+
+import asyncio
+import dataclasses
+import json
+import sys
+import os
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+
+# Add backend root to Python path
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+)
+
+from arbitrage_engine.engine import ArbitrageEngine
+from arbitrage_engine.history import HistoryStore
+from arbitrage_engine.simulator import MarketSimulator
+from api_gateway.routes.arbitrage import get_history
+
+BASE_TIME = 1_700_000_000_000
+
+
+def record_cycles(store: HistoryStore, cycles: int, step_ms: int = 1000):
+    """Record demo opportunities and quotes for a number of cycles."""
+    base = ArbitrageEngine(demo_mode=True).get_demo_data()
+    for i in range(cycles):
+        timestamp = BASE_TIME + i * step_ms
+        opportunities = [
+            dataclasses.replace(
+                opp, timestamp=timestamp, net_profit_pct=opp.net_profit_pct + i
+            )
+            for opp in base
+        ]
+        quotes = {
+            "BTC/USDT": {
+                "Binance": {"bid": 100.0 + i, "ask": 101.0 + i, "timestamp": timestamp},
+                "Kraken": {"bid": 99.0 + i, "ask": 100.5 + i, "timestamp": timestamp},
+            }
+        }
+        store.record(opportunities, quotes)
+
+
+def test_segments_written_and_indexed(tmp_path):
+    """Test that full buffers become segments with time bounds."""
+    store = HistoryStore(str(tmp_path), segment_rows=10)
+    record_cycles(store, 6)
+    store.flush()
+
+    stats = store.get_statistics()
+    assert stats["opportunities"]["rows"] == 30
+    assert stats["opportunities"]["segments"] == 3
+    assert stats["opportunities"]["buffered_rows"] == 0
+    assert stats["quotes"]["rows"] == 12
+    assert stats["opportunities"]["min_timestamp"] == BASE_TIME
+    assert stats["opportunities"]["max_timestamp"] == BASE_TIME + 5000
+
+
+def test_old_buffers_written_by_age(tmp_path):
+    """Test that buffered rows are written once they reach the maximum age."""
+    now = [0.0]
+    store = HistoryStore(str(tmp_path), max_buffer_seconds=30, clock=lambda: now[0])
+    record_cycles(store, 1)
+    now[0] = 29.0
+    record_cycles(store, 1)
+
+    assert store.get_statistics()["opportunities"]["segments"] == 0
+
+    now[0] = 30.0
+    record_cycles(store, 1)
+
+    stats = store.get_statistics()
+    assert stats["opportunities"]["segments"] == 1
+    assert stats["opportunities"]["rows"] == 15
+    assert stats["quotes"]["buffered_rows"] == 0
+
+    # The age restarts with the next buffered row
+    now[0] = 50.0
+    record_cycles(store, 1)
+    assert store.get_statistics()["opportunities"]["buffered_rows"] == 5
+
+
+def test_query_filters_and_time_range(tmp_path):
+    """Test symbol, exchange pair and time range filters."""
+    store = HistoryStore(str(tmp_path), segment_rows=10)
+    record_cycles(store, 6)
+    store.flush()
+
+    result = store.query(
+        symbol="BTC/USDT",
+        buy_exchange="Binance",
+        sell_exchange="Coinbase",
+        start=BASE_TIME + 1000,
+        end=BASE_TIME + 4000,
+    )
+
+    assert list(result["timestamp"]) == [
+        BASE_TIME + 1000,
+        BASE_TIME + 2000,
+        BASE_TIME + 3000,
+    ]
+    assert set(result["symbol"]) == {"BTC/USDT"}
+    assert set(result["sell_exchange"]) == {"Coinbase"}
+
+
+def test_time_range_skips_segments(tmp_path):
+    """Test that segments outside the range are never opened."""
+    store = HistoryStore(str(tmp_path), segment_rows=5)
+    record_cycles(store, 10)
+    store.flush()
+
+    result = store.query(columns=["timestamp"], start=BASE_TIME + 9000)
+
+    assert len(result["timestamp"]) == 5
+    last_segment = [s for s in store._segments if s["table"] == "opportunities"][-1]
+    assert {name for name, _ in store._mapped} == {last_segment["name"]}
+
+
+def test_mapped_columns_bounded(tmp_path):
+    """Test that only the most recently read segment columns stay mapped."""
+    store = HistoryStore(str(tmp_path), segment_rows=5, max_mapped_columns=3)
+    record_cycles(store, 10)
+    store.flush()
+
+    result = store.query(columns=["timestamp"])
+
+    assert len(result["timestamp"]) == 50
+    segments = [s["name"] for s in store._segments if s["table"] == "opportunities"]
+    assert list(store._mapped) == [(name, "timestamp") for name in segments[-3:]]
+
+    # Mappings of segments dropped from the manifest are closed on reload
+    store._manifest_mtime = None
+    with open(os.path.join(str(tmp_path), "manifest.json"), "w") as f:
+        kept = [s for s in store._segments if s["name"] != segments[-1]]
+        json.dump({"segments": kept}, f)
+    store.get_statistics()
+    assert list(store._mapped) == [(name, "timestamp") for name in segments[-3:-1]]
+
+
+def test_query_includes_buffered_rows(tmp_path):
+    """Test that unflushed rows are visible to the writer."""
+    store = HistoryStore(str(tmp_path))
+    record_cycles(store, 2)
+
+    result = store.query("quotes", exchange="Kraken")
+
+    assert list(result["bid"]) == [99.0, 100.0]
+
+
+def test_unknown_filter_rejected(tmp_path):
+    """Test that opportunity-only filters are rejected for quotes."""
+    store = HistoryStore(str(tmp_path))
+
+    with pytest.raises(ValueError):
+        store.query("quotes", buy_exchange="Binance")
+
+
+def test_aggregate_by_pair_and_bucket(tmp_path):
+    """Test grouped summaries across segments and the buffer."""
+    store = HistoryStore(str(tmp_path), segment_rows=10)
+    record_cycles(store, 5)
+
+    groups = store.aggregate(group_by=["symbol"], symbol="ETH/USDT")
+    assert groups == [
+        {
+            "symbol": "ETH/USDT",
+            "count": 5,
+            "mean": pytest.approx(0.42 + 2),
+            "min": pytest.approx(0.42),
+            "max": pytest.approx(4.42),
+            "first_seen": BASE_TIME,
+            "last_seen": BASE_TIME + 4000,
+        }
+    ]
+
+    buckets = store.aggregate(group_by=[], bucket_ms=2000)
+    assert [(g["bucket"], g["count"]) for g in buckets] == [
+        (BASE_TIME, 10),
+        (BASE_TIME + 2000, 10),
+        (BASE_TIME + 4000, 5),
+    ]
+
+
+def test_reader_sees_writer_segments(tmp_path):
+    """Test that a second store on the same directory picks up new data."""
+    writer = HistoryStore(str(tmp_path))
+    reader = HistoryStore(str(tmp_path))
+    record_cycles(writer, 1)
+    writer.flush()
+
+    assert len(reader.query()["symbol"]) == 5
+
+    record_cycles(writer, 2)
+    writer.flush()
+
+    assert len(reader.query()["symbol"]) == 15
+    assert reader.aggregate("quotes", group_by=["exchange"])[0]["exchange"] == "Binance"
+
+
+def test_engine_cycle_recorded_with_quotes(tmp_path):
+    """Test recording a simulated engine cycle and its quotes."""
+    engine = ArbitrageEngine(
+        simulator=MarketSimulator(symbol_count=3, seed=4, tick_rate=0)
+    )
+    store = HistoryStore(str(tmp_path))
+    opportunities = engine.find_opportunities()
+    store.record(opportunities, engine.last_quotes)
+    store.flush()
+
+    assert len(store.query()["symbol"]) == len(opportunities)
+    assert len(store.query("quotes")["symbol"]) == 3 * 5
+    assert np.all(store.query("quotes")["ask"] > 0)
+
+
+def test_history_route(tmp_path):
+    """Test the aggregate endpoint and its error handling."""
+    store = HistoryStore(str(tmp_path))
+    record_cycles(store, 3)
+
+    def call(**params):
+        defaults = dict(
+            table="opportunities",
+            group_by="symbol",
+            value=None,
+            bucket_ms=None,
+            symbol=None,
+            exchange=None,
+            buy_exchange=None,
+            sell_exchange=None,
+            start=None,
+            end=None,
+            api_key=None,
+            history=store,
+        )
+        defaults.update(params)
+        return asyncio.run(get_history(**defaults))
+
+    assert len(call()) == 5
+    assert [g["symbol"] for g in call(exchange="Kraken")] == ["ETH/USDT"]
+
+    with pytest.raises(HTTPException) as exc_info:
+        call(group_by="nope")
+    assert exc_info.value.status_code == 400
+
+    # Each table has its own default grouping
+    assert len(call(group_by=None)) == 5
+    quotes = call(table="quotes", group_by=None)
+    assert [(g["symbol"], g["exchange"]) for g in quotes] == [
+        ("BTC/USDT", "Binance"),
+        ("BTC/USDT", "Kraken"),
+    ]
+    assert [g["count"] for g in call(table="quotes", group_by="")] == [6]
@@ -0,0 +1,196 @@
+"""Tests for indexed opportunity queries."""
+
+import asyncio
+import dataclasses
+import pytest
+import sys
+import os
+
+from fastapi import HTTPException, Response
+
+# Add backend root to Python path
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+)
+
+from arbitrage_engine.engine import ArbitrageEngine
+from arbitrage_engine.index import (
+    InvalidCursor,
+    OpportunityIndex,
+    decode_cursor,
+    query_opportunities,
+)
+from arbitrage_engine.runner import CoalescingEngineRunner
+from arbitrage_engine.snapshot import InMemoryRedis, SnapshotStore
+from api_gateway.routes.arbitrage import get_opportunities
+from backend.mcp.mcpTools.arbitrage_tools import ArbitrageTools
+
+
+def many_opportunities():
+    """Build a larger set of opportunities from the demo rows."""
+    base = ArbitrageEngine(demo_mode=True).get_demo_data()
+    opportunities = []
+    for i in range(20):
+        for opp in base:
+            opportunities.append(
+                dataclasses.replace(
+                    opp,
+                    buy_exchange=f"{opp.buy_exchange}{i % 4}",
+                    net_profit_pct=round(opp.net_profit_pct + i * 0.01, 4),
+                )
+            )
+    return opportunities
+
+
+@pytest.fixture
+def index():
+    """Create an index over the sample opportunities."""
+    return OpportunityIndex(many_opportunities())
+
+
+def test_unfiltered_query_is_sorted_by_profit(index):
+    """Test that results are ordered by net profit."""
+    results, next_cursor = index.query()
+
+    assert len(results) == 100
+    assert next_cursor is None
+    profits = [opp.net_profit_pct for opp in results]
+    assert profits == sorted(profits, reverse=True)
+
+
+def test_filters_match_linear_scan(index):
+    """Test indexed filters against a brute-force scan."""
+    everything = index.opportunities
+    cases = [
+        {"symbol": "BTC/USDT"},
+        {"exchange": "Kraken"},
+        {"exchange": "Binance1"},
+        {"symbol": "ETH/USDT", "exchange": "KuCoin2"},
+        {"min_net_profit": 0.4},
+        {"symbol": "SOL/USDT", "min_net_profit": 0.35},
+    ]
+
+    for case in cases:
+        expected = [
+            opp
+            for opp in everything
+            if opp.symbol == case.get("symbol", opp.symbol)
+            and case.get("exchange", opp.buy_exchange)
+            in (opp.buy_exchange, opp.sell_exchange)
+            and opp.net_profit_pct >= case.get("min_net_profit", float("-inf"))
+        ]
+        results, _ = index.query(**case)
+        assert results == expected, case
+
+
+def test_pagination_walks_every_result_once(index):
+    """Test that following cursors returns each match exactly once."""
+    seen = []
+    cursor = None
+    while True:
+        page, cursor = index.query(exchange="Coinbase", limit=7, cursor=cursor)
+        seen.extend(page)
+        if cursor is None:
+            break
+
+    expected, _ = index.query(exchange="Coinbase")
+    assert seen == expected
+
+
+def test_cursor_survives_snapshot_changes(index):
+    """Test that a cursor keeps its position in a new snapshot."""
+    page, cursor = index.query(limit=10)
+    rebuilt = OpportunityIndex(list(reversed(index.opportunities)))
+
+    next_page, _ = rebuilt.query(limit=10, cursor=cursor)
+
+    assert next_page == index.opportunities[10:20]
+
+
+def test_invalid_cursor(index):
+    """Test that malformed cursors are rejected."""
+    with pytest.raises(InvalidCursor):
+        index.query(cursor="not-a-cursor")
+    with pytest.raises(InvalidCursor):
+        decode_cursor("W10")
+
+
+def test_query_uses_snapshot_index():
+    """Test that the snapshot's cached index is reused between calls."""
+    store = SnapshotStore(InMemoryRedis())
+    store.publish(many_opportunities())
+    runner = CoalescingEngineRunner(ArbitrageEngine(demo_mode=True))
+
+    async def scenario():
+        first = await query_opportunities(store, runner, symbol="BTC/USDT", limit=5)
+        index = store.get_fresh().index
+        second = await query_opportunities(store, runner, symbol="BTC/USDT", limit=5)
+        return first, second, index is store.get_fresh().index
+
+    first, second, reused = asyncio.run(scenario())
+
+    assert first.snapshot_version == 1
+    assert len(first.opportunities) == 5
+    assert first.next_cursor is not None
+    assert second.opportunities == first.opportunities
+    assert reused
+    assert runner.computations == 0
+
+
+def test_route_pagination_headers():
+    """Test that the route exposes the next cursor."""
+    store = SnapshotStore(InMemoryRedis())
+    store.publish(many_opportunities())
+    response = Response()
+
+    result = asyncio.run(
+        get_opportunities(
+            response=response,
+            symbol="XRP/USDT",
+            limit=3,
+            api_key=None,
+            runner=CoalescingEngineRunner(ArbitrageEngine(demo_mode=True)),
+            store=store,
+        )
+    )
+
+    assert len(result) == 3
+    assert all(opp["symbol"] == "XRP/USDT" for opp in result)
+    assert "X-Next-Cursor" in response.headers
+
+
+def test_route_rejects_bad_cursor():
+    """Test that an invalid cursor is a client error."""
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(
+            get_opportunities(
+                response=Response(),
+                limit=None,
+                cursor="bad",
+                api_key=None,
+                runner=CoalescingEngineRunner(ArbitrageEngine(demo_mode=True)),
+                store=SnapshotStore(InMemoryRedis()),
+            )
+        )
+
+    assert exc_info.value.status_code == 400
+
+
+def test_mcp_tool_uses_index():
+    """Test that the MCP tool filters through the snapshot index."""
+    store = SnapshotStore(InMemoryRedis())
+    store.publish(many_opportunities())
+    runner = CoalescingEngineRunner(ArbitrageEngine(demo_mode=True))
+    tools = ArbitrageTools(store=store, runner=runner)
+
+    result = asyncio.run(
+        tools.execute(
+            "find_opportunities",
+            {"symbol": "ETH/USDT", "min_profit_pct": 0.5, "limit": 4},
+        )
+    )
+
+    assert result["count"] == 4
+    assert all(opp["symbol"] == "ETH/USDT" for opp in result["opportunities"])
+    assert all(opp["net_profit_pct"] >= 0.5 for opp in result["opportunities"])
+    assert runner.computations == 0
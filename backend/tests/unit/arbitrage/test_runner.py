@@ -0,0 +1,93 @@
+"""Tests for the coalescing engine runner."""
+
+import asyncio
+import threading
+import time
+import sys
+import os
+
+# Add backend root to Python path
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+)
+
+from arbitrage_engine.engine import ArbitrageEngine
+from arbitrage_engine.runner import CoalescingEngineRunner
+
+
+class SlowEngine(ArbitrageEngine):
+    """Demo engine whose scans block for a fixed time."""
+
+    def __init__(self, delay: float = 0.2):
+        super().__init__(demo_mode=True)
+        self.delay = delay
+        self.calls = 0
+        self.threads = set()
+
+    def find_opportunities(self):
+        self.calls += 1
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        return self.get_demo_data()
+
+
+def test_concurrent_callers_share_one_scan():
+    """Test that concurrent callers coalesce onto one computation."""
+    engine = SlowEngine()
+    runner = CoalescingEngineRunner(engine)
+
+    async def scenario():
+        return await asyncio.gather(*(runner.find_opportunities() for _ in range(10)))
+
+    results = asyncio.run(scenario())
+
+    assert engine.calls == 1
+    assert all(len(result) == 5 for result in results)
+    assert runner.get_statistics()["coalesced_requests"] == 9
+
+
+def test_sequential_callers_start_new_scans():
+    """Test that a finished scan is not reused."""
+    engine = SlowEngine(delay=0)
+    runner = CoalescingEngineRunner(engine)
+
+    async def scenario():
+        await runner.find_opportunities()
+        await runner.find_opportunities()
+
+    asyncio.run(scenario())
+
+    assert engine.calls == 2
+
+
+def test_scan_does_not_block_event_loop():
+    """Test that other coroutines run while a scan is in progress."""
+    engine = SlowEngine(delay=0.3)
+    runner = CoalescingEngineRunner(engine)
+
+    async def scenario():
+        scan = asyncio.ensure_future(runner.find_opportunities())
+        started = time.monotonic()
+        await asyncio.sleep(0.01)
+        ticked_after = time.monotonic() - started
+        await scan
+        return ticked_after
+
+    assert asyncio.run(scenario()) < 0.2
+    assert all(name.startswith("arbitrage-engine") for name in engine.threads)
+
+
+def test_cancelled_caller_does_not_cancel_shared_scan():
+    """Test that cancelling one waiter leaves the scan running for others."""
+    engine = SlowEngine(delay=0.1)
+    runner = CoalescingEngineRunner(engine)
+
+    async def scenario():
+        first = asyncio.ensure_future(runner.find_opportunities())
+        second = asyncio.ensure_future(runner.find_opportunities())
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert len(asyncio.run(scenario())) == 5
+    assert engine.calls == 1
@@ -0,0 +1,98 @@
+"""Tests for the synthetic market simulator."""
+
+import sys
+import os
+
+# Add backend root to Python path
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+)
+
+from arbitrage_engine.engine import ArbitrageEngine
+from arbitrage_engine.simulator import MarketSimulator, SimulatedConnector
+
+
+def prices(simulator: MarketSimulator):
+    """Get the current last price for every symbol and exchange."""
+    return [
+        simulator.get_ticker(exchange, symbol)["last"]
+        for symbol in simulator.symbols
+        for exchange in simulator.exchanges
+    ]
+
+
+def test_seeded_runs_are_reproducible():
+    """Test that the same seed produces the same price path."""
+    first = MarketSimulator(seed=7, tick_rate=0)
+    second = MarketSimulator(seed=7, tick_rate=0)
+    first.step(50)
+    second.step(50)
+
+    assert prices(first) == prices(second)
+
+
+def test_symbol_count_extends_beyond_defaults():
+    """Test that extra symbols are synthesized."""
+    simulator = MarketSimulator(symbol_count=20, seed=1)
+
+    assert len(simulator.symbols) == 20
+    assert len(set(simulator.symbols)) == 20
+    assert simulator.symbols[0] == "BTC/USDT"
+    assert all(price > 0 for price in prices(simulator))
+
+
+def test_ticker_bid_below_ask():
+    """Test that tickers quote a positive spread around the price."""
+    simulator = MarketSimulator(seed=3)
+    ticker = simulator.get_ticker("Binance", "ETH/USDT")
+
+    assert ticker["bid"] < ticker["last"] < ticker["ask"]
+
+
+def test_venues_stay_correlated():
+    """Test that venues track the shared price outside spread events."""
+    simulator = MarketSimulator(seed=5, tick_rate=0, min_active_events=0, event_rate=0)
+    simulator.step(500)
+
+    btc = [
+        simulator.get_ticker(name, "BTC/USDT")["last"] for name in simulator.exchanges
+    ]
+    assert (max(btc) - min(btc)) / min(btc) < 0.005
+
+
+def test_advance_applies_ticks_from_elapsed_time():
+    """Test that wall-clock time drives the tick count."""
+    simulator = MarketSimulator(seed=2, tick_rate=100)
+    simulator._last_advance -= 0.5
+    simulator.advance()
+
+    assert 45 <= simulator.ticks <= 60
+
+
+def test_engine_detects_spread_events():
+    """Test that the engine finds opportunities in the simulated market."""
+    simulator = MarketSimulator(seed=11, tick_rate=0)
+    engine = ArbitrageEngine(simulator=simulator)
+
+    assert all(isinstance(c, SimulatedConnector) for c in engine.exchanges.values())
+    assert engine.watched_symbols == simulator.symbols
+
+    opportunities = engine.find_opportunities()
+    event = simulator.events[0]
+    symbol = simulator.symbols[event.symbol_index]
+    exchange = simulator.exchanges[event.exchange_index]
+
+    assert opportunities
+    assert any(
+        opp.symbol == symbol and exchange in (opp.buy_exchange, opp.sell_exchange)
+        for opp in opportunities
+    )
+
+
+def test_demo_engine_uses_simulator():
+    """Test that demo mode creates its own simulated market."""
+    engine = ArbitrageEngine(demo_mode=True)
+
+    assert engine.simulator is not None
+    assert engine.get_statistics()["simulated"] is True
+    assert len(engine.find_opportunities()) > 0
@@ -0,0 +1,123 @@
+"""Tests for opportunity snapshots."""
+
+import asyncio
+import pytest
+import time
+import sys
+import os
+
+from fastapi import Response
+
+# Add backend root to Python path
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+)
+
+from arbitrage_engine.engine import ArbitrageEngine
+from arbitrage_engine.runner import CoalescingEngineRunner
+from arbitrage_engine.snapshot import InMemoryRedis, SnapshotStore
+from api_gateway.routes.arbitrage import get_opportunities
+
+
+class CountingEngine(ArbitrageEngine):
+    """Demo engine that counts find_opportunities calls."""
+
+    def __init__(self):
+        super().__init__(demo_mode=True)
+        self.calls = 0
+
+    def find_opportunities(self):
+        self.calls += 1
+        return self.get_demo_data()
+
+
+@pytest.fixture
+def store():
+    """Create a snapshot store backed by the in-memory client."""
+    return SnapshotStore(InMemoryRedis())
+
+
+def test_publish_and_read_roundtrip(store):
+    """Test that published opportunities can be read back."""
+    opportunities = ArbitrageEngine(demo_mode=True).get_demo_data()
+
+    published = store.publish(opportunities)
+    latest = store.get_latest()
+
+    assert latest is not None
+    assert latest.version == published.version
+    assert latest.opportunities == opportunities
+
+
+def test_versions_increase(store):
+    """Test that each publish gets a new version."""
+    first = store.publish([])
+    second = store.publish([])
+
+    assert second.version == first.version + 1
+    assert store.get_latest().version == second.version
+
+
+def test_missing_snapshot(store):
+    """Test reading before anything is published."""
+    assert store.get_latest() is None
+    assert store.get_fresh() is None
+
+
+def test_stale_snapshot_is_not_fresh(store):
+    """Test that old snapshots are rejected by get_fresh."""
+    snapshot = store.publish([])
+    snapshot.generated_at = int((time.time() - 120) * 1000)
+    store.client.set(store.key, snapshot.to_json())
+
+    assert store.get_latest() is not None
+    assert store.get_fresh(max_age=30) is None
+
+
+def test_in_memory_redis_expiry():
+    """Test key expiry in the in-memory client."""
+    client = InMemoryRedis()
+    client.set("key", "value", px=10)
+
+    assert client.get("key") == "value"
+    time.sleep(0.02)
+    assert client.get("key") is None
+
+
+def test_route_serves_fresh_snapshot(store):
+    """Test that the route serves the snapshot without running the engine."""
+    engine = CountingEngine()
+    store.publish(engine.get_demo_data()[:2])
+    response = Response()
+
+    result = asyncio.run(
+        get_opportunities(
+            response=response,
+            limit=None,
+            api_key=None,
+            runner=CoalescingEngineRunner(engine),
+            store=store,
+        )
+    )
+
+    assert len(result) == 2
+    assert engine.calls == 0
+    assert response.headers["X-Snapshot-Version"] == "1"
+
+
+def test_route_falls_back_when_stale(store):
+    """Test that the route computes locally without a fresh snapshot."""
+    engine = CountingEngine()
+
+    result = asyncio.run(
+        get_opportunities(
+            response=Response(),
+            limit=None,
+            api_key=None,
+            runner=CoalescingEngineRunner(engine),
+            store=store,
+        )
+    )
+
+    assert len(result) == 5
+    assert engine.calls == 1
@@ -0,0 +1,126 @@
+"""Tests for opportunity delta streaming."""
+
+import asyncio
+import dataclasses
+import sys
+import os
+
+# Add backend root to Python path
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+)
+
+from arbitrage_engine.engine import ArbitrageEngine
+from arbitrage_engine.runner import CoalescingEngineRunner
+from arbitrage_engine.snapshot import InMemoryRedis, SnapshotStore
+from arbitrage_engine.stream import (
+    OpportunityBroadcaster,
+    diff_opportunities,
+    format_sse,
+    opportunity_key,
+)
+
+
+def demo_opportunities():
+    """Get the demo opportunities."""
+    return ArbitrageEngine(demo_mode=True).get_demo_data()
+
+
+def make_broadcaster(max_queue: int = 32) -> OpportunityBroadcaster:
+    """Create a broadcaster over an in-memory store and demo engine."""
+    return OpportunityBroadcaster(
+        SnapshotStore(InMemoryRedis()),
+        CoalescingEngineRunner(ArbitrageEngine(demo_mode=True)),
+        interval=60,
+        max_queue=max_queue,
+    )
+
+
+def test_diff_opens_updates_and_closes():
+    """Test change detection between cycles."""
+    first = demo_opportunities()
+    previous = {opportunity_key(opp): opp for opp in first}
+
+    moved = dataclasses.replace(first[0], sell_price=first[0].sell_price + 1)
+    current = [moved] + first[1:3]
+
+    changes = diff_opportunities(previous, current)
+    types = sorted(change["type"] for change in changes)
+
+    assert types == ["close", "close", "update"]
+
+
+def test_diff_ignores_timestamp_only_changes():
+    """Test that a re-observed opportunity is not resent."""
+    first = demo_opportunities()
+    previous = {opportunity_key(opp): opp for opp in first}
+    current = [dataclasses.replace(opp, timestamp=opp.timestamp + 1) for opp in first]
+
+    assert diff_opportunities(previous, current) == []
+
+
+def test_subscribers_receive_snapshot_then_deltas():
+    """Test that a subscriber sees the snapshot and later changes."""
+
+    async def scenario():
+        broadcaster = make_broadcaster()
+        opportunities = demo_opportunities()
+        broadcaster.publish(opportunities)
+
+        subscription = broadcaster.subscribe()
+        assert len(subscription.snapshot) == 5
+
+        broadcaster.publish(opportunities[:4])
+        batch = subscription.queue.get_nowait()
+        broadcaster.unsubscribe(subscription)
+        return batch
+
+    batch = asyncio.run(scenario())
+
+    assert batch["version"] == 2
+    assert [change["type"] for change in batch["changes"]] == ["close"]
+
+
+def test_slow_consumer_is_dropped():
+    """Test that a client with a full queue is disconnected."""
+
+    async def scenario():
+        broadcaster = make_broadcaster(max_queue=2)
+        slow = broadcaster.subscribe()
+        opportunities = demo_opportunities()
+
+        for count in (5, 4, 3):
+            broadcaster.publish(opportunities[:count])
+
+        stats = broadcaster.get_statistics()
+        broadcaster.unsubscribe(slow)
+        return slow, stats
+
+    slow, stats = asyncio.run(scenario())
+
+    assert slow.dropped is True
+    assert stats["dropped_clients"] == 1
+    assert stats["subscribers"] == 0
+
+
+def test_refresh_only_publishes_new_snapshot_versions():
+    """Test that the same snapshot version is not diffed twice."""
+
+    async def scenario():
+        broadcaster = make_broadcaster()
+        broadcaster.store.publish(demo_opportunities())
+
+        await broadcaster.refresh()
+        first_version = broadcaster.version
+        await broadcaster.refresh()
+        return first_version, broadcaster.version
+
+    first_version, second_version = asyncio.run(scenario())
+
+    assert first_version == 1
+    assert second_version == 1
+
+
+def test_format_sse():
+    """Test server-sent event encoding."""
+    assert format_sse("delta", {"a": 1}) == 'event: delta\ndata: {"a": 1}\n\n'
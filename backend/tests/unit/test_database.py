@@ -10,14 +10,22 @@ from datetime import datetime
 # Add parent directories to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-from database import Base, User, Subscription, Trade, MarketBooth, NFTItem
+from database import (
+    Base,
+    User,
+    Subscription,
+    Trade,
+    MarketBooth,
+    NFTItem,
+    NFTTransaction,
+)
 from api_gateway.utils.auth_utils import (
     hash_password,
     verify_password,
     generate_api_key,
+    hash_api_key,
 )
 
-
 # Create in-memory SQLite database for testing
 TEST_DATABASE_URL = "sqlite:///:memory:"
 
@@ -50,7 +58,7 @@ class TestUserModel:
             username="testuser",
             email="test@example.com",
             hashed_password=hash_password("password123"),
-            api_key=generate_api_key(),
+            api_key_hash=hash_api_key(generate_api_key()),
             is_active=True,
         )
         db_session.add(user)
@@ -312,7 +320,6 @@ class TestNFTItemModel:
             booth_id=booth.id,
             featured=True,
             nft_attributes={"collection": "TestCollection"},
-            transaction_history=[],
             created_at=int(datetime.now().timestamp() * 1000),
         )
         db_session.add(nft)
@@ -366,6 +373,55 @@ class TestNFTItemModel:
         assert len(user.nfts) == 1
         assert user.nfts[0].name == "Test NFT"
 
+    def test_nft_transactions_append_without_loading(self, db_session):
+        """Test that transactions are appended without loading the history."""
+        user = User(
+            id="test-user-1",
+            username="testuser",
+            email="test@example.com",
+            hashed_password=hash_password("password123"),
+        )
+        booth = MarketBooth(id="test-booth-1", user_id=user.id)
+        nft = NFTItem(
+            id="test-nft-1",
+            name="Test NFT",
+            price=100.0,
+            creator_id=user.id,
+            creator=user.username,
+            owner_id=user.id,
+            booth_id=booth.id,
+            created_at=1,
+        )
+        db_session.add_all([user, booth, nft])
+        nft.transactions.add(
+            NFTTransaction(
+                id="tx-1",
+                type="mint",
+                from_address="0x0",
+                to_address=user.id,
+                timestamp=1,
+            )
+        )
+        db_session.commit()
+
+        nft.transactions.add(
+            NFTTransaction(
+                id="tx-2",
+                type="sale",
+                from_address=user.id,
+                to_address="0xbuyer",
+                price=120.0,
+                timestamp=2,
+            )
+        )
+        db_session.commit()
+
+        history = db_session.scalars(
+            nft.transactions.select().order_by(NFTTransaction.timestamp)
+        ).all()
+        assert [tx.id for tx in history] == ["tx-1", "tx-2"]
+        assert history[1].nft is nft
+
 
 class TestCascadeDeletes:
     """Tests for cascade delete behavior."""
@@ -0,0 +1,131 @@
+"""Tests for connection pool configuration, statistics and replica routing."""
+
+import asyncio
+import pytest
+from sqlalchemy import create_engine, exc, text
+import sys
+import os
+
+# Add parent directories to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from database import db as database_db
+from database.pool import (
+    DB_POOL_SIZE,
+    TimedAsyncQueuePool,
+    TimedQueuePool,
+    get_pool_statistics,
+    pool_options,
+)
+
+
+@pytest.fixture
+def pooled_engine(tmp_path):
+    """Create a file-backed engine with one pooled and one overflow connection."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=TimedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.05,
+    )
+    yield engine
+    engine.dispose()
+
+
+def test_pool_options_by_url():
+    """Test that pooling is configured except for in-memory SQLite."""
+    assert pool_options("sqlite:///:memory:") == {}
+    assert pool_options("sqlite://") == {}
+
+    options = pool_options("postgresql://user:pw@db/alphanest")
+    assert options["poolclass"] is TimedQueuePool
+    assert options["pool_size"] == DB_POOL_SIZE
+    assert set(options) == {
+        "poolclass",
+        "pool_size",
+        "max_overflow",
+        "pool_recycle",
+        "pool_timeout",
+    }
+
+    async_options = pool_options("postgresql+asyncpg://db/alphanest", is_async=True)
+    assert async_options["poolclass"] is TimedAsyncQueuePool
+
+
+def test_checkout_statistics(pooled_engine):
+    """Test that overflow checkouts and timeouts are counted."""
+    first = pooled_engine.connect()
+    second = pooled_engine.connect()
+
+    with pytest.raises(exc.TimeoutError):
+        pooled_engine.connect()
+
+    stats = get_pool_statistics(pooled_engine)
+    assert stats["checked_out"] == 2
+    assert stats["overflow"] == 1
+    assert stats["checkouts"] == 2
+    assert stats["overflow_hits"] == 1
+    assert stats["timeouts"] == 1
+    assert stats["wait"]["max"] >= 0.05
+
+    first.close()
+    second.close()
+    with pooled_engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+    stats = get_pool_statistics(pooled_engine)
+    assert stats["checked_out"] == 0
+    assert stats["checkouts"] == 3
+    assert stats["overflow_hits"] == 1
+
+
+def test_statistics_survive_dispose(pooled_engine):
+    """Test that recreating the pool keeps its counters."""
+    pooled_engine.connect().close()
+    pooled_engine.dispose()
+
+    assert get_pool_statistics(pooled_engine)["checkouts"] == 1
+
+
+def test_read_sessions_rotate_across_replicas(tmp_path, monkeypatch):
+    """Test that read sessions use each replica in turn."""
+    replicas = [f"sqlite:///{tmp_path / name}" for name in ("r1.db", "r2.db")]
+    monkeypatch.setattr(database_db, "DATABASE_REPLICA_URLS", replicas)
+    monkeypatch.setattr(database_db, "_replica_session_factories", None)
+
+    factories = database_db.get_replica_session_factories()
+    picked = [database_db.get_read_session_factory() for _ in range(3)]
+
+    assert picked == [factories[0], factories[1], factories[0]]
+    assert "replica_1" in database_db.get_database_pool_statistics()
+
+    for factory in factories:
+        asyncio.run(factory.kw["bind"].dispose())
+
+
+def test_read_sessions_fall_back_to_primary(monkeypatch):
+    """Test that reads use the primary when no replica is configured."""
+    primary = object()
+    monkeypatch.setattr(database_db, "DATABASE_REPLICA_URLS", [])
+    monkeypatch.setattr(database_db, "_replica_session_factories", None)
+    monkeypatch.setattr(database_db, "_async_session_factory", primary)
+
+    assert database_db.get_read_session_factory() is primary
+
+
+def test_async_url_resolved_on_first_use(tmp_path, monkeypatch):
+    """Test that the async URL is only derived when the async engine is made."""
+    monkeypatch.setattr(database_db, "DATABASE_URL", "mysql://user@db/alphanest")
+    monkeypatch.setattr(database_db, "ASYNC_DATABASE_URL", None)
+    monkeypatch.setattr(database_db, "_async_engine", None)
+
+    with pytest.raises(ValueError):
+        database_db.get_async_engine()
+
+    url = f"sqlite+aiosqlite:///{tmp_path / 'async.db'}"
+    monkeypatch.setattr(database_db, "ASYNC_DATABASE_URL", url)
+    engine = database_db.get_async_engine()
+
+    assert engine.url.render_as_string() == url
+    asyncio.run(engine.dispose())
@@ -0,0 +1,201 @@
+"""Tests for per-job scheduler metrics and the metrics endpoint."""
+
+import asyncio
+import json
+import threading
+import time
+import sys
+import os
+
+import pytest
+
+# Add backend root to Python path
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+)
+
+from worker.metrics import DURATION_BUCKETS, JobMetrics, call_profiled
+from worker.scheduler import TaskScheduler
+
+
+def run_for(scheduler: TaskScheduler, seconds: float):
+    """Run the scheduler on a fresh event loop for a fixed time."""
+
+    async def scenario():
+        task = asyncio.create_task(scheduler.run())
+        await asyncio.sleep(seconds)
+        scheduler.stop()
+        await task
+
+    asyncio.run(scenario())
+
+
+def slow_function(seconds):
+    """Busy loop so the profiler has frames to record."""
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(100))
+
+
+def test_job_metrics_histogram_and_errors():
+    """Test that durations land in cumulative buckets and errors are kept."""
+    metrics = JobMetrics()
+    metrics.record_start(0.01, overlapping=False)
+    metrics.record_finish(0.003)
+    metrics.record_start(-0.5, overlapping=True)
+    metrics.record_finish(120.0, ValueError("boom"))
+
+    data = metrics.to_dict()
+
+    assert data["runs"] == 2
+    assert data["successes"] == 1
+    assert data["failures"] == 1
+    assert data["overlaps"] == 1
+    assert data["last_error"] == "ValueError: boom"
+    # Negative lateness (early wakeup) is clamped
+    assert data["lateness"]["last"] == 0.0
+    assert data["lateness"]["max"] == pytest.approx(0.01)
+
+    histogram = data["duration"]["histogram"]
+    assert histogram[str(DURATION_BUCKETS[0])] == 1
+    assert histogram[str(DURATION_BUCKETS[-1])] == 1
+    assert histogram["+Inf"] == 2
+    assert data["duration"]["mean"] == pytest.approx(60.0015)
+
+
+def test_call_profiled_keeps_only_slow_runs():
+    """Test that profiles are kept only above the threshold."""
+    result, duration, stats = call_profiled(sum, ([1, 2],), {}, threshold=10)
+    assert result == 3
+    assert stats is None
+
+    _, duration, stats = call_profiled(slow_function, (0.02,), {}, threshold=0.01)
+    assert duration >= 0.02
+    assert "slow_function" in stats
+
+
+def test_overlapping_profiled_runs_do_not_fail():
+    """Test that a run overlapping a profiled run executes unprofiled."""
+    entered = threading.Event()
+    release = threading.Event()
+    results = {}
+
+    def held():
+        entered.set()
+        release.wait(5)
+        slow_function(0.01)
+        return "first"
+
+    def first():
+        results["first"] = call_profiled(held, (), {}, threshold=0)
+
+    thread = threading.Thread(target=first)
+    thread.start()
+    assert entered.wait(5)
+    try:
+        results["second"] = call_profiled(sum, ([1, 2],), {}, threshold=0)
+    finally:
+        release.set()
+        thread.join(5)
+
+    assert results["second"][0] == 3
+    assert results["second"][2] is None
+    assert results["first"][0] == "first"
+    assert "slow_function" in results["first"][2]
+
+    # The profiler is free again once the overlapping runs finish
+    _, _, stats = call_profiled(slow_function, (0.01,), {}, threshold=0)
+    assert "slow_function" in stats
+
+
+def test_scheduler_records_runs_failures_and_lateness():
+    """Test run counts, failures and lateness for scheduled jobs."""
+    scheduler = TaskScheduler()
+    calls = []
+
+    def failing():
+        calls.append(1)
+        if len(calls) % 2 == 0:
+            raise RuntimeError("every other run")
+
+    scheduler.add_job(failing, 0.05, job_id="flaky", executor="thread")
+    run_for(scheduler, 0.33)
+
+    metrics = scheduler.get_job_metrics("flaky")
+    assert metrics["runs"] == len(calls) >= 5
+    assert metrics["failures"] == len(calls) // 2
+    assert metrics["successes"] == len(calls) - len(calls) // 2
+    assert metrics["last_error"] == "RuntimeError: every other run"
+    assert 0 <= metrics["lateness"]["max"] < 0.05
+    assert metrics["duration"]["histogram"]["+Inf"] == len(calls)
+
+
+def test_scheduler_counts_overlaps_and_overruns():
+    """Test that overlapping and skipped runs are counted."""
+    scheduler = TaskScheduler()
+    scheduler.add_job(
+        time.sleep, 0.05, 0.18, job_id="slow", executor="thread", max_instances=2
+    )
+    run_for(scheduler, 0.4)
+
+    metrics = scheduler.get_job_metrics("slow")
+    assert metrics["overlaps"] >= 1
+    assert metrics["overruns_skipped"] >= 1
+    assert metrics["runs"] >= 2
+
+
+def test_scheduler_captures_slow_run_profiles():
+    """Test that runs over the profile threshold keep their profile."""
+    scheduler = TaskScheduler(profile_threshold=0.01)
+    scheduler.add_job(slow_function, 0.05, 0.02, job_id="busy", executor="thread")
+    scheduler.add_job(
+        slow_function, 0.05, 0.0, job_id="quick", executor="thread", profile_threshold=1
+    )
+    run_for(scheduler, 0.2)
+
+    busy = scheduler.get_job_metrics("busy", include_profiles=True)
+    assert busy["profiles_captured"] >= 1
+    assert "slow_function" in busy["profiles"][0]["stats"]
+    assert scheduler.get_job_metrics("quick")["profiles_captured"] == 0
+
+    with pytest.raises(KeyError):
+        scheduler.get_job_metrics("missing")
+
+
+async def http_get(port: int, path: str):
+    """Issue a GET request and return the status code and decoded body."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, body = response.split(b"\r\n\r\n", 1)
+    return int(head.split()[1]), json.loads(body)
+
+
+def test_metrics_endpoint():
+    """Test that the HTTP endpoint serves job metrics."""
+    scheduler = TaskScheduler(metrics_port=0)
+    scheduler.add_job(lambda: None, 0.02, job_id="noop")
+
+    async def scenario():
+        task = asyncio.create_task(scheduler.run())
+        await asyncio.sleep(0.1)
+        port = scheduler.metrics_server.port
+        responses = [
+            await http_get(port, "/jobs"),
+            await http_get(port, "/jobs/noop"),
+            await http_get(port, "/jobs/missing"),
+        ]
+        scheduler.stop()
+        await task
+        return responses
+
+    (status, jobs), (job_status, job), (missing_status, _) = asyncio.run(scenario())
+
+    assert status == 200
+    assert jobs["noop"]["runs"] >= 1
+    assert jobs["noop"]["executor"] == "thread"
+    assert job_status == 200
+    assert job["profiles"] == []
+    assert missing_status == 404
@@ -0,0 +1,86 @@
+"""Tests for poll scheduling and adaptive intervals."""
+
+import sys
+import os
+
+import numpy as np
+
+# Add backend root to Python path
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+)
+
+from worker.pacing import AdaptiveInterval, MonotonicTicker, cross_exchange_spread
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ticker_does_not_drift_with_work_time():
+    """Test that deadlines stay on the start + n * interval grid."""
+    clock = FakeClock()
+    ticker = MonotonicTicker(10, clock=clock)
+
+    for n in range(1, 6):
+        clock.now += 3  # Work takes 3s each cycle
+        assert ticker.advance() == 0
+        assert ticker.deadline == 100 + n * 10
+        clock.now = ticker.deadline
+
+    assert ticker.ticks == 5
+    assert ticker.skipped == 0
+
+
+def test_ticker_skips_overrun_ticks():
+    """Test that overrunning deadlines skips ticks instead of bursting."""
+    clock = FakeClock()
+    ticker = MonotonicTicker(10, clock=clock)
+
+    clock.now += 25  # Overruns the deadlines at 110 and 120
+    assert ticker.advance() == 2
+    assert ticker.deadline == 130
+    assert ticker.delay() == 5
+    assert not ticker.is_due()
+    assert ticker.skipped == 2
+
+
+def test_cross_exchange_spread():
+    """Test the widest spread across venues."""
+    prices = {
+        "A": {"bid": 100.0, "ask": 100.1},
+        "B": {"bid": 101.0, "ask": 101.1},
+        "C": {"bid": 0, "ask": 0},
+    }
+
+    assert cross_exchange_spread(prices) == (101.0 - 100.1) / 100.1 * 100
+    assert cross_exchange_spread({"A": prices["A"]}) is None
+
+
+def test_adaptive_interval_follows_variance():
+    """Test that rising variance shortens and calm lengthens the interval."""
+    rng = np.random.default_rng(0)
+    adaptive = AdaptiveInterval(10)
+
+    assert adaptive.interval("BTC/USDT") == 10
+
+    for value in rng.normal(0, 0.05, 200):
+        adaptive.observe("BTC/USDT", value)
+        adaptive.observe("ETH/USDT", value)
+    steady = adaptive.interval("BTC/USDT")
+
+    for value in rng.normal(0, 0.5, 5):
+        adaptive.observe("BTC/USDT", value)
+    for value in rng.normal(0, 0.001, 30):
+        adaptive.observe("ETH/USDT", value)
+
+    assert 5 < steady < 20
+    assert adaptive.interval("BTC/USDT") < steady
+    assert adaptive.interval("ETH/USDT") == 40
+    assert set(adaptive.get_statistics()) == {"BTC/USDT", "ETH/USDT"}
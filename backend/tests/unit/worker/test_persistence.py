@@ -0,0 +1,145 @@
+"""Tests for buffered opportunity persistence."""
+
+import pytest
+import time
+import sys
+import os
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Add backend root to Python path
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+)
+
+from arbitrage_engine.engine import ArbitrageEngine
+from database import Base, Trade
+from worker.persistence import OpportunityRecorder
+
+
+@pytest.fixture
+def db_engine():
+    """Create a shared in-memory SQLite engine."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+
+
+def count_trades(engine) -> int:
+    """Count rows in the trades table."""
+    session = sessionmaker(bind=engine)()
+    try:
+        return session.query(Trade).count()
+    finally:
+        session.close()
+
+
+def wait_for(predicate, timeout: float = 5.0) -> bool:
+    """Poll a predicate until it is true or the timeout expires."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_record_does_not_write_until_flush(db_engine):
+    """Test that record only buffers rows."""
+    recorder = OpportunityRecorder(db_engine=db_engine)
+    opportunities = ArbitrageEngine(demo_mode=True).get_demo_data()
+
+    recorder.record(opportunities)
+
+    assert recorder.pending() == len(opportunities)
+    assert count_trades(db_engine) == 0
+
+    assert recorder.flush() == len(opportunities)
+    assert recorder.pending() == 0
+    assert count_trades(db_engine) == len(opportunities)
+
+
+def test_flushed_rows_match_opportunities(db_engine):
+    """Test that opportunities map onto trade columns."""
+    recorder = OpportunityRecorder(db_engine=db_engine)
+    opp = ArbitrageEngine(demo_mode=True).get_demo_data()[0]
+
+    recorder.record([opp])
+    recorder.flush()
+
+    session = sessionmaker(bind=db_engine)()
+    trade = session.query(Trade).one()
+    session.close()
+
+    assert trade.user_id is None
+    assert trade.pair == opp.symbol
+    assert trade.buy_exchange == opp.buy_exchange
+    assert trade.profit_percentage == opp.net_profit_pct
+    assert trade.executed is False
+
+
+def test_batched_inserts(db_engine):
+    """Test that large flushes are split into batches."""
+    recorder = OpportunityRecorder(db_engine=db_engine, batch_size=3)
+    opportunities = ArbitrageEngine(demo_mode=True).get_demo_data()
+
+    for _ in range(4):
+        recorder.record(opportunities)
+
+    assert recorder.flush() == 20
+    assert count_trades(db_engine) == 20
+
+
+def test_size_threshold_triggers_background_flush(db_engine):
+    """Test that reaching batch_size flushes without waiting for the timer."""
+    recorder = OpportunityRecorder(db_engine=db_engine, batch_size=5, flush_interval=60)
+    recorder.start()
+    try:
+        recorder.record(ArbitrageEngine(demo_mode=True).get_demo_data())
+        assert wait_for(lambda: count_trades(db_engine) == 5)
+    finally:
+        recorder.stop()
+
+
+def test_time_threshold_triggers_background_flush(db_engine):
+    """Test that a partial buffer is flushed after flush_interval."""
+    recorder = OpportunityRecorder(
+        db_engine=db_engine, batch_size=1000, flush_interval=0.05
+    )
+    recorder.start()
+    try:
+        recorder.record(ArbitrageEngine(demo_mode=True).get_demo_data()[:2])
+        assert wait_for(lambda: count_trades(db_engine) == 2)
+    finally:
+        recorder.stop()
+
+
+def test_stop_flushes_remaining_rows(db_engine):
+    """Test that stopping the recorder writes buffered rows."""
+    recorder = OpportunityRecorder(
+        db_engine=db_engine, batch_size=1000, flush_interval=60
+    )
+    recorder.start()
+    recorder.record(ArbitrageEngine(demo_mode=True).get_demo_data())
+    recorder.stop()
+
+    assert count_trades(db_engine) == 5
+    assert recorder.get_statistics()["rows_written"] == 5
+
+
+def test_buffer_overflow_drops_oldest_rows(db_engine):
+    """Test that the buffer is bounded."""
+    recorder = OpportunityRecorder(db_engine=db_engine, max_buffer=7)
+    opportunities = ArbitrageEngine(demo_mode=True).get_demo_data()
+
+    recorder.record(opportunities)
+    recorder.record(opportunities)
+
+    assert recorder.pending() == 7
+    assert recorder.get_statistics()["rows_dropped"] == 3
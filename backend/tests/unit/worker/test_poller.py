@@ -0,0 +1,116 @@
+"""Tests for the asyncio arbitrage poller."""
+
+import asyncio
+import time
+import sys
+import os
+
+import pytest
+
+# Add backend root to Python path
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+)
+
+from arbitrage_engine.simulator import MarketSimulator
+from arbitrage_engine.snapshot import InMemoryRedis, SnapshotStore
+from worker import poller as poller_module
+from worker.poller import ArbitragePoller
+
+
+def run_for(poller: ArbitragePoller, seconds: float):
+    """Run the poller on a fresh event loop for a fixed time."""
+
+    async def scenario():
+        task = asyncio.create_task(poller.run())
+        await asyncio.sleep(seconds)
+        poller.stop()
+        await task
+
+    asyncio.run(scenario())
+
+
+def test_poll_period_does_not_include_cycle_time():
+    """Test that slow cycles do not stretch the period."""
+    poller = ArbitragePoller(
+        poll_interval=0.1,
+        simulator=MarketSimulator(symbol_count=2, seed=1),
+        snapshot_store=SnapshotStore(InMemoryRedis()),
+    )
+    scan_symbol = poller.engine.scan_symbol
+
+    def slow_scan(symbol, timestamp=None):
+        time.sleep(0.04)
+        return scan_symbol(symbol, timestamp)
+
+    poller.engine.scan_symbol = slow_scan
+    run_for(poller, 1.02)
+
+    # Sleeping after the work would give ~7 cycles instead of ~11
+    assert 10 <= poller.cycles <= 12
+    assert poller.skipped_ticks == 0
+    assert poller.snapshot_store.get_latest().version == poller.cycles
+    assert set(poller.current) == {"BTC/USDT", "ETH/USDT"}
+
+
+def test_overrun_skips_ticks():
+    """Test that cycles longer than the interval skip instead of piling up."""
+    poller = ArbitragePoller(
+        poll_interval=0.05, simulator=MarketSimulator(symbol_count=1, seed=2)
+    )
+    scan_symbol = poller.engine.scan_symbol
+
+    def slow_scan(symbol, timestamp=None):
+        time.sleep(0.12)
+        return scan_symbol(symbol, timestamp)
+
+    poller.engine.scan_symbol = slow_scan
+    run_for(poller, 0.6)
+
+    assert 4 <= poller.cycles <= 6
+    assert poller.skipped_ticks >= 2 * (poller.cycles - 1)
+
+
+def test_adaptive_mode_sets_per_symbol_intervals():
+    """Test that adaptive polling assigns intervals per symbol."""
+    poller = ArbitragePoller(
+        poll_interval=0.02,
+        simulator=MarketSimulator(symbol_count=3, seed=3),
+        adaptive=True,
+    )
+    run_for(poller, 0.5)
+
+    intervals = poller.get_statistics()["intervals"]
+    assert set(intervals) == set(poller.engine.watched_symbols)
+    assert all(0.005 <= value <= 0.08 for value in intervals.values())
+    assert poller.adaptive.get_statistics()
+
+
+def test_idles_without_watched_symbols():
+    """Test that a poller with no symbols waits instead of failing."""
+    poller = ArbitragePoller(
+        poll_interval=0.05,
+        simulator=MarketSimulator(symbol_count=2, seed=1),
+        snapshot_store=SnapshotStore(InMemoryRedis()),
+    )
+    poller.engine.watched_symbols = []
+
+    run_for(poller, 0.2)
+
+    assert poller.tickers == {}
+    assert poller.cycles == 0
+
+
+def test_history_rejected_with_shards(monkeypatch, tmp_path):
+    """Test that sharded replicas cannot share one history store."""
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["poller", "--demo", "--shards", "4", "--history-dir", str(tmp_path)],
+    )
+
+    with pytest.raises(SystemExit) as exc_info:
+        poller_module.main()
+
+    assert exc_info.value.code == 2
+    assert not os.listdir(tmp_path)
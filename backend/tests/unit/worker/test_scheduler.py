@@ -0,0 +1,203 @@
+"""Tests for the heap-based task scheduler."""
+
+import asyncio
+import threading
+import time
+import sys
+import os
+
+import pytest
+
+# Add backend root to Python path
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+)
+
+from worker.scheduler import TaskScheduler
+
+
+def write_pid(path):
+    """Record the pid of the process running the job."""
+    with open(path, "a") as f:
+        f.write(f"{os.getpid()}\n")
+
+
+def run_for(scheduler: TaskScheduler, seconds: float):
+    """Run the scheduler on a fresh event loop for a fixed time."""
+
+    async def scenario():
+        task = asyncio.create_task(scheduler.run())
+        await asyncio.sleep(seconds)
+        scheduler.stop()
+        await task
+
+    asyncio.run(scenario())
+
+
+class FakeClock:
+    """Monotonic clock that only moves when a test sets it."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def run_due(scheduler: TaskScheduler):
+    """Run one pass of the scheduler loop and wait for the runs it started."""
+
+    async def scenario():
+        task = asyncio.create_task(scheduler.run())
+        await asyncio.sleep(0)
+        scheduler.stop()
+        await task
+
+    asyncio.run(scenario())
+
+
+def test_sub_second_intervals():
+    """Test that fractional intervals run at the requested rate."""
+    scheduler = TaskScheduler()
+    calls = []
+    scheduler.add_job(lambda: calls.append(time.monotonic()), 0.05, job_id="fast")
+
+    run_for(scheduler, 0.53)
+
+    assert 9 <= len(calls) <= 11
+    gaps = [b - a for a, b in zip(calls, calls[1:])]
+    assert all(0.03 < gap < 0.07 for gap in gaps)
+
+
+def test_slow_job_does_not_delay_others():
+    """Test that jobs run independently and overruns are skipped."""
+    scheduler = TaskScheduler()
+    slow_calls, fast_calls = [], []
+
+    def slow():
+        slow_calls.append(1)
+        time.sleep(0.25)
+
+    scheduler.add_job(slow, 0.05)
+    scheduler.add_job(lambda: fast_calls.append(1), 0.05, job_id="fast")
+
+    run_for(scheduler, 0.52)
+
+    assert len(fast_calls) >= 9
+    assert 1 <= len(slow_calls) <= 3
+
+
+def test_max_instances_and_delay_policy():
+    """Test concurrent instances and delayed runs after an overrun."""
+    scheduler = TaskScheduler()
+    active, peak, calls = [0], [0], []
+    lock = threading.Lock()
+
+    def job():
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            calls.append(1)
+        time.sleep(0.12)
+        with lock:
+            active[0] -= 1
+
+    scheduler.add_job(job, 0.05, max_instances=2, overrun_policy="delay")
+
+    run_for(scheduler, 0.5)
+
+    assert peak[0] == 2
+    # Two instances at 0.12s each fit ~8 runs in 0.45s of scheduling
+    assert 6 <= len(calls) <= 9
+
+
+def test_coroutine_jobs_run_on_loop():
+    """Test that coroutine functions default to the event loop executor."""
+    scheduler = TaskScheduler()
+    threads = []
+
+    async def job():
+        threads.append(threading.current_thread())
+        await asyncio.sleep(0)
+
+    added = scheduler.add_job(job, 0.05)
+    run_for(scheduler, 0.2)
+
+    assert added.executor == "loop"
+    assert threads and all(t is threading.main_thread() for t in threads)
+
+
+def test_process_executor(tmp_path):
+    """Test that process jobs run outside the scheduler process."""
+    scheduler = TaskScheduler(process_workers=1)
+    path = tmp_path / "pids"
+    scheduler.add_job(write_pid, 0.1, str(path), executor="process")
+
+    run_for(scheduler, 0.5)
+
+    pids = set(path.read_text().split())
+    assert pids and str(os.getpid()) not in pids
+
+
+@pytest.mark.parametrize(
+    "policy,expected", [("skip", 0), ("run_once", 1), ("run_all", 4)]
+)
+def test_misfire_policies(policy, expected):
+    """Test how late runs are handled after the scheduler was stalled."""
+    clock = FakeClock()
+    scheduler = TaskScheduler(clock=clock)
+    calls = []
+    scheduler.add_job(
+        lambda: calls.append(1),
+        0.1,
+        job_id="late",
+        executor="loop",
+        start_at=clock.now - 0.35,
+        misfire_grace=0.05,
+        misfire_policy=policy,
+        max_instances=4,
+    )
+    job = scheduler.jobs["late"]
+
+    run_due(scheduler)
+
+    assert len(calls) == expected
+    assert job.metrics.misfires == 4
+    assert job.next_run == pytest.approx(clock.now + 0.05)
+
+    # Once caught up, the next run is on time
+    clock.now = job.next_run
+    run_due(scheduler)
+
+    assert len(calls) == expected + 1
+    assert job.metrics.misfires == 4
+
+
+def test_jitter_delays_runs():
+    """Test that jitter spreads runs without causing misfires."""
+    scheduler = TaskScheduler()
+    calls = []
+    scheduler.add_job(lambda: calls.append(1), 0.05, jitter=0.04, misfire_grace=0.01)
+
+    run_for(scheduler, 0.5)
+
+    assert 7 <= len(calls) <= 10
+
+
+def test_remove_job_and_validation():
+    """Test job removal and option validation."""
+    scheduler = TaskScheduler()
+    calls = []
+    scheduler.add_job(lambda: calls.append(1), 0.05, job_id="gone")
+    scheduler.remove_job("gone")
+
+    run_for(scheduler, 0.15)
+
+    assert calls == []
+    with pytest.raises(ValueError):
+        scheduler.add_job(print, 1, executor="gpu")
+    with pytest.raises(ValueError):
+        scheduler.add_job(print, 1, misfire_policy="never")
+    scheduler.add_job(print, 1)
+    with pytest.raises(ValueError):
+        scheduler.add_job(print, 1)
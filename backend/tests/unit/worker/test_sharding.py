@@ -0,0 +1,208 @@
+"""Tests for lease-based poller sharding."""
+
+import asyncio
+import time
+import sys
+import os
+
+# Add backend root to Python path
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+)
+
+from arbitrage_engine.simulator import MarketSimulator
+from arbitrage_engine.snapshot import InMemoryRedis, SnapshotStore
+from worker.poller import ArbitragePoller
+from worker.sharding import InMemoryLeaseStore, ShardCoordinator, shard_for
+
+
+class FakeClock:
+    """Manually advanced wall clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_shard_mapping_is_stable():
+    """Test that symbols map to the same shard in every process."""
+    symbols = [f"SIM{i:04d}/USDT" for i in range(100)]
+
+    assert [shard_for(s, 8) for s in symbols] == [shard_for(s, 8) for s in symbols]
+    assert len({shard_for(s, 8) for s in symbols}) == 8
+
+
+def test_leases_are_exclusive_and_expire():
+    """Test acquire, renew, release and expiry semantics."""
+    clock = FakeClock()
+    store = InMemoryLeaseStore(clock)
+
+    assert store.acquire(0, "a", ttl=10)
+    assert not store.acquire(0, "b", ttl=10)
+    assert not store.renew(0, "b", ttl=10)
+    assert not store.release(0, "b")
+    assert store.renew(0, "a", ttl=10)
+
+    clock.now += 11
+    assert store.owner(0) is None
+    assert store.acquire(0, "b", ttl=10)
+    assert not store.renew(0, "a", ttl=10)
+    assert store.release(0, "b")
+    assert store.owner(0) is None
+
+
+def test_replicas_split_shards_without_overlap():
+    """Test that concurrent replicas divide all shards between them."""
+    store = InMemoryLeaseStore(FakeClock())
+    replicas = [ShardCoordinator(store, 8, replica_id=f"r{i}") for i in range(3)]
+
+    for _ in range(2):
+        for replica in replicas:
+            replica.rebalance()
+
+    owned = [replica.owned for replica in replicas]
+    assert set().union(*owned) == set(range(8))
+    assert sum(len(shards) for shards in owned) == 8
+    assert all(len(shards) <= 3 for shards in owned)
+
+
+def test_joining_replica_takes_surplus_shards():
+    """Test that an existing replica sheds shards when another joins."""
+    store = InMemoryLeaseStore(FakeClock())
+    first = ShardCoordinator(store, 6, replica_id="a")
+    first.rebalance()
+    assert first.owned == set(range(6))
+
+    second = ShardCoordinator(store, 6, replica_id="b")
+    second.rebalance()
+    first.rebalance()
+    second.rebalance()
+
+    assert len(first.owned) == 3
+    assert len(second.owned) == 3
+    assert first.owned.isdisjoint(second.owned)
+
+
+def test_under_allocated_replica_keeps_its_shards():
+    """Test that a replica below its fair share releases nothing."""
+    store = InMemoryLeaseStore(FakeClock())
+    store.heartbeat("b", 15)
+    replica = ShardCoordinator(store, 8, replica_id="a")
+    for shard in (1, 2, 3):
+        assert store.acquire(shard, "a", ttl=15)
+    replica.owned = {1, 2, 3}
+
+    released = []
+    release = store.release
+    store.release = lambda shard, owner: released.append(shard) or release(shard, owner)
+    replica.rebalance()
+
+    assert released == []
+    assert {1, 2, 3} <= replica.owned
+    assert len(replica.owned) == 4
+
+
+def test_shards_fail_over_when_replica_dies():
+    """Test that a dead replica's shards move after its leases expire."""
+    clock = FakeClock()
+    store = InMemoryLeaseStore(clock)
+    survivor = ShardCoordinator(store, 4, replica_id="a", lease_ttl=15)
+    victim = ShardCoordinator(store, 4, replica_id="b", lease_ttl=15)
+    for replica in (survivor, victim, survivor, victim):
+        replica.rebalance()
+    assert len(survivor.owned) == 2
+
+    # The victim stops renewing; the survivor keeps going
+    for _ in range(4):
+        clock.now += survivor.renew_interval
+        survivor.rebalance()
+
+    assert survivor.owned == set(range(4))
+    assert store.replicas() == ["a"]
+
+
+def test_graceful_release_hands_over_immediately():
+    """Test that releasing leases lets others take them at once."""
+    store = InMemoryLeaseStore(FakeClock())
+    leaving = ShardCoordinator(store, 4, replica_id="a")
+    staying = ShardCoordinator(store, 4, replica_id="b")
+    for replica in (leaving, staying, leaving, staying):
+        replica.rebalance()
+
+    leaving.release_all()
+    staying.rebalance()
+
+    assert staying.owned == set(range(4))
+
+
+def test_sharded_pollers_scan_disjoint_symbols():
+    """Test that two pollers split symbols and publish one merged snapshot."""
+    leases = InMemoryLeaseStore()
+    snapshots = SnapshotStore(InMemoryRedis())
+    scanned = {}
+
+    def make_poller(replica_id):
+        poller = ArbitragePoller(
+            poll_interval=0.05,
+            simulator=MarketSimulator(symbol_count=12, seed=5, min_active_events=12),
+            snapshot_store=snapshots,
+            coordinator=ShardCoordinator(leases, 4, replica_id=replica_id),
+        )
+        scan_symbol = poller.engine.scan_symbol
+        scanned[replica_id] = set()
+
+        def tracking_scan(symbol, timestamp=None):
+            scanned[replica_id].add(symbol)
+            return scan_symbol(symbol, timestamp)
+
+        poller.engine.scan_symbol = tracking_scan
+        return poller
+
+    first, second = make_poller("a"), make_poller("b")
+
+    async def scenario():
+        # Both replicas heartbeat before either claims shards
+        for poller in (first, second):
+            poller.coordinator.store.heartbeat(poller.coordinator.replica_id, 15)
+        tasks = [asyncio.create_task(p.run()) for p in (first, second)]
+        await asyncio.sleep(0.3)
+        for poller in (first, second):
+            poller.stop()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(scenario())
+
+    symbols = set(first.engine.watched_symbols)
+    assert scanned["a"].isdisjoint(scanned["b"])
+    assert scanned["a"] | scanned["b"] == symbols
+    published = {opp.symbol for opp in snapshots.get_latest().opportunities}
+    assert published & scanned["a"] and published & scanned["b"]
+    assert leases.replicas() == []
+
+
+def test_partitions_outlive_the_longest_poll_interval():
+    """Test that quiet adaptive shards stay in the merged snapshot."""
+    redis = InMemoryRedis()
+    poller = ArbitragePoller(
+        poll_interval=10,
+        simulator=MarketSimulator(symbol_count=4, seed=5, min_active_events=4),
+        snapshot_store=SnapshotStore(redis),
+        adaptive=True,
+        coordinator=ShardCoordinator(InMemoryLeaseStore(), 2, lease_ttl=15),
+    )
+
+    # Symbols are polled at most every 40 seconds
+    assert poller.partition_ttl == 55
+
+    poller.coordinator.rebalance()
+
+    async def scenario():
+        poller._loop = asyncio.get_running_loop()
+        await poller.poll(poller.engine.watched_symbols)
+
+    asyncio.run(scenario())
+
+    expires = redis._expires[SnapshotStore(redis).partition_key(0)]
+    assert expires - time.monotonic() > 50
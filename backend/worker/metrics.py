@@ -0,0 +1,277 @@
+"""
+Per-job execution metrics, slow-run profiling and a JSON metrics endpoint.
+"""
+
+import asyncio
+import cProfile
+import io
+import json
+import logging
+import pstats
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds of the duration histogram buckets
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Slow-run profiles kept per job
+MAX_PROFILES = 5
+
+# Functions listed in each captured profile
+PROFILE_LINES = 25
+
+# cProfile allows one active profiler per process (enforced from Python 3.12)
+_profile_lock = threading.Lock()
+
+
+class JobMetrics:
+    """Execution statistics for one scheduled job."""
+
+    def __init__(self):
+        """Initialize empty metrics."""
+        self.runs = 0
+        self.successes = 0
+        self.failures = 0
+        self.overlaps = 0  # Runs started while another instance was running
+        self.overruns_skipped = 0  # Runs dropped because max_instances were busy
+        self.overruns_delayed = 0  # Runs queued because max_instances were busy
+        self.misfires = 0  # Runs that started past the misfire grace time
+
+        self.total_duration = 0.0
+        self.max_duration = 0.0
+        self.last_duration: Optional[float] = None
+        self.bucket_counts = [0] * (len(DURATION_BUCKETS) + 1)
+
+        self.total_lateness = 0.0
+        self.max_lateness = 0.0
+        self.last_lateness: Optional[float] = None
+
+        self.last_started_at: Optional[float] = None  # Unix time
+        self.last_error: Optional[str] = None
+        self.last_error_at: Optional[float] = None
+        self.profiles: Deque[Dict] = deque(maxlen=MAX_PROFILES)
+
+    def record_start(self, lateness: float, overlapping: bool):
+        """Record a run starting.
+
+        Args:
+            lateness: Seconds between the scheduled and actual start
+            overlapping: Whether another instance was already running
+        """
+        self.runs += 1
+        self.last_started_at = time.time()
+        lateness = max(0.0, lateness)
+        self.last_lateness = lateness
+        self.total_lateness += lateness
+        self.max_lateness = max(self.max_lateness, lateness)
+        if overlapping:
+            self.overlaps += 1
+
+    def record_finish(self, duration: float, error: Optional[BaseException] = None):
+        """Record a run finishing.
+
+        Args:
+            duration: Run time in seconds
+            error: Exception raised by the run, if any
+        """
+        self.last_duration = duration
+        self.total_duration += duration
+        self.max_duration = max(self.max_duration, duration)
+
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if duration <= bound:
+                self.bucket_counts[i] += 1
+                break
+        else:
+            self.bucket_counts[-1] += 1
+
+        if error is None:
+            self.successes += 1
+        else:
+            self.failures += 1
+            self.last_error = f"{type(error).__name__}: {error}"
+            self.last_error_at = time.time()
+
+    def record_profile(self, duration: float, stats: str):
+        """Keep the profile of a slow run."""
+        self.profiles.append(
+            {"captured_at": time.time(), "duration": duration, "stats": stats}
+        )
+
+    def to_dict(self, include_profiles: bool = False) -> Dict[str, Any]:
+        """Convert the metrics to a JSON-ready dictionary.
+
+        Args:
+            include_profiles: Include the text of captured profiles
+
+        Returns:
+            Dictionary of metrics
+        """
+        finished = self.successes + self.failures
+        histogram = {}
+        cumulative = 0
+        for bound, count in zip(
+            [str(b) for b in DURATION_BUCKETS] + ["+Inf"], self.bucket_counts
+        ):
+            cumulative += count
+            histogram[bound] = cumulative
+
+        data = {
+            "runs": self.runs,
+            "successes": self.successes,
+            "failures": self.failures,
+            "overlaps": self.overlaps,
+            "overruns_skipped": self.overruns_skipped,
+            "overruns_delayed": self.overruns_delayed,
+            "misfires": self.misfires,
+            "duration": {
+                "last": self.last_duration,
+                "mean": self.total_duration / finished if finished else None,
+                "max": self.max_duration,
+                "histogram": histogram,
+            },
+            "lateness": {
+                "last": self.last_lateness,
+                "mean": self.total_lateness / self.runs if self.runs else None,
+                "max": self.max_lateness,
+            },
+            "last_started_at": self.last_started_at,
+            "last_error": self.last_error,
+            "last_error_at": self.last_error_at,
+            "profiles_captured": len(self.profiles),
+        }
+        if include_profiles:
+            data["profiles"] = list(self.profiles)
+        return data
+
+
+def format_profile(profiler: cProfile.Profile) -> str:
+    """Render the most expensive functions of a profile as text."""
+    output = io.StringIO()
+    stats = pstats.Stats(profiler, stream=output)
+    stats.sort_stats("cumulative").print_stats(PROFILE_LINES)
+    return output.getvalue()
+
+
+def call_profiled(
+    func: Callable, args: Tuple, kwargs: Dict[str, Any], threshold: float
+) -> Tuple[Any, float, Optional[str]]:
+    """Call a function under cProfile, keeping the profile only if slow.
+
+    Module-level so it can run in process pool workers. Only one run per
+    process is profiled at a time; runs overlapping it execute unprofiled.
+
+    Args:
+        func: Function to call
+        args: Positional arguments
+        kwargs: Keyword arguments
+        threshold: Seconds a run must take for its profile to be kept
+
+    Returns:
+        Tuple of (result, duration, profile text or None)
+    """
+    if not _profile_lock.acquire(blocking=False):
+        started = time.perf_counter()
+        result = func(*args, **kwargs)
+        return result, time.perf_counter() - started, None
+
+    try:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as e:
+            # Another profiling tool is already active
+            logger.debug(f"Running unprofiled: {e}")
+            profiler = None
+        started = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+        duration = time.perf_counter() - started
+    finally:
+        _profile_lock.release()
+
+    if profiler is None or duration < threshold:
+        return result, duration, None
+    return result, duration, format_profile(profiler)
+
+
+class MetricsServer:
+    """Minimal HTTP server exposing scheduler metrics as JSON.
+
+    Serves ``GET /jobs`` and ``GET /jobs/<job_id>``; the latter includes
+    captured slow-run profiles.
+    """
+
+    def __init__(self, get_metrics: Callable[..., Dict], host: str, port: int):
+        """Initialize the server.
+
+        Args:
+            get_metrics: Called with an optional job id and include_profiles
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port)
+        """
+        self.get_metrics = get_metrics
+        self.host = host
+        self.port = port
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        """Start listening."""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Serving job metrics on http://{self.host}:{self.port}/jobs")
+
+    async def stop(self):
+        """Stop listening."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def _route(self, method: str, path: str) -> Tuple[int, Any]:
+        if method != "GET":
+            return 405, {"detail": "Method not allowed"}
+        parts = [part for part in path.split("?", 1)[0].split("/") if part]
+        if parts == ["jobs"]:
+            return 200, self.get_metrics()
+        if len(parts) == 2 and parts[0] == "jobs":
+            try:
+                return 200, self.get_metrics(parts[1], include_profiles=True)
+            except KeyError:
+                return 404, {"detail": f"Job not found: {parts[1]}"}
+        return 404, {"detail": "Not found"}
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            # Drain headers; requests have no body
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+
+            if len(request_line) < 2:
+                status, payload = 400, {"detail": "Bad request"}
+            else:
+                status, payload = self._route(request_line[0], request_line[1])
+
+            body = json.dumps(payload).encode("utf-8")
+            reason = {200: "OK", 400: "Bad Request", 404: "Not Found"}.get(
+                status, "Method Not Allowed"
+            )
+            writer.write(
+                f"HTTP/1.1 {status} {reason}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: close\r\n\r\n".encode("latin-1") + body
+            )
+            await writer.drain()
+        except Exception as e:
+            logger.error(f"Error serving metrics request: {e}")
+        finally:
+            writer.close()
@@ -0,0 +1,166 @@
+"""
+Drift-free tick schedules and adaptive poll intervals.
+"""
+
+import math
+import time
+from typing import Callable, Dict, Optional
+
+
+class MonotonicTicker:
+    """Fixed-rate schedule on the monotonic clock.
+
+    Deadlines are start + n * interval rather than "now + interval", so the
+    period does not stretch by the time spent working. When a cycle overruns
+    one or more deadlines, the missed ticks are skipped instead of being run
+    back to back.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        start: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the ticker.
+
+        Args:
+            interval: Seconds between ticks
+            start: Time of the first tick (defaults to now)
+            clock: Monotonic clock in seconds
+        """
+        self.interval = interval
+        self.clock = clock
+        self.deadline = clock() if start is None else start
+        self.ticks = 0
+        self.skipped = 0
+
+    def delay(self, now: Optional[float] = None) -> float:
+        """Get the seconds until the next tick is due (0 if already due)."""
+        now = self.clock() if now is None else now
+        return max(0.0, self.deadline - now)
+
+    def is_due(self, now: Optional[float] = None) -> bool:
+        """Check whether the next tick is due."""
+        now = self.clock() if now is None else now
+        return now >= self.deadline
+
+    def advance(self, now: Optional[float] = None) -> int:
+        """Mark the current tick as done and schedule the next one.
+
+        Args:
+            now: Time the tick's work finished (defaults to now)
+
+        Returns:
+            Number of ticks skipped because the work overran them
+        """
+        now = self.clock() if now is None else now
+        self.ticks += 1
+        self.deadline += self.interval
+
+        skipped = 0
+        if now > self.deadline:
+            skipped = math.ceil((now - self.deadline) / self.interval)
+            self.deadline += skipped * self.interval
+            self.skipped += skipped
+        return skipped
+
+
+def cross_exchange_spread(prices: Dict[str, Dict]) -> Optional[float]:
+    """Get the widest gross spread across exchanges for one symbol.
+
+    Args:
+        prices: Tickers by exchange
+
+    Returns:
+        Spread percentage between the best bid and the best ask on another
+        venue, or None with fewer than two quoting exchanges
+    """
+    quotes = [
+        (name, ticker.get("bid") or 0, ticker.get("ask") or 0)
+        for name, ticker in prices.items()
+    ]
+    quotes = [quote for quote in quotes if quote[1] > 0 and quote[2] > 0]
+    if len(quotes) < 2:
+        return None
+
+    best = None
+    for buy_name, _, ask in quotes:
+        for sell_name, bid, _ in quotes:
+            if buy_name != sell_name:
+                spread = (bid - ask) / ask * 100
+                best = spread if best is None else max(best, spread)
+    return best
+
+
+class AdaptiveInterval:
+    """Per-symbol poll intervals driven by spread variance.
+
+    A fast and a slow exponentially weighted variance of each symbol's
+    cross-exchange spread are tracked. When recent variance rises above its
+    long-run level the symbol is polled more often; when it falls below, the
+    symbol is polled less often.
+    """
+
+    def __init__(
+        self,
+        base_interval: float,
+        min_interval: Optional[float] = None,
+        max_interval: Optional[float] = None,
+        fast_alpha: float = 0.3,
+        slow_alpha: float = 0.05,
+        warmup: int = 5,
+    ):
+        """Initialize the adaptive interval.
+
+        Args:
+            base_interval: Interval used until enough samples are seen
+            min_interval: Shortest interval (defaults to base / 4)
+            max_interval: Longest interval (defaults to base * 4)
+            fast_alpha: Smoothing factor of the recent variance
+            slow_alpha: Smoothing factor of the long-run variance
+            warmup: Samples needed before the interval adapts
+        """
+        self.base_interval = base_interval
+        self.min_interval = min_interval or base_interval / 4
+        self.max_interval = max_interval or base_interval * 4
+        self.fast_alpha = fast_alpha
+        self.slow_alpha = slow_alpha
+        self.warmup = warmup
+        # symbol -> [samples, fast mean, fast var, slow mean, slow var]
+        self._state: Dict[str, list] = {}
+
+    def observe(self, symbol: str, spread: float):
+        """Record a spread observation for a symbol."""
+        state = self._state.get(symbol)
+        if state is None:
+            self._state[symbol] = [1, spread, 0.0, spread, 0.0]
+            return
+
+        state[0] += 1
+        state[1], state[2] = self._update(state[1], state[2], spread, self.fast_alpha)
+        state[3], state[4] = self._update(state[3], state[4], spread, self.slow_alpha)
+
+    @staticmethod
+    def _update(mean: float, var: float, value: float, alpha: float):
+        diff = value - mean
+        increment = alpha * diff
+        return mean + increment, (1 - alpha) * (var + diff * increment)
+
+    def interval(self, symbol: str) -> float:
+        """Get the poll interval for a symbol."""
+        state = self._state.get(symbol)
+        if state is None or state[0] < self.warmup:
+            return self.base_interval
+
+        fast_var, slow_var = state[2], state[4]
+        if fast_var <= 0 and slow_var <= 0:
+            return self.max_interval
+        ratio = math.sqrt(slow_var / fast_var) if fast_var > 0 else math.inf
+        return min(
+            self.max_interval, max(self.min_interval, self.base_interval * ratio)
+        )
+
+    def get_statistics(self) -> Dict[str, float]:
+        """Get the current interval per observed symbol."""
+        return {symbol: self.interval(symbol) for symbol in self._state}
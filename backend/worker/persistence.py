@@ -0,0 +1,275 @@
+"""
+Buffered bulk persistence of arbitrage opportunities.
+"""
+
+import csv
+import io
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+
+from arbitrage_engine.engine import ArbitrageOpportunity
+from database import Trade
+from database.db import engine as default_engine
+
+logger = logging.getLogger(__name__)
+
+# Column order used for both executemany inserts and COPY
+TRADE_COLUMNS = [
+    "id",
+    "user_id",
+    "pair",
+    "buy_exchange",
+    "sell_exchange",
+    "buy_price",
+    "sell_price",
+    "profit_amount",
+    "profit_percentage",
+    "executed",
+    "timestamp",
+]
+
+
+class OpportunityRecorder:
+    """Buffers opportunities and writes them to the trades table in bulk.
+
+    The poller only appends to an in-memory buffer; a background thread
+    flushes it when it reaches ``batch_size`` rows or every
+    ``flush_interval`` seconds, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        db_engine: Optional[Engine] = None,
+        batch_size: int = 500,
+        flush_interval: float = 5.0,
+        max_buffer: int = 50000,
+        use_copy: bool = True,
+    ):
+        """Initialize the recorder.
+
+        Args:
+            db_engine: SQLAlchemy engine to write to (defaults to the app engine)
+            batch_size: Rows that trigger a flush and rows per insert batch
+            flush_interval: Maximum seconds a row waits in the buffer
+            max_buffer: Rows kept while the database is unavailable before
+                the oldest are dropped
+            use_copy: Use COPY instead of executemany on PostgreSQL
+        """
+        self.engine = db_engine or default_engine
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.use_copy = use_copy
+
+        self._buffer: List[Dict] = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.running = False
+
+        self.rows_written = 0
+        self.rows_dropped = 0
+        self.flushes = 0
+
+    def start(self):
+        """Start the background flush thread."""
+        if self.running:
+            return
+        self.running = True
+        self._thread = threading.Thread(
+            target=self._run, name="opportunity-recorder", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            f"Started opportunity recorder (batch_size={self.batch_size}, "
+            f"flush_interval={self.flush_interval}s)"
+        )
+
+    def stop(self):
+        """Stop the flush thread and write any buffered rows."""
+        if not self.running:
+            return
+        logger.info("Stopping opportunity recorder")
+        self.running = False
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def record(self, opportunities: List[ArbitrageOpportunity]):
+        """Queue opportunities for the next flush.
+
+        This never touches the database, so it is safe to call from the
+        polling loop on every cycle.
+
+        Args:
+            opportunities: Opportunities found in one poll cycle
+        """
+        if not opportunities:
+            return
+
+        rows = [self._to_row(opp) for opp in opportunities]
+
+        with self._lock:
+            self._buffer.extend(rows)
+            overflow = len(self._buffer) - self.max_buffer
+            if overflow > 0:
+                del self._buffer[:overflow]
+                self.rows_dropped += overflow
+                logger.warning(f"Recorder buffer full, dropped {overflow} rows")
+            pending = len(self._buffer)
+
+        if pending >= self.batch_size:
+            self._wakeup.set()
+
+    def flush(self) -> int:
+        """Write all buffered rows to the database.
+
+        Returns:
+            Number of rows written
+        """
+        with self._lock:
+            rows, self._buffer = self._buffer, []
+
+        if not rows:
+            return 0
+
+        try:
+            with self._write_lock:
+                self._write_rows(rows)
+        except Exception as e:
+            logger.error(f"Error writing {len(rows)} opportunities: {e}")
+            # Put the rows back so they are retried on the next flush
+            with self._lock:
+                self._buffer[:0] = rows
+            return 0
+
+        self.rows_written += len(rows)
+        self.flushes += 1
+        return len(rows)
+
+    def pending(self) -> int:
+        """Get the number of rows waiting to be flushed."""
+        with self._lock:
+            return len(self._buffer)
+
+    def get_statistics(self) -> Dict:
+        """Get recorder statistics.
+
+        Returns:
+            Dictionary with statistics
+        """
+        return {
+            "rows_written": self.rows_written,
+            "rows_dropped": self.rows_dropped,
+            "rows_pending": self.pending(),
+            "flushes": self.flushes,
+        }
+
+    def _run(self):
+        """Flush loop executed on the background thread."""
+        last_flush = time.monotonic()
+
+        while self.running:
+            timeout = max(0.0, self.flush_interval - (time.monotonic() - last_flush))
+            self._wakeup.wait(timeout)
+            self._wakeup.clear()
+
+            if not self.running:
+                break
+
+            due = time.monotonic() - last_flush >= self.flush_interval
+            if due or self.pending() >= self.batch_size:
+                written = self.flush()
+                last_flush = time.monotonic()
+                if written:
+                    logger.info(f"Recorded {written} opportunities")
+
+    def _write_rows(self, rows: List[Dict]):
+        """Insert rows using the fastest path for the database dialect.
+
+        Args:
+            rows: Trade rows to insert
+        """
+        with self.engine.begin() as conn:
+            if conn.dialect.name == "postgresql" and self.use_copy:
+                self._copy_rows(conn, rows)
+                return
+
+            table = Trade.__table__
+            for start in range(0, len(rows), self.batch_size):
+                conn.execute(insert(table), rows[start : start + self.batch_size])
+
+    def _copy_rows(self, conn, rows: List[Dict]):
+        """Stream rows into PostgreSQL with COPY ... FROM STDIN.
+
+        Args:
+            conn: Open SQLAlchemy connection inside a transaction
+            rows: Trade rows to insert
+        """
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        for row in rows:
+            writer.writerow(
+                [
+                    "" if row[col] is None else self._copy_value(row[col])
+                    for col in TRADE_COLUMNS
+                ]
+            )
+        buf.seek(0)
+
+        cursor = conn.connection.dbapi_connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY trades ({', '.join(TRADE_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                buf,
+            )
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def _copy_value(value):
+        """Format a value for COPY CSV input."""
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return value
+
+    @staticmethod
+    def _to_row(opp: ArbitrageOpportunity) -> Dict:
+        """Convert an opportunity into a trades row.
+
+        Args:
+            opp: Arbitrage opportunity
+
+        Returns:
+            Dictionary keyed by trades column name
+        """
+        return {
+            "id": str(uuid.uuid4()),
+            "user_id": None,
+            "pair": opp.symbol,
+            "buy_exchange": opp.buy_exchange,
+            "sell_exchange": opp.sell_exchange,
+            "buy_price": opp.buy_price,
+            "sell_price": opp.sell_price,
+            "profit_amount": opp.estimated_profit_usd,
+            "profit_percentage": opp.net_profit_pct,
+            "executed": False,
+            "timestamp": datetime.fromtimestamp(opp.timestamp / 1000, tz=timezone.utc),
+        }
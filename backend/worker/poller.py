@@ -2,17 +2,28 @@
 Background worker for polling arbitrage opportunities.
 """
 
+import asyncio
+import math
 import time
 import logging
 import json
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, TYPE_CHECKING
 import sys
 import os
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from arbitrage_engine.engine import ArbitrageEngine
+from arbitrage_engine.engine import ArbitrageEngine, ArbitrageOpportunity
+from arbitrage_engine.history import HistoryStore
+from arbitrage_engine.simulator import MarketSimulator
+from arbitrage_engine.snapshot import SnapshotStore, create_redis_client
+from worker.pacing import AdaptiveInterval, MonotonicTicker, cross_exchange_spread
+from worker.sharding import ShardCoordinator, create_lease_store
+
+if TYPE_CHECKING:
+    from worker.persistence import OpportunityRecorder
 
 logging.basicConfig(
     level=logging.INFO,
@@ -22,53 +33,300 @@ logger = logging.getLogger(__name__)
 
 
 class ArbitragePoller:
-    """Background poller for arbitrage opportunities."""
+    """Background poller for arbitrage opportunities.
+
+    Each watched symbol has its own fixed-rate schedule on the monotonic
+    clock. Symbols that come due together are scanned concurrently in one
+    cycle, and a cycle that overruns a deadline skips that tick rather than
+    triggering an immediate catch-up poll.
+
+    With a shard coordinator, only symbols in shards leased by this replica
+    are scanned, so several replicas split the symbols between them.
+    """
 
-    def __init__(self, poll_interval: int = 10, demo_mode: bool = False):
+    def __init__(
+        self,
+        poll_interval: float = 10,
+        demo_mode: bool = False,
+        recorder: Optional["OpportunityRecorder"] = None,
+        snapshot_store: Optional[SnapshotStore] = None,
+        simulator: Optional[MarketSimulator] = None,
+        history: Optional[HistoryStore] = None,
+        adaptive: bool = False,
+        min_interval: Optional[float] = None,
+        max_interval: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        coordinator: Optional[ShardCoordinator] = None,
+    ):
         """Initialize the poller.
 
         Args:
             poll_interval: Seconds between polls
             demo_mode: Whether to use demo data
+            recorder: Optional recorder that persists each cycle's opportunities
+            snapshot_store: Optional store the latest opportunities are published to
+            simulator: Optional simulated market to poll in demo mode
+            history: Optional columnar store each cycle and its quotes are
+                appended to
+            adaptive: Poll symbols with rising spread variance more often and
+                quiet symbols less often
+            min_interval: Shortest adaptive interval (default: interval / 4)
+            max_interval: Longest adaptive interval (default: interval * 4)
+            clock: Monotonic clock used for scheduling
+            coordinator: Optional shard coordinator for running several
+                replicas side by side
         """
         self.poll_interval = poll_interval
         self.demo_mode = demo_mode
-        self.engine = ArbitrageEngine(demo_mode=demo_mode)
+        self.engine = ArbitrageEngine(demo_mode=demo_mode, simulator=simulator)
+        self.recorder = recorder
+        self.snapshot_store = snapshot_store
+        self.history = history
+        self.adaptive = (
+            AdaptiveInterval(poll_interval, min_interval, max_interval)
+            if adaptive
+            else None
+        )
+        self.clock = clock
+        self.coordinator = coordinator
         self.running = False
 
+        self.tickers: Dict[str, MonotonicTicker] = {}
+        self.current: Dict[str, List[ArbitrageOpportunity]] = {}
+        self.cycles = 0
+        self.skipped_ticks = 0
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=min(32, max(1, len(self.engine.watched_symbols))),
+            thread_name_prefix="poller",
+        )
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
     def start(self):
-        """Start polling for opportunities."""
+        """Start polling for opportunities, blocking until stopped."""
+        asyncio.run(self.run())
+
+    async def run(self):
+        """Poll on schedule until stop() is called."""
         self.running = True
-        logger.info(f"Starting arbitrage poller (demo_mode={self.demo_mode})")
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        logger.info(
+            f"Starting arbitrage poller (demo_mode={self.demo_mode}, "
+            f"adaptive={self.adaptive is not None})"
+        )
+
+        if self.recorder is not None:
+            self.recorder.start()
+
+        leases = None
+        if self.coordinator is not None:
+            await self._rebalance()
+            leases = asyncio.create_task(self._maintain_leases())
+
+        now = self.clock()
+        self.tickers = {
+            symbol: MonotonicTicker(self.poll_interval, start=now, clock=self.clock)
+            for symbol in self.engine.watched_symbols
+        }
 
+        try:
+            while self.running:
+                now = self.clock()
+                due = [s for s, ticker in self.tickers.items() if ticker.is_due(now)]
+                if self.coordinator is not None:
+                    # Other replicas poll these; keep their schedules moving
+                    for symbol in due:
+                        if not self.coordinator.owns(symbol):
+                            self.tickers[symbol].advance(now)
+                    due = [s for s in due if self.coordinator.owns(s)]
+                if due:
+                    await self.poll(due)
+                    self._advance(due)
+
+                # Nothing to watch: check back after the base interval
+                delay = min(
+                    (ticker.delay() for ticker in self.tickers.values()),
+                    default=self.poll_interval,
+                )
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            if leases is not None:
+                leases.cancel()
+            self._shutdown()
+
+    async def _rebalance(self):
+        owned = await self._loop.run_in_executor(
+            self._executor, self.coordinator.rebalance
+        )
+        # Drop results for shards that moved to another replica
+        for symbol in list(self.current):
+            if self.coordinator.shard_of(symbol) not in owned:
+                del self.current[symbol]
+
+    async def _maintain_leases(self):
+        """Renew and rebalance shard leases while running."""
         while self.running:
+            await asyncio.sleep(self.coordinator.renew_interval)
             try:
-                logger.info("Polling for arbitrage opportunities...")
-                opportunities = self.engine.find_opportunities()
+                await self._rebalance()
+            except Exception as e:
+                logger.error(f"Error renewing shard leases: {e}")
 
-                logger.info(f"Found {len(opportunities)} opportunities")
+    @property
+    def partition_ttl(self) -> int:
+        """Seconds a published shard partition is kept.
 
-                # Log top opportunities
-                for i, opp in enumerate(opportunities[:5], 1):
-                    logger.info(
-                        f"  {i}. {opp.symbol}: "
-                        f"Buy {opp.buy_exchange} @ ${opp.buy_price:.2f}, "
-                        f"Sell {opp.sell_exchange} @ ${opp.sell_price:.2f}, "
-                        f"Net Profit: {opp.net_profit_pct:.2f}%"
-                    )
+        A partition is republished on every poll of its replica, so it must
+        outlive the longest interval between polls; the lease TTL on top lets
+        another replica take over a dead replica's shard before it expires.
+        """
+        longest = self.adaptive.max_interval if self.adaptive else self.poll_interval
+        return math.ceil(longest + self.coordinator.lease_ttl)
 
-                # In production, would store in Redis or database here
+    def _advance(self, symbols: List[str]):
+        finished = self.clock()
+        for symbol in symbols:
+            ticker = self.tickers[symbol]
+            if self.adaptive is not None:
+                ticker.interval = self.adaptive.interval(symbol)
+            skipped = ticker.advance(finished)
+            if skipped:
+                self.skipped_ticks += skipped
+                logger.warning(
+                    f"Poll of {symbol} overran its {ticker.interval:.2f}s "
+                    f"interval, skipped {skipped} tick(s)"
+                )
 
-            except Exception as e:
-                logger.error(f"Error during polling: {e}", exc_info=True)
+    async def poll(self, symbols: List[str]) -> List[ArbitrageOpportunity]:
+        """Scan the given symbols concurrently and publish the results.
+
+        Args:
+            symbols: Symbols to scan in this cycle
 
-            # Wait for next poll
-            time.sleep(self.poll_interval)
+        Returns:
+            Opportunities found for the scanned symbols
+        """
+        logger.info(f"Polling {len(symbols)} symbol(s) for arbitrage opportunities")
+        timestamp = int(time.time() * 1000)
+        results = await asyncio.gather(
+            *(
+                self._loop.run_in_executor(
+                    self._executor, self.engine.scan_symbol, symbol, timestamp
+                )
+                for symbol in symbols
+            ),
+            return_exceptions=True,
+        )
+
+        found: List[ArbitrageOpportunity] = []
+        quotes = {}
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error polling {symbol}: {result}")
+                continue
+            symbol_opportunities, quotes[symbol] = result
+            self.current[symbol] = symbol_opportunities
+            found.extend(symbol_opportunities)
+
+            if self.adaptive is not None:
+                spread = cross_exchange_spread(quotes[symbol])
+                if spread is not None:
+                    self.adaptive.observe(symbol, spread)
+
+        self.cycles += 1
+
+        # Latest known opportunities across all symbols
+        opportunities = sorted(
+            (opp for opps in self.current.values() for opp in opps),
+            key=lambda opp: opp.net_profit_pct,
+            reverse=True,
+        )
+        logger.info(f"Found {len(found)} opportunities, {len(opportunities)} open")
+
+        # Log top opportunities
+        for i, opp in enumerate(opportunities[:5], 1):
+            logger.info(
+                f"  {i}. {opp.symbol}: "
+                f"Buy {opp.buy_exchange} @ ${opp.buy_price:.2f}, "
+                f"Sell {opp.sell_exchange} @ ${opp.sell_price:.2f}, "
+                f"Net Profit: {opp.net_profit_pct:.2f}%"
+            )
+
+        try:
+            # Publish for API readers
+            if self.snapshot_store is not None and self.coordinator is not None:
+                partitions = {shard: [] for shard in self.coordinator.owned}
+                for opp in opportunities:
+                    shard = self.coordinator.shard_of(opp.symbol)
+                    if shard in partitions:
+                        partitions[shard].append(opp)
+                snapshot = self.snapshot_store.publish_partitions(
+                    partitions, self.coordinator.shard_count, self.partition_ttl
+                )
+                logger.info(f"Published snapshot v{snapshot.version}")
+            elif self.snapshot_store is not None:
+                snapshot = self.snapshot_store.publish(opportunities)
+                logger.info(f"Published snapshot v{snapshot.version}")
+
+            # Hand off to the recorder; writes happen on its own thread
+            if self.recorder is not None:
+                self.recorder.record(found)
+
+            if self.history is not None:
+                self.history.record(found, quotes)
+        except Exception as e:
+            logger.error(f"Error publishing poll results: {e}", exc_info=True)
+
+        return found
 
     def stop(self):
         """Stop the poller."""
         logger.info("Stopping arbitrage poller")
         self.running = False
+        if self._loop is not None and self._wakeup is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._wakeup.set)
+            except RuntimeError:
+                # Loop already closed
+                pass
+        else:
+            self._shutdown()
+
+    def _shutdown(self):
+        self.running = False
+        if self.coordinator is not None:
+            try:
+                self.coordinator.release_all()
+            except Exception as e:
+                logger.error(f"Error releasing shard leases: {e}")
+        if self.recorder is not None:
+            self.recorder.stop()
+        if self.history is not None:
+            self.history.flush()
+
+    def get_statistics(self) -> Dict:
+        """Get poller statistics.
+
+        Returns:
+            Dictionary with statistics
+        """
+        stats = {
+            "cycles": self.cycles,
+            "skipped_ticks": self.skipped_ticks,
+            "open_opportunities": sum(len(opps) for opps in self.current.values()),
+            "intervals": {
+                symbol: ticker.interval for symbol, ticker in self.tickers.items()
+            },
+        }
+        if self.coordinator is not None:
+            stats["sharding"] = self.coordinator.get_statistics()
+        return stats
 
 
 def main():
@@ -78,21 +336,136 @@ def main():
     parser = argparse.ArgumentParser(description="Arbitrage opportunity poller")
     parser.add_argument(
         "--interval",
-        type=int,
+        type=float,
         default=10,
         help="Poll interval in seconds (default: 10)",
     )
     parser.add_argument(
         "--demo",
         action="store_true",
-        help="Run in demo mode with mock data",
+        help="Run in demo mode against a simulated market",
+    )
+    parser.add_argument(
+        "--sim-symbols",
+        type=int,
+        default=None,
+        help="Symbols in the simulated market (implies --demo)",
+    )
+    parser.add_argument(
+        "--sim-tick-rate",
+        type=float,
+        default=None,
+        help="Simulated price updates per second (implies --demo)",
+    )
+    parser.add_argument(
+        "--persist",
+        action="store_true",
+        help="Record opportunities to the database",
+    )
+    parser.add_argument(
+        "--flush-interval",
+        type=float,
+        default=5.0,
+        help="Maximum seconds between database flushes (default: 5)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=500,
+        help="Buffered rows that trigger a database flush (default: 500)",
+    )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Adapt each symbol's interval to its spread variance",
+    )
+    parser.add_argument(
+        "--min-interval",
+        type=float,
+        default=None,
+        help="Shortest adaptive interval in seconds (default: interval / 4)",
+    )
+    parser.add_argument(
+        "--max-interval",
+        type=float,
+        default=None,
+        help="Longest adaptive interval in seconds (default: interval * 4)",
+    )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=int(os.getenv("POLLER_SHARDS", "0")),
+        help="Split symbols into this many leased shards (default: POLLER_SHARDS)",
+    )
+    parser.add_argument(
+        "--replica-id",
+        default=os.getenv("POLLER_REPLICA_ID"),
+        help="Identifier of this replica (default: hostname and pid)",
+    )
+    parser.add_argument(
+        "--lease-ttl",
+        type=float,
+        default=15.0,
+        help="Seconds a shard lease lasts without renewal (default: 15)",
+    )
+    parser.add_argument(
+        "--history-dir",
+        default=os.getenv("HISTORY_DIR"),
+        help=(
+            "Directory of the opportunity history store; not supported with "
+            "--shards (default: HISTORY_DIR)"
+        ),
     )
 
     args = parser.parse_args()
+    if args.shards > 0 and args.history_dir:
+        # Each store rewrites the manifest and dictionary from its own state
+        parser.error(
+            "--history-dir needs a single writer and cannot be used with --shards"
+        )
+
+    recorder = None
+    if args.persist:
+        from worker.persistence import OpportunityRecorder
+
+        recorder = OpportunityRecorder(
+            batch_size=args.batch_size,
+            flush_interval=args.flush_interval,
+        )
+
+    snapshot_store = None
+    if os.getenv("REDIS_URL"):
+        snapshot_store = SnapshotStore(create_redis_client())
+
+    simulator = None
+    if args.sim_symbols is not None or args.sim_tick_rate is not None:
+        overrides = {}
+        if args.sim_symbols is not None:
+            overrides["symbol_count"] = args.sim_symbols
+        if args.sim_tick_rate is not None:
+            overrides["tick_rate"] = args.sim_tick_rate
+        simulator = MarketSimulator.from_env(**overrides)
+
+    coordinator = None
+    if args.shards > 0:
+        coordinator = ShardCoordinator(
+            create_lease_store(),
+            args.shards,
+            replica_id=args.replica_id,
+            lease_ttl=args.lease_ttl,
+        )
 
     poller = ArbitragePoller(
         poll_interval=args.interval,
-        demo_mode=args.demo,
+        demo_mode=args.demo or simulator is not None,
+        recorder=recorder,
+        snapshot_store=snapshot_store,
+        simulator=simulator,
+        history=HistoryStore(args.history_dir) if args.history_dir else None,
+        adaptive=args.adaptive,
+        min_interval=args.min_interval,
+        max_interval=args.max_interval,
+        coordinator=coordinator,
     )
 
     try:
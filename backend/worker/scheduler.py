@@ -1,11 +1,32 @@
 """
 Task scheduler for background jobs.
+
+Jobs are kept in a min-heap ordered by their next run time, and the event
+loop sleeps exactly until the earliest one is due, so intervals can be
+fractional seconds. Each run is dispatched to the job's executor (the event
+loop itself, a thread pool or a process pool), so a slow job never delays
+the others.
 """
 
-import schedule
-import time
+import asyncio
+import functools
+import heapq
+import itertools
 import logging
-from typing import Callable, List
+import math
+import os
+import random
+import sys
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from worker.metrics import JobMetrics, MetricsServer, call_profiled
 
 logging.basicConfig(
     level=logging.INFO,
@@ -13,48 +34,401 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Where a job's function runs
+EXECUTOR_LOOP = "loop"  # On the event loop; for coroutines and trivial callables
+EXECUTOR_THREAD = "thread"
+EXECUTOR_PROCESS = "process"  # Function and arguments must be picklable
+EXECUTORS = (EXECUTOR_LOOP, EXECUTOR_THREAD, EXECUTOR_PROCESS)
+
+# What to do when the scheduler wakes up past a run's misfire grace time
+MISFIRE_SKIP = "skip"  # Drop the late runs
+MISFIRE_RUN_ONCE = "run_once"  # Run once for all late runs
+MISFIRE_RUN_ALL = "run_all"  # Run once per late run
+MISFIRE_POLICIES = (MISFIRE_SKIP, MISFIRE_RUN_ONCE, MISFIRE_RUN_ALL)
+
+# What to do when a run is due while max_instances runs are still going
+OVERRUN_SKIP = "skip"  # Drop the new run
+OVERRUN_DELAY = "delay"  # Start it as soon as a running instance finishes
+OVERRUN_POLICIES = (OVERRUN_SKIP, OVERRUN_DELAY)
+
+
+@dataclass
+class Job:
+    """A periodic job and its scheduling state."""
+
+    id: str
+    func: Callable
+    interval: float
+    args: Tuple = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    executor: str = EXECUTOR_THREAD
+    max_instances: int = 1
+    jitter: float = 0.0
+    misfire_grace: float = 1.0
+    misfire_policy: str = MISFIRE_RUN_ONCE
+    overrun_policy: str = OVERRUN_SKIP
+    profile_threshold: Optional[float] = None  # Profile runs slower than this
+
+    next_run: float = 0.0  # Next run on the interval grid, without jitter
+    running: int = 0
+    pending: Deque[float] = field(default_factory=deque)  # Delayed run times
+    version: int = 0  # Bumped to invalidate queued heap entries
+    metrics: JobMetrics = field(default_factory=JobMetrics)
+
+    @property
+    def name(self) -> str:
+        """Name of the job's function."""
+        return getattr(self.func, "__name__", self.id)
+
+
+def _call_timed(func: Callable, args: Tuple, kwargs: Dict[str, Any]):
+    # Module-level so process pool tasks can be pickled; timing inside the
+    # worker leaves out time spent queued for a free worker
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - started, None
+
 
 class TaskScheduler:
     """Scheduler for periodic background tasks."""
 
-    def __init__(self):
-        """Initialize the scheduler."""
-        self.jobs: List[schedule.Job] = []
+    def __init__(
+        self,
+        thread_workers: int = 8,
+        process_workers: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+        profile_threshold: Optional[float] = None,
+        metrics_host: str = "127.0.0.1",
+        metrics_port: Optional[int] = None,
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            thread_workers: Threads shared by thread-executor jobs
+            process_workers: Processes shared by process-executor jobs
+                (defaults to the CPU count)
+            clock: Monotonic clock in seconds
+            profile_threshold: Profile every run and keep the cProfile
+                output of runs slower than this many seconds (off if None)
+            metrics_host: Interface of the metrics endpoint
+            metrics_port: Port of the metrics endpoint (not served if None)
+        """
+        self.jobs: Dict[str, Job] = {}
         self.running = False
+        self.clock = clock
+        self.thread_workers = thread_workers
+        self.process_workers = process_workers
+        self.profile_threshold = profile_threshold
+        self.metrics_server = (
+            MetricsServer(self.get_job_metrics, metrics_host, metrics_port)
+            if metrics_port is not None
+            else None
+        )
+
+        self._heap: List[Tuple[float, int, str, int]] = []
+        self._sequence = itertools.count()
+        self._executors: Dict[str, Executor] = {}
+        self._tasks: set = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
 
     def add_job(
         self,
         func: Callable,
-        interval_seconds: int,
+        interval_seconds: float,
         *args,
+        job_id: Optional[str] = None,
+        executor: Optional[str] = None,
+        max_instances: int = 1,
+        jitter: float = 0.0,
+        misfire_grace: float = 1.0,
+        misfire_policy: str = MISFIRE_RUN_ONCE,
+        overrun_policy: str = OVERRUN_SKIP,
+        start_at: Optional[float] = None,
+        profile_threshold: Optional[float] = None,
         **kwargs,
-    ):
+    ) -> Job:
         """Add a job to the scheduler.
 
         Args:
-            func: Function to execute
-            interval_seconds: Interval in seconds
+            func: Function or coroutine function to execute
+            interval_seconds: Interval in seconds (fractions allowed)
             *args: Positional arguments for the function
+            job_id: Unique job identifier (defaults to the function name)
+            executor: "loop", "thread" or "process" (coroutine functions
+                default to "loop", others to "thread")
+            max_instances: Runs of this job allowed at the same time
+            jitter: Random delay of up to this many seconds added to each run
+            misfire_grace: Seconds a run may start late before it misfires
+            misfire_policy: "skip", "run_once" or "run_all"
+            overrun_policy: "skip" or "delay" when max_instances are running
+            start_at: Clock time of the first run (default: one interval from now)
+            profile_threshold: Keep cProfile output of runs slower than this
+                many seconds (defaults to the scheduler setting; only thread
+                and process jobs are profiled)
             **kwargs: Keyword arguments for the function
+
+        Returns:
+            The scheduled job
+
+        Raises:
+            ValueError: If an option is invalid or the job id is taken
         """
-        job = schedule.every(interval_seconds).seconds.do(func, *args, **kwargs)
-        self.jobs.append(job)
-        logger.info(f"Added job: {func.__name__} every {interval_seconds}s")
+        if executor is None:
+            executor = (
+                EXECUTOR_LOOP if asyncio.iscoroutinefunction(func) else EXECUTOR_THREAD
+            )
+        if executor not in EXECUTORS:
+            raise ValueError(f"Unknown executor: {executor}")
+        if misfire_policy not in MISFIRE_POLICIES:
+            raise ValueError(f"Unknown misfire policy: {misfire_policy}")
+        if overrun_policy not in OVERRUN_POLICIES:
+            raise ValueError(f"Unknown overrun policy: {overrun_policy}")
+        if interval_seconds <= 0:
+            raise ValueError("interval_seconds must be positive")
+        if max_instances < 1:
+            raise ValueError("max_instances must be at least 1")
+
+        job_id = job_id or getattr(func, "__name__", "job")
+        if job_id in self.jobs:
+            raise ValueError(f"Job already exists: {job_id}")
+
+        job = Job(
+            id=job_id,
+            func=func,
+            interval=interval_seconds,
+            args=args,
+            kwargs=kwargs,
+            executor=executor,
+            max_instances=max_instances,
+            jitter=jitter,
+            misfire_grace=misfire_grace,
+            misfire_policy=misfire_policy,
+            overrun_policy=overrun_policy,
+            profile_threshold=(
+                profile_threshold
+                if profile_threshold is not None
+                else self.profile_threshold
+            ),
+            next_run=(
+                start_at if start_at is not None else self.clock() + interval_seconds
+            ),
+        )
+        self.jobs[job_id] = job
+        self._push(job)
+        logger.info(f"Added job: {job_id} every {interval_seconds}s ({executor})")
+        return job
+
+    def remove_job(self, job_id: str):
+        """Remove a job; runs already in progress are not interrupted.
+
+        Raises:
+            KeyError: If no job has this id
+        """
+        job = self.jobs.pop(job_id)
+        job.version += 1
+        self._notify()
+
+    def _push(self, job: Job):
+        """Queue the job's next run on the heap."""
+        fire_at = job.next_run
+        if job.jitter > 0:
+            fire_at += random.uniform(0, job.jitter)
+        heapq.heappush(self._heap, (fire_at, next(self._sequence), job.id, job.version))
+        self._notify()
+
+    def _notify(self):
+        """Wake the run loop so it recomputes its sleep."""
+        if self._loop is None or self._wakeup is None:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        except RuntimeError:
+            # Loop already closed
+            pass
 
     def start(self):
-        """Start the scheduler."""
+        """Start the scheduler, blocking until stopped."""
+        asyncio.run(self.run())
+
+    async def run(self):
+        """Run due jobs until stop() is called."""
         self.running = True
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
         logger.info("Starting task scheduler")
+        if self.metrics_server is not None:
+            await self.metrics_server.start()
+
+        try:
+            while self.running:
+                self._run_due()
+
+                timeout = None
+                if self._heap:
+                    timeout = max(0.0, self._heap[0][0] - self.clock())
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self.running = False
+            if self.metrics_server is not None:
+                await self.metrics_server.stop()
+            if self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+            for pool in self._executors.values():
+                pool.shutdown(wait=False)
+            self._executors.clear()
+            self._loop = None
+            self._wakeup = None
+
+    def _run_due(self):
+        """Pop and dispatch every heap entry that is due."""
+        now = self.clock()
+        while self._heap and self._heap[0][0] <= now:
+            fire_at, _, job_id, version = heapq.heappop(self._heap)
+            job = self.jobs.get(job_id)
+            if job is None or job.version != version:
+                continue
+
+            runs = 1
+            late = now - fire_at
+            if late > job.misfire_grace:
+                missed = math.floor(late / job.interval) + 1
+                job.next_run += missed * job.interval
+                job.metrics.misfires += missed
+                logger.warning(
+                    f"Job {job.id} misfired: {missed} run(s) late by {late:.3f}s"
+                )
+                if job.misfire_policy == MISFIRE_SKIP:
+                    runs = 0
+                elif job.misfire_policy == MISFIRE_RUN_ALL:
+                    runs = missed
+            else:
+                job.next_run += job.interval
+
+            for _ in range(runs):
+                self._start(job, fire_at)
+            self._push(job)
 
-        while self.running:
-            schedule.run_pending()
-            time.sleep(1)
+    def _start(self, job: Job, scheduled_at: float):
+        """Start one run, applying the job's concurrency limit."""
+        if job.running >= job.max_instances:
+            if job.overrun_policy == OVERRUN_DELAY:
+                job.metrics.overruns_delayed += 1
+                # Hold at most one queued batch of runs
+                if len(job.pending) < job.max_instances:
+                    job.pending.append(scheduled_at)
+            else:
+                job.metrics.overruns_skipped += 1
+                logger.warning(
+                    f"Job {job.id} still running ({job.running} instance(s)), "
+                    f"skipping run"
+                )
+            return
+
+        overlapping = job.running > 0
+        job.running += 1
+        task = self._loop.create_task(self._execute(job, scheduled_at, overlapping))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _execute(self, job: Job, scheduled_at: float, overlapping: bool):
+        """Run the job's function on its executor and record its metrics."""
+        job.metrics.record_start(self.clock() - scheduled_at, overlapping)
+        started = time.perf_counter()
+        error = None
+        duration = None
+        try:
+            if job.executor == EXECUTOR_LOOP:
+                result = job.func(*job.args, **job.kwargs)
+                if asyncio.iscoroutine(result):
+                    await result
+            else:
+                if job.profile_threshold is not None:
+                    call = functools.partial(
+                        call_profiled,
+                        job.func,
+                        job.args,
+                        job.kwargs,
+                        job.profile_threshold,
+                    )
+                else:
+                    call = functools.partial(
+                        _call_timed, job.func, job.args, job.kwargs
+                    )
+                _, duration, stats = await self._loop.run_in_executor(
+                    self._executor(job.executor), call
+                )
+                if stats is not None:
+                    job.metrics.record_profile(duration, stats)
+                    logger.warning(
+                        f"Job {job.id} took {duration:.3f}s, profile captured"
+                    )
+        except Exception as e:
+            error = e
+            logger.error(f"Job {job.id} failed: {e}", exc_info=True)
+        finally:
+            if duration is None:
+                duration = time.perf_counter() - started
+            job.metrics.record_finish(duration, error)
+            job.running -= 1
+            if job.pending and self.running and job.id in self.jobs:
+                self._start(job, job.pending.popleft())
+
+    def _executor(self, kind: str) -> Executor:
+        """Get or create the shared pool for an executor kind."""
+        pool = self._executors.get(kind)
+        if pool is None:
+            if kind == EXECUTOR_PROCESS:
+                pool = ProcessPoolExecutor(max_workers=self.process_workers)
+            else:
+                pool = ThreadPoolExecutor(
+                    max_workers=self.thread_workers, thread_name_prefix="scheduler"
+                )
+            self._executors[kind] = pool
+        return pool
+
+    def get_job_metrics(
+        self, job_id: Optional[str] = None, include_profiles: bool = False
+    ) -> Dict:
+        """Get execution metrics for one job or all jobs.
+
+        Args:
+            job_id: Job to report on (all jobs if None)
+            include_profiles: Include captured slow-run profiles
+
+        Returns:
+            Metrics for the job, or metrics keyed by job id
+
+        Raises:
+            KeyError: If no job has this id
+        """
+        if job_id is not None:
+            return self._job_report(self.jobs[job_id], include_profiles)
+        return {
+            job.id: self._job_report(job, include_profiles)
+            for job in self.jobs.values()
+        }
+
+    def _job_report(self, job: Job, include_profiles: bool) -> Dict:
+        report = {
+            "interval": job.interval,
+            "executor": job.executor,
+            "max_instances": job.max_instances,
+            "running": job.running,
+            "pending": len(job.pending),
+        }
+        report.update(job.metrics.to_dict(include_profiles))
+        return report
 
     def stop(self):
         """Stop the scheduler."""
         logger.info("Stopping task scheduler")
         self.running = False
-        schedule.clear()
+        self._notify()
 
 
 def example_task():
@@ -64,7 +438,37 @@ def example_task():
 
 def main():
     """Main entry point."""
-    scheduler = TaskScheduler()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Background task scheduler")
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=(
+            int(os.environ["SCHEDULER_METRICS_PORT"])
+            if os.getenv("SCHEDULER_METRICS_PORT")
+            else None
+        ),
+        help="Serve job metrics as JSON on this port (default: off)",
+    )
+    parser.add_argument(
+        "--metrics-host",
+        default="127.0.0.1",
+        help="Interface of the metrics endpoint (default: 127.0.0.1)",
+    )
+    parser.add_argument(
+        "--profile-threshold",
+        type=float,
+        default=None,
+        help="Capture cProfile output of runs slower than this many seconds",
+    )
+    args = parser.parse_args()
+
+    scheduler = TaskScheduler(
+        profile_threshold=args.profile_threshold,
+        metrics_host=args.metrics_host,
+        metrics_port=args.metrics_port,
+    )
 
     # Add example tasks
     scheduler.add_job(example_task, interval_seconds=60)
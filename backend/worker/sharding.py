@@ -0,0 +1,296 @@
+"""
+Symbol sharding across poller replicas with time-bounded leases.
+
+Symbols are hashed into a fixed number of shards. Each replica holds a
+lease per shard it polls and renews it well before it expires; a lease that
+is not renewed (the replica died or lost its connection) expires and the
+shard is picked up by another replica. Replicas also heartbeat so each one
+can compute its fair share and release surplus shards when others join.
+"""
+
+import logging
+import math
+import os
+import socket
+import threading
+import time
+import zlib
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEASE_TTL = 15.0
+
+# Extend a lease only if it is still held by the caller
+_RENEW_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# Delete a lease only if it is still held by the caller
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def shard_for(symbol: str, shard_count: int) -> int:
+    """Get the shard a symbol belongs to.
+
+    Uses CRC32 rather than hash() so every process agrees on the mapping.
+    """
+    return zlib.crc32(symbol.encode("utf-8")) % shard_count
+
+
+def default_replica_id() -> str:
+    """Get an identifier unique to this process."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class RedisLeaseStore:
+    """Leases and replica heartbeats kept in Redis."""
+
+    def __init__(self, client, key_prefix: str = "arbitrage:poller"):
+        """Initialize the lease store.
+
+        Args:
+            client: Redis client
+            key_prefix: Prefix for the Redis keys used by the store
+        """
+        self.client = client
+        self.key_prefix = key_prefix
+        self.replicas_key = f"{key_prefix}:replicas"
+        self._renew = client.register_script(_RENEW_SCRIPT)
+        self._release = client.register_script(_RELEASE_SCRIPT)
+
+    def lease_key(self, shard: int) -> str:
+        """Get the key of a shard's lease."""
+        return f"{self.key_prefix}:lease:{shard}"
+
+    def acquire(self, shard: int, owner: str, ttl: float) -> bool:
+        """Take a free lease."""
+        return bool(
+            self.client.set(self.lease_key(shard), owner, nx=True, px=int(ttl * 1000))
+        )
+
+    def renew(self, shard: int, owner: str, ttl: float) -> bool:
+        """Extend a lease held by owner."""
+        return bool(
+            self._renew(keys=[self.lease_key(shard)], args=[owner, int(ttl * 1000)])
+        )
+
+    def release(self, shard: int, owner: str) -> bool:
+        """Give up a lease held by owner."""
+        return bool(self._release(keys=[self.lease_key(shard)], args=[owner]))
+
+    def owner(self, shard: int) -> Optional[str]:
+        """Get the current holder of a lease."""
+        return self.client.get(self.lease_key(shard))
+
+    def heartbeat(self, replica_id: str, ttl: float):
+        """Mark a replica alive for ttl seconds."""
+        self.client.zadd(self.replicas_key, {replica_id: time.time() + ttl})
+
+    def replicas(self) -> List[str]:
+        """Get the replicas with a live heartbeat."""
+        self.client.zremrangebyscore(self.replicas_key, "-inf", time.time())
+        return sorted(self.client.zrange(self.replicas_key, 0, -1))
+
+    def remove_replica(self, replica_id: str):
+        """Remove a replica's heartbeat."""
+        self.client.zrem(self.replicas_key, replica_id)
+
+
+class InMemoryLeaseStore:
+    """In-process stand-in for RedisLeaseStore.
+
+    Used in tests and when ``REDIS_URL`` is not configured; leases only
+    coordinate replicas within the current process.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        """Initialize the lease store.
+
+        Args:
+            clock: Clock in seconds, shared by all users of the store
+        """
+        self.clock = clock
+        self._leases: Dict[int, Tuple[str, float]] = {}
+        self._replicas: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _live_owner(self, shard: int) -> Optional[str]:
+        lease = self._leases.get(shard)
+        if lease is None or lease[1] <= self.clock():
+            self._leases.pop(shard, None)
+            return None
+        return lease[0]
+
+    def acquire(self, shard: int, owner: str, ttl: float) -> bool:
+        """Take a free lease."""
+        with self._lock:
+            if self._live_owner(shard) is not None:
+                return False
+            self._leases[shard] = (owner, self.clock() + ttl)
+            return True
+
+    def renew(self, shard: int, owner: str, ttl: float) -> bool:
+        """Extend a lease held by owner."""
+        with self._lock:
+            if self._live_owner(shard) != owner:
+                return False
+            self._leases[shard] = (owner, self.clock() + ttl)
+            return True
+
+    def release(self, shard: int, owner: str) -> bool:
+        """Give up a lease held by owner."""
+        with self._lock:
+            if self._live_owner(shard) != owner:
+                return False
+            del self._leases[shard]
+            return True
+
+    def owner(self, shard: int) -> Optional[str]:
+        """Get the current holder of a lease."""
+        with self._lock:
+            return self._live_owner(shard)
+
+    def heartbeat(self, replica_id: str, ttl: float):
+        """Mark a replica alive for ttl seconds."""
+        with self._lock:
+            self._replicas[replica_id] = self.clock() + ttl
+
+    def replicas(self) -> List[str]:
+        """Get the replicas with a live heartbeat."""
+        with self._lock:
+            now = self.clock()
+            self._replicas = {
+                replica: expires
+                for replica, expires in self._replicas.items()
+                if expires > now
+            }
+            return sorted(self._replicas)
+
+    def remove_replica(self, replica_id: str):
+        """Remove a replica's heartbeat."""
+        with self._lock:
+            self._replicas.pop(replica_id, None)
+
+
+def create_lease_store(redis_url: Optional[str] = None):
+    """Create a lease store for the given Redis URL.
+
+    Args:
+        redis_url: Redis connection URL (defaults to REDIS_URL)
+
+    Returns:
+        A RedisLeaseStore, or an InMemoryLeaseStore if no URL is configured
+    """
+    redis_url = redis_url or os.getenv("REDIS_URL")
+    if not redis_url:
+        logger.warning("REDIS_URL not set, shard leases only cover this process")
+        return InMemoryLeaseStore()
+
+    import redis
+
+    return RedisLeaseStore(redis.from_url(redis_url, decode_responses=True))
+
+
+class ShardCoordinator:
+    """Decides which shards this replica polls."""
+
+    def __init__(
+        self,
+        store,
+        shard_count: int,
+        replica_id: Optional[str] = None,
+        lease_ttl: float = DEFAULT_LEASE_TTL,
+    ):
+        """Initialize the coordinator.
+
+        Args:
+            store: RedisLeaseStore or InMemoryLeaseStore shared by replicas
+            shard_count: Number of shards symbols are split into
+            replica_id: Identifier of this replica (defaults to host and pid)
+            lease_ttl: Seconds a lease lasts without renewal
+        """
+        self.store = store
+        self.shard_count = shard_count
+        self.replica_id = replica_id or default_replica_id()
+        self.lease_ttl = lease_ttl
+        self.owned: Set[int] = set()
+        self.lost_leases = 0
+
+    @property
+    def renew_interval(self) -> float:
+        """Seconds between rebalances, leaving room for two missed renewals."""
+        return self.lease_ttl / 3
+
+    def shard_of(self, symbol: str) -> int:
+        """Get the shard a symbol belongs to."""
+        return shard_for(symbol, self.shard_count)
+
+    def owns(self, symbol: str) -> bool:
+        """Check whether this replica currently polls a symbol."""
+        return self.shard_of(symbol) in self.owned
+
+    def rebalance(self) -> Set[int]:
+        """Renew held leases, shed surplus shards and take free ones.
+
+        Returns:
+            The shards now owned by this replica
+        """
+        self.store.heartbeat(self.replica_id, self.lease_ttl)
+
+        for shard in sorted(self.owned):
+            if not self.store.renew(shard, self.replica_id, self.lease_ttl):
+                logger.warning(f"Lost lease on shard {shard}")
+                self.owned.discard(shard)
+                self.lost_leases += 1
+
+        replicas = self.store.replicas()
+        fair_share = math.ceil(self.shard_count / max(1, len(replicas)))
+
+        # Give surplus shards back so newly joined replicas can take them
+        surplus = max(0, len(self.owned) - fair_share)
+        for shard in sorted(self.owned, reverse=True)[:surplus]:
+            self.store.release(shard, self.replica_id)
+            self.owned.discard(shard)
+
+        # Start at a replica-specific offset to reduce contention
+        position = replicas.index(self.replica_id) if self.replica_id in replicas else 0
+        offset = position * fair_share
+        for i in range(self.shard_count):
+            if len(self.owned) >= fair_share:
+                break
+            shard = (offset + i) % self.shard_count
+            if shard not in self.owned and self.store.acquire(
+                shard, self.replica_id, self.lease_ttl
+            ):
+                self.owned.add(shard)
+
+        return set(self.owned)
+
+    def release_all(self):
+        """Release every held lease and leave the replica set."""
+        for shard in list(self.owned):
+            self.store.release(shard, self.replica_id)
+        self.owned.clear()
+        self.store.remove_replica(self.replica_id)
+
+    def get_statistics(self) -> Dict:
+        """Get coordinator statistics.
+
+        Returns:
+            Dictionary with statistics
+        """
+        return {
+            "replica_id": self.replica_id,
+            "shard_count": self.shard_count,
+            "owned_shards": sorted(self.owned),
+            "lost_leases": self.lost_leases,
+        }